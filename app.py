@@ -4,26 +4,74 @@ import os
 import re
 import json
 import uuid
+import time
 import hashlib
+import functools
 import pathlib
+import importlib
+import importlib.util
+import threading
 import subprocess
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any, Tuple, TypedDict  # <-- NEU: TypedDict
 from pydantic import BaseModel  # <-- NEU: strukturiertes Output-Schema
 
 import streamlit as st
 import asyncio  # Event-Loop-Fix für Streamlit-Thread
-# ... existing imports ...
-import os
-import ee
 
+# Schwere Module (ee, geemap, Agents SDK, openai) werden erst bei Bedarf importiert,
+# damit die Chat-UI sofort rendert. Import-Profil: scripts/profile_app_imports.py
 
-import geemap
-from geemap.foliumap import Map  # häufig genutzt in Render-Komponenten
 
-# === EE-Init (zentral & idempotent) ==========================================
-import json
+class _LazyModule:
+    """Modul-Stellvertreter: importiert beim ersten Attributzugriff (z. B. geemap im Code-Namespace)."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._mod = None
+
+    def __getattr__(self, attr: str):
+        if self._mod is None:
+            self._mod = importlib.import_module(self._name)
+        return getattr(self._mod, attr)
+
+
+# === Prozessweite Ressourcen (st.cache_resource, über Sessions/Reruns geteilt) ===
+def _rss_mb() -> float:
+    """Aktueller Resident Set Size des Prozesses in MB (Linux /proc, sonst Max-RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+@st.cache_resource(show_spinner=False)
+def _resource_registry() -> Dict[str, Dict[str, float]]:
+    """Name → {build_s, rss_mb} aller gebauten geteilten Ressourcen (Sidebar-Debug)."""
+    return {}
+
+def _shared_resource(fn):
+    """st.cache_resource + Registry-Eintrag mit Bauzeit und RSS-Zuwachs."""
+    @functools.wraps(fn)
+    def build(*args, **kwargs):
+        rss0, t0 = _rss_mb(), time.perf_counter()
+        obj = fn(*args, **kwargs)
+        _resource_registry()[fn.__name__.lstrip("_")] = {
+            "build_s": time.perf_counter() - t0, "rss_mb": max(0.0, _rss_mb() - rss0)}
+        return obj
+    return st.cache_resource(show_spinner=False)(build)
+
+def _active_sessions() -> int:
+    try:
+        from streamlit.runtime import get_instance
+        return max(1, len(get_instance()._session_mgr.list_active_sessions()))
+    except Exception:
+        return 1
+
 
-def _ee_try_ready() -> bool:
+# === EE-Init (Hintergrund-Thread, prozessweit einmal) ========================
+def _ee_try_ready(ee) -> bool:
     try:
         _ = ee.Image(1).getInfo()
         return True
@@ -40,52 +88,96 @@ def _ee_parse_key_from_secrets() -> dict:
         return json.loads(key_val.strip())
     raise RuntimeError("EE_PRIVATE_KEY Format unbekannt (weder str noch dict).")
 
-@st.cache_data(show_spinner=False)
-def ee_maybe_init() -> bool:
-    # 0) Bereits initialisiert?
-    if _ee_try_ready():
-        return True
-
-    # 1) Streamlit-Secrets (Service Account)
-    project = st.secrets.get("EE_PROJECT")
-    sa_email = st.secrets.get("EE_SERVICE_ACCOUNT")
-    if project and sa_email and st.secrets.get("EE_PRIVATE_KEY") is not None:
-        try:
-            key_dict = _ee_parse_key_from_secrets()
-            creds = ee.ServiceAccountCredentials(email=sa_email, key_data=json.dumps(key_dict))
-            ee.Initialize(credentials=creds, project=project)
-            if _ee_try_ready():
-                return True
-        except Exception:
-            pass  # weiter zu (2)
-
-    # 2) Application Default / Host (falls vorhanden)
+def _ee_service_account() -> Optional[dict]:
+    """Service-Account aus den Secrets (im Script-Thread gelesen) oder None."""
     try:
-        ee.Initialize()  # nutzt Host-/ADC-Umgebung, wenn vorhanden
-        if _ee_try_ready():
-            return True
+        project = st.secrets.get("EE_PROJECT")
+        sa_email = st.secrets.get("EE_SERVICE_ACCOUNT")
+        if project and sa_email and st.secrets.get("EE_PRIVATE_KEY") is not None:
+            return {"project": project, "email": sa_email, "key": _ee_parse_key_from_secrets()}
     except Exception:
         pass
+    return None
 
-    return False
-
-# einmalig aufrufen (vor dem Rest der UI)
-_EE_READY = ee_maybe_init()
+class _EEInitState:
+    def __init__(self):
+        self.status = "pending"  # pending | ready | failed
+        self.error = ""
+        self.elapsed = 0.0
+        self.source = ""  # service_account | default (eine Credential je Prozess)
+        self.done = threading.Event()
+
+def _ee_init_worker(state: _EEInitState, service_account: Optional[dict]) -> None:
+    t0 = time.perf_counter()
+    try:
+        import ee
+        # 0) Bereits initialisiert?
+        ok = _ee_try_ready(ee)
+        # 1) Streamlit-Secrets (Service Account)
+        if not ok and service_account:
+            try:
+                creds = ee.ServiceAccountCredentials(email=service_account["email"],
+                                                     key_data=json.dumps(service_account["key"]))
+                ee.Initialize(credentials=creds, project=service_account["project"])
+                ok = _ee_try_ready(ee)
+            except Exception as e:
+                state.error = f"Service Account: {e}"
+        # 2) Application Default / Host (falls vorhanden)
+        if not ok:
+            try:
+                ee.Initialize()  # nutzt Host-/ADC-Umgebung, wenn vorhanden
+                ok = _ee_try_ready(ee)
+            except Exception as e:
+                state.error = state.error or str(e)
+        state.status = "ready" if ok else "failed"
+        state.source = ("service_account" if service_account and not state.error else "default") if ok else ""
+    except Exception as e:
+        state.status, state.error = "failed", str(e)
+    finally:
+        state.elapsed = time.perf_counter() - t0
+        state.done.set()
+
+@_shared_resource
+def ee_init_state() -> _EEInitState:
+    """Startet EE-Init + Health-Check einmal pro Prozess im Hintergrund."""
+    state = _EEInitState()
+    threading.Thread(target=_ee_init_worker, args=(state, _ee_service_account()),
+                     name="ee-init", daemon=True).start()
+    return state
+
+@_shared_resource
+def _job_system() -> bool:
+    """Hintergrund-Jobs (blocks/components/util/jobs.py): Worker-Prozesse erhalten die EE-Credentials."""
+    from blocks.components.util.jobs import configure_workers
+    service_account = _ee_service_account()
+    if service_account:
+        configure_workers({"T2E_EE_SERVICE_ACCOUNT": service_account["email"],
+                           "T2E_EE_PROJECT": str(service_account["project"]),
+                           "T2E_EE_PRIVATE_KEY": json.dumps(service_account["key"])})
+    return True
+
+def ee_wait_ready(timeout: Optional[float] = 60) -> bool:
+    """Blockiert höchstens timeout s, bis EE bereit ist (nur dort, wo EE gebraucht wird)."""
+    state = ee_init_state()
+    state.done.wait(timeout)
+    return state.status == "ready"
 
 # --- Agent run limits (configurable via env var) ---
 DEFAULT_MAX_TURNS = int(os.getenv("AGENT_MAX_TURNS", "100"))  # raise from SDK default (~12)
+AGENT_RUN_TIMEOUT_S = float(os.getenv("AGENT_RUN_TIMEOUT", "1800"))  # Obergrenze je Agent-Lauf (Script-Thread wartet)
 
 BASE_DIR = pathlib.Path(__file__).parent.resolve()
 
-# ===== Agents SDK korrekt importieren =========================================
-AGENTS_OK = True
-try:
-    from agents import Agent, Runner, function_tool, SQLiteSession
+# ===== Agents SDK (lazy) ======================================================
+AGENTS_OK = all(importlib.util.find_spec(m) is not None for m in ("agents", "openai"))
+AGENTS_IMPORT_ERROR = "" if AGENTS_OK else "Pakete 'openai-agents'/'openai' nicht installiert"
+
+def _agents_sdk():
+    """Agents SDK + OpenAI erst beim ersten Agent-Aufruf importieren."""
+    import agents
     from agents.models.openai_responses import OpenAIResponsesModel
     from openai import AsyncOpenAI
-except Exception as e:
-    AGENTS_OK = False
-    AGENTS_IMPORT_ERROR = str(e)
+    return agents, OpenAIResponsesModel, AsyncOpenAI
 
 # ===== Pfade / Repo-Layout ====================================================
 KNOWLEDGE_DIR = BASE_DIR / "knowledge"
@@ -219,7 +311,6 @@ def _extract_plan_spec_from_text(answer_text: str) -> Tuple[Optional[dict], str]
     return None, text
 
 # ===== Neue Function Tools (Layer 1.1 → 1.2 → 2 → 3) =========================
-@function_tool
 def tool_get_meta() -> str:
     """
     Load global Layer1.1 meta index (single YAML as text).
@@ -229,7 +320,6 @@ def tool_get_meta() -> str:
         return _safe_json({"error": f"meta index not found: {META_INDEX_PATH}"})
     return META_INDEX_PATH.read_text(encoding="utf-8")
 
-@function_tool
 def tool_get_policy() -> str:
     """
     Load global Layer2 policy (strict JSON as text).
@@ -239,7 +329,6 @@ def tool_get_policy() -> str:
         return _safe_json({"error": f"policy not found: {POLICY_PATH}"})
     return POLICY_PATH.read_text(encoding="utf-8")
 
-@function_tool
 def tool_get_uc_sections(uc_id: str, sections: List[str]) -> str:
     """
     Load specific sections from a UC YAML.
@@ -271,7 +360,6 @@ def tool_get_uc_sections(uc_id: str, sections: List[str]) -> str:
             out[sec] = data[sec]
     return _safe_json(out)
 
-@function_tool
 def tool_bundle_components(components: List[str]) -> str:
     """
     Load multiple component files and return a single concatenated string plus a manifest.
@@ -305,7 +393,6 @@ def tool_bundle_components(components: List[str]) -> str:
 
     return _safe_json({"bundle": "\n".join(bundle_parts), "manifest": manifest})
 
-@function_tool
 def tool_run_python(code: str,
                     filename: Optional[str] = None,
                     timeout_sec: int = 600,
@@ -392,7 +479,6 @@ class UISuggestion(TypedDict):
 class PythonBlockOutput(BaseModel):
     code: str  # kompletter, lauffähiger Python-Quelltext (ohne Erklärtext)
 
-@function_tool
 def ui_suggest(suggestions: List[UISuggestion], replace: bool = False) -> str:
     """
     Der Agent ruft dies früh in Layer 1 auf.
@@ -427,218 +513,89 @@ def ui_suggest(suggestions: List[UISuggestion], replace: bool = False) -> str:
     st.session_state["l1_suggestions"].extend(normalized)
     return json.dumps({"received": len(normalized)}, ensure_ascii=False)
 
-# ===== Async-Loop-Sicherung (Fix für Runner.run_sync in Streamlit-Thread) =====
-def ensure_event_loop() -> None:
-    """
-    Stellt sicher, dass im aktuellen Thread ein asyncio-Event-Loop vorhanden ist.
-    Notwendig, weil Streamlit Code in einem ScriptRunner-Thread ohne Default-Loop ausführt.
-    """
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-# ===== Agent Setup + echte SDK-Session ========================================
-if AGENTS_OK:
-    openai_client = AsyncOpenAI()  # liest OPENAI_API_KEY
-    agent = Agent(
+# ===== Agent Setup (prozessweit geteilt, erst beim ersten Prompt gebaut) =======
+# Agent-Definitionen, Tools, ein gepoolter HTTP-Client und ein Event-Loop existieren
+# einmal pro Prozess; je Session bleibt nur die SDK-Session (Gesprächsverlauf).
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except Exception:  # ältere/neuere Streamlit-Layouts
+    add_script_run_ctx = get_script_run_ctx = None
+
+import contextvars
+_SCRIPT_CTX: contextvars.ContextVar = contextvars.ContextVar("t2e_script_ctx", default=None)
+
+@_shared_resource
+def _agent_loop() -> asyncio.AbstractEventLoop:
+    """Ein Event-Loop-Thread für alle Agent-Läufe; der HTTP-Pool ist an diesen Loop gebunden."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agents-loop", daemon=True).start()
+    return loop
+
+@_shared_resource
+def _openai_client():
+    """AsyncOpenAI mit einem prozessweiten Keep-Alive-Verbindungspool (liest OPENAI_API_KEY)."""
+    import httpx
+    from openai import DefaultAsyncHttpxClient
+    _, _, client_cls = _agents_sdk()
+    limits = httpx.Limits(max_connections=int(os.getenv("T2E_OPENAI_MAX_CONNECTIONS", "32")),
+                          max_keepalive_connections=int(os.getenv("T2E_OPENAI_KEEPALIVE", "16")))
+    return client_cls(http_client=DefaultAsyncHttpxClient(limits=limits))
+
+def _with_script_ctx(fn):
+    """Sync-Tool als async-Tool: läuft in einem Worker-Thread (nie auf dem geteilten Loop,
+    sonst blockiert z. B. tool_run_python alle Sessions) mit dem ScriptRunContext der Session."""
+    def run(*args, **kwargs):
+        if add_script_run_ctx is not None:  # Executor-Threads werden wiederverwendet → immer setzen
+            add_script_run_ctx(threading.current_thread(), _SCRIPT_CTX.get())
+        return fn(*args, **kwargs)
+
+    @functools.wraps(fn)
+    async def call(*args, **kwargs):
+        return await asyncio.to_thread(run, *args, **kwargs)  # kopiert den contextvars-Kontext
+    return call
+
+@_shared_resource
+def _tools() -> Dict[str, Any]:
+    """Function-Tools erst mit importiertem SDK dekorieren."""
+    agents, _, _ = _agents_sdk()
+    return {fn.__name__: agents.function_tool(_with_script_ctx(fn)) for fn in (
+        ui_suggest, tool_get_meta, tool_get_policy, tool_get_uc_sections,
+        tool_bundle_components, tool_run_python)}
+
+@_shared_resource
+def _main_agent(instructions: str, model: str):
+    """Haupt-Agent je (Prompt, Modell); Prompt-Änderungen erzeugen eine neue Definition."""
+    agents, model_cls, _ = _agents_sdk()
+    t = _tools()
+    return agents.Agent(
         name="EO-Agent",
-        instructions=MEGA_PROMPT,
-        tools=[ui_suggest,  # <--- NEU
-               tool_get_meta, tool_get_policy, tool_get_uc_sections, tool_bundle_components, tool_run_python],
-        model=OpenAIResponsesModel(model=os.environ.get("OPENAI_MODEL", "gpt-4o"), openai_client=openai_client),
+        instructions=instructions,
+        tools=[t["ui_suggest"],  # <--- NEU
+               t["tool_get_meta"], t["tool_get_policy"], t["tool_get_uc_sections"],
+               t["tool_bundle_components"], t["tool_run_python"]],
+        model=model_cls(model=model, openai_client=_openai_client()),
         # Hinweis: Structured Outputs (plan_spec/python_code) werden unten robust abgegriffen,
         # selbst wenn das Modell sie in den Text schreibt.
     )
 
-# ===== Streamlit: echtes Chat-Interface ======================================
-st.set_page_config(page_title="talk2earth — EO Agent", layout="wide")
-st.title("talk2earth — EO Agent (Agents SDK + Streamlit)")
+def _get_agent():
+    return _main_agent(MEGA_PROMPT, os.environ.get("OPENAI_MODEL", "gpt-4o"))
 
-# >>> NEU: Sichtbarer App-Ausgabebereich (ersetzt sich selbst)
-if "app_ph" not in st.session_state:
-    st.session_state["app_ph"] = st.empty()
+def run_agent(agent, input: str, session=None):
+    """Runner.run auf dem geteilten Loop; blockiert den Script-Thread bis zum Ergebnis."""
+    agents, _, _ = _agents_sdk()
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
 
-with st.sidebar:
-    st.subheader("Status")
-    st.write("Agents SDK:", "✅ bereit" if AGENTS_OK else f"❌ {AGENTS_IMPORT_ERROR}")
-    st.write("OPENAI_API_KEY gesetzt:", "✅" if os.environ.get("OPENAI_API_KEY") else "❌")
-    st.divider()
-    st.subheader("Knowledge (debug)")
-    try:
-        ucs = _ls_usecase_ids()
-        st.caption("Use-Cases: " + (", ".join(ucs) if ucs else "—"))
-        st.caption("Meta-Index: " + (_repo_rel(META_INDEX_PATH) if META_INDEX_PATH.exists() else "not found"))
-        st.caption("Policy: " + (_repo_rel(POLICY_PATH) if POLICY_PATH.exists() else "not found"))
-    except Exception as e:
-        st.warning(f"Debug-Auflistung fehlgeschlagen: {e}")
-    st.divider()
-    # ---- NEU: PLAN_SPEC Capture-Status
-    plan_present = bool(st.session_state.get("last_plan_spec"))
-    st.caption(f"PLAN_SPEC captured: {'✅' if plan_present else '—'}")
-    if plan_present and st.checkbox("PlanSpec (debug) anzeigen"):
-        st.json(st.session_state.get("last_plan_spec"))
+    async def _run():
+        _SCRIPT_CTX.set(ctx)
+        return await agents.Runner.run(agent, input=input, session=session, max_turns=DEFAULT_MAX_TURNS)
 
-    # >>> NEU: Code nur auf Wunsch sichtbar machen
-    if st.button("Code anzeigen", type="secondary", help="Zeigt den aktuell erzeugten (ggf. reparierten) Code im Chat."):
-        code_to_show = st.session_state.get("healed_code") or st.session_state.get("last_code")
-        if code_to_show:
-            st.session_state["show_code"] = True
-            st.session_state.messages.append({"role": "assistant", "content": f"```python\n{code_to_show}\n```"})
-            st.rerun()
-
-    st.caption("Hinweis: AOI/Zeitraum/Parameter werden im Dialog geklärt; der Agent bündelt Komponenten vor dem Code.")
-
-# Chat-Speicher (UI) — unabhängig von der SDK-Session
-if "messages" not in st.session_state:
-    st.session_state.messages = []  # [{"role":"user"/"assistant","content":str}]
-if "last_code" not in st.session_state:
-    st.session_state.last_code = ""
-if "agent_session_id" not in st.session_state:
-    # stabile ID pro Browser-Session
-    st.session_state.agent_session_id = uuid.uuid4().hex
-# Neu: PlanSpec-Speicher
-if "last_plan_spec" not in st.session_state:
-    st.session_state.last_plan_spec = None
-if "last_plan_spec_raw" not in st.session_state:
-    st.session_state.last_plan_spec_raw = ""
-# --- NEU: Vorschlags-UI (Layer 1) ---
-if "l1_suggestions" not in st.session_state:
-    st.session_state["l1_suggestions"] = []          # wird vom Tool gefüllt
-if "queued_input" not in st.session_state:
-    st.session_state["queued_input"] = None          # nächste "synthetische" User-Eingabe
-if "queued_label" not in st.session_state:
-    st.session_state["queued_label"] = None          # Anzeige-Label für die Auswahl
-
-# SDK-Session herstellen (persistentes Gedächtnis via SQLite)
-if AGENTS_OK:
+    fut = asyncio.run_coroutine_threadsafe(_run(), _agent_loop())
     try:
-        SESSIONS_DB = str((RUNNER_DIR / "sessions.db").resolve())
-        sdk_session = SQLiteSession(st.session_state.agent_session_id, SESSIONS_DB)
-        with st.sidebar:
-            st.caption(f"Session: {st.session_state.agent_session_id[:8]}… (SQLite @ {SESSIONS_DB})")
-    except Exception as e:
-        sdk_session = SQLiteSession(st.session_state.agent_session_id)  # in-memory fallback
-        with st.sidebar:
-            st.warning(f"SDK-Session init: Fallback in-memory ({e})")
-else:
-    sdk_session = None  # type: ignore
-
-# Verlauf (UI) rendern
-for m in st.session_state.messages:
-    with st.chat_message(m["role"]):
-        st.markdown(m["content"])
-
-# ---- NEU: Vorschläge-Block (immer sichtbar, vor der Chat-Eingabe) -----------
-chosen = render_l1_suggestions()
-if chosen:
-    # Klick wird zur nächsten User-Eingabe umgewandelt
-    st.session_state["queued_input"] = "USE_SUGGESTION " + json.dumps(chosen.get("payload", {}), ensure_ascii=False)
-    st.session_state["queued_label"] = chosen.get("label")
-    st.rerun()
-
-# ---- NEU: Chat-Eingabe (Queue zuerst, dann normales Eingabefeld) ------------
-queued = st.session_state.pop("queued_input", None)
-queued_label = st.session_state.pop("queued_label", None)
-
-prompt = None
-if queued:
-    prompt = queued
-else:
-    prompt = st.chat_input("Nachricht an den Agenten eingeben und mit Enter senden…")
-
-if prompt:
-    # 1) User Nachricht anzeigen/speichern
-    display_text = prompt
-    if prompt.startswith("USE_SUGGESTION ") and queued_label:
-        display_text = f"[Auswahl] {queued_label}"
-    st.session_state.messages.append({"role": "user", "content": display_text})
-    with st.chat_message("user"):
-        st.markdown(display_text)
-
-    # 2) Agent call mit Iterations-Injektion + echter SDK-Session
-    if not AGENTS_OK:
-        answer = "**Fehler:** Agents SDK nicht verfügbar. Bitte SDK installieren/konfigurieren und Server neu starten."
-        raw_answer = answer
-        result = None
-    else:
-        iteration_context = ""
-        if st.session_state.last_code:
-            iteration_context = f"\n\n[EXISTING_CODE_BEGIN]\n{st.session_state.last_code}\n[EXISTING_CODE_END]\n"
-        history_note = ""
-        if st.session_state.messages[:-1]:
-            history_note = "\n\n[HISTORY NOTE] Continue this session; respond naturally and follow iteration rules.\n"
-
-        # Event-Loop sicherstellen
-        ensure_event_loop()
-
-        # Alte Vorschläge ausblenden – neue wird das Tool setzen
-        st.session_state["l1_suggestions"] = []
-
-        # >>> Persistente SDK-Session übergeben (SQLiteSession)
-        result = Runner.run_sync(
-            agent,
-            input=(prompt + history_note + iteration_context),
-            session=sdk_session,  # type: ignore
-            max_turns=DEFAULT_MAX_TURNS,  # <-- allow enough tool/LLM steps per run
-        )
-
-        raw_answer = result.final_output or ""
-        answer = raw_answer
-
-        # ---- NEU: Versuche, PLAN_SPEC zuerst direkt aus result-Objekt zu lesen
-        plan_spec_obj = None
-        try:
-            # gängige Pfade in der Agents SDK (robust gegen Varianten)
-            if hasattr(result, "outputs") and isinstance(result.outputs, dict) and result.outputs.get("plan_spec"):
-                plan_spec_obj = result.outputs.get("plan_spec")
-            elif hasattr(result, "named_outputs") and isinstance(result.named_outputs, dict) and result.named_outputs.get("plan_spec"):
-                plan_spec_obj = result.named_outputs.get("plan_spec")
-            elif hasattr(result, "get_output") and callable(result.get_output):
-                plan_spec_obj = result.get_output("plan_spec")  # type: ignore
-        except Exception:
-            plan_spec_obj = None
-
-        # Falls nicht im Result-Kanal: aus sichtbarem Text extrahieren & entfernen
-        if plan_spec_obj is None:
-            extracted, cleaned_text = _extract_plan_spec_from_text(raw_answer)
-            if extracted:
-                plan_spec_obj = extracted
-                answer = cleaned_text  # UI-bereinigte Antwort
-        # persistieren (debugbar, aber nicht in UI angezeigt)
-        if plan_spec_obj is not None and _looks_like_plan_spec(plan_spec_obj):
-            st.session_state.last_plan_spec = plan_spec_obj
-            st.session_state.last_plan_spec_raw = json.dumps(plan_spec_obj, ensure_ascii=False, indent=2)
-
-    # 3) Assistant-Antwort rendern — PLAN_SPEC ist ggf. schon entfernt
-    with st.chat_message("assistant"):
-        st.markdown(answer)
-    st.session_state.messages.append({"role": "assistant", "content": answer})
-
-    # 4) Hidden execution pipeline: auto-heal, dann rendern (keine Code-Anzeige)
-    code_block = extract_first_python_block(answer)
-    if code_block:
-        st.session_state.last_code = code_block  # nur für "Code anzeigen"
-        ok, final_code, heal_log = self_heal_until_runs(code_str, max_rounds=5)
-        if ok:
-            st.session_state["healed_code"] = final_code
-            # alten App-Output leeren und neue App rendern
-            outlet = st.session_state.get("app_ph")
-            if outlet:
-                outlet.empty()
-            ns: dict[str, object] = {
-                "__name__": "__generated__", "st": st, "ee": ee, "geemap": geemap, "Map": Map
-            }
-            run_generated_code_visible(final_code, ns, outlet)
-            with st.sidebar:
-                st.caption("✅ Code automatisch repariert & ausgeführt.")
-        else:
-            # Keine Code-Anzeige – nur Logs, damit Fixer weiter iterieren kann
-            with st.expander("Fehler beim automatischen Ausführen – Logs", expanded=True):
-                st.write(heal_log)
-            with st.sidebar:
-                st.warning("Automatische Reparatur noch nicht erfolgreich.")
+        return fut.result(timeout=AGENT_RUN_TIMEOUT_S)
+    except TimeoutError:
+        fut.cancel()
+        raise TimeoutError(f"Agent-Lauf nach {AGENT_RUN_TIMEOUT_S:.0f} s abgebrochen (AGENT_RUN_TIMEOUT)")
 
 # ============================================================================
 # >>>>>>>> SELF-HEALING: Prä-Exec-Sandbox, EE-Init-Detektor, Fixer-Agent <<<<<<
@@ -650,9 +607,13 @@ import traceback as _sh_traceback
 import contextlib as _sh_ctx
 from typing import Set as _sh_Set, Optional as _sh_Optional, List as _sh_List, Tuple as _sh_Tuple
 
-from geemap.foliumap import Map as _sh_Map
-import geemap as _sh_geemap
-import ee as _sh_ee
+
+def _sh_code_namespace() -> dict:
+    """ee/geemap/Map für generierten Code; geemap wird nur bei tatsächlicher Nutzung importiert."""
+    import ee as _sh_ee
+    from blocks.components.visual.slim_map import Map as _sh_Map
+    _job_system()  # submit_job() im generierten Code startet Worker mit den Secrets
+    return {"ee": _sh_ee, "geemap": _LazyModule("geemap"), "Map": _sh_Map}
 
 
 # --- Fixer-Code-Extraktion (unterstützt fenced ```python ... ``` und Rohtext) ---
@@ -775,9 +736,7 @@ def _sh_dry_run_code(code_text: str) -> _sh_Tuple[bool, str]:
     null_st = _SH_NullStreamlit()
     ns = {
         "__name__": "__main__",
-        "ee": _sh_ee,
-        "geemap": _sh_geemap,
-        "Map": _sh_Map,
+        **_sh_code_namespace(),
         "st": null_st,
     }
     stdout_buf = _sh_io.StringIO()
@@ -799,14 +758,7 @@ def _sh_dry_run_code(code_text: str) -> _sh_Tuple[bool, str]:
         combined = (logs + ("\n" + errs if errs else "") + ("\n" + tb)).strip()
         return False, combined
 
-# 4) Fixer-Agent (zweite Instanz) — Agents SDK an AGENTS_OK koppeln
-if AGENTS_OK:
-    from agents import Agent as _sh_Agent
-    from agents.models.openai_responses import OpenAIResponsesModel as _sh_Model
-else:
-    _sh_Agent = None  # type: ignore
-    _sh_Model = None  # type: ignore
-
+# 4) Fixer-Agent (zweite Instanz) — Agents SDK an AGENTS_OK koppeln (lazy importiert)
 _SH_FIXER_PROMPT = (
     "Du bist ein Korrektur-Agent. Deine einzige Aufgabe ist es, übergebenen Python-Code "
     "auf Basis des Fehlerprotokolls zu REPARIEREN, sodass er fehlerfrei läuft.\n"
@@ -818,28 +770,28 @@ _SH_FIXER_PROMPT = (
     "- Keine Platzhalter, keine Ellipsen, vollständiger, sofort lauffähiger Code."
 )
 
-def _sh_get_fixer_agent():
-    if not AGENTS_OK:
-        return None
-    if "_fixer_agent" in st.session_state and st.session_state["_fixer_agent"] is not None:
-        return st.session_state["_fixer_agent"]
-    fixer_agent = _sh_Agent(  # type: ignore
+@_shared_resource
+def _fixer_agent(model: str):
+    agents, model_cls, _ = _agents_sdk()
+    t = _tools()
+    return agents.Agent(  # type: ignore
         name="Fixer",
-        model=_sh_Model(  # type: ignore
-            model=os.environ.get("OPENAI_MODEL", "gpt-4o"),
-            openai_client=openai_client,  # reuse same OpenAI client as main agent
+        model=model_cls(  # type: ignore
+            model=model,
+            openai_client=_openai_client(),  # reuse same OpenAI client as main agent
         ),
         instructions=_SH_FIXER_PROMPT,
-        tools=[tool_get_meta, tool_get_policy, tool_get_uc_sections, tool_bundle_components],  # <-- NEU: gleiche Tools
+        tools=[t["tool_get_meta"], t["tool_get_policy"], t["tool_get_uc_sections"],
+               t["tool_bundle_components"]],  # <-- NEU: gleiche Tools
         output_type=PythonBlockOutput,  # <-- NEU: strukturiert, nur Code
     )
-    st.session_state["_fixer_agent"] = fixer_agent
-    return fixer_agent
 
-def _sh_fix_code_once(code_text: str, error_log: str) -> _sh_Optional[str]:
-    # Streamlit-Thread hat oft keinen Default-Event-Loop → sicherstellen
-    ensure_event_loop()
+def _sh_get_fixer_agent():
+    if not AGENTS_OK:
+        return None
+    return _fixer_agent(os.environ.get("OPENAI_MODEL", "gpt-4o"))
 
+def _sh_fix_code_once(code_text: str, error_log: str) -> _sh_Optional[str]:
     fixer_agent = _sh_get_fixer_agent()
     if fixer_agent is None:
         return None
@@ -855,13 +807,7 @@ def _sh_fix_code_once(code_text: str, error_log: str) -> _sh_Optional[str]:
     )
 
     try:
-        # Korrekte Agents-SDK-Nutzung: kein Runner-Konstruktor, sondern Runner.run_sync(agent, ...)
-        res = Runner.run_sync(
-            fixer_agent,
-            input=user_payload,
-            session=sdk_session,
-            max_turns=DEFAULT_MAX_TURNS,
-        )
+        res = run_agent(fixer_agent, input=user_payload, session=_get_sdk_session())
         out = getattr(res, "final_output", None)
         # Structured Output bevorzugt
         if hasattr(out, "code") and isinstance(out.code, str) and out.code.strip():
@@ -904,6 +850,338 @@ def run_generated_code_visible(code_text: str, ns: dict, outlet=None) -> None:
         pass
     exec(compiled, ns, ns)
 
+# ===== Generierte App als Fragment (Widget-Änderung → nur dieser Bereich) =====
+def _is_fragment_rerun() -> bool:
+    """True, wenn nur das Fragment neu läuft (Widget-Interaktion), nicht die ganze App."""
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    return bool(getattr(ctx, "fragment_ids_this_run", None))
+
+def _generated_app_body() -> None:
+    """Geheilte App aus Artefakten wiederherstellen (util/artifacts.py) oder ausführen."""
+    code = st.session_state.get("healed_code")
+    if not code:
+        return
+    from blocks.components.util import artifacts
+    from blocks.components.ui.slider_int import ui_slider_int
+    from blocks.components.ui.number_input_int import ui_number_input_int
+
+    sha = _sha1_text(code)
+    manifest = st.session_state.get("_app_artifacts") or artifacts.load_manifest(st.session_state.app_restore_token)
+    force = st.session_state.pop("_app_force_exec", False)
+    # Voller Rerun (Chat, Sidebar, Reload) → Artefakte ausspielen; Widget-Änderung → echter Lauf
+    if manifest and manifest["code_sha"] == sha and manifest["replayable"] and not force \
+            and not _is_fragment_rerun():
+        if artifacts.replay(manifest, st, {"slider": ui_slider_int, "number_input": ui_number_input_int}):
+            st.caption("Aus gespeicherten Artefakten wiederhergestellt (ohne EE-Aufruf).")
+            return
+        st.session_state["_app_force_exec"] = True  # Widget-Stand weicht ab / Payload fehlt
+        st.rerun()
+    _execute_generated_app(code, sha)
+
+def _execute_generated_app(code: str, sha: str) -> None:
+    """Geheilten Code ausführen und aufzeichnen; getInfo() je Widget-Wert-Tupel memoisiert."""
+    if not ee_wait_ready(timeout=120):
+        st.warning(f"Earth Engine ist nicht initialisiert: {ee_init_state().error or 'Timeout'}")
+        return
+    from blocks.components.util import artifacts
+    from blocks.components.util.jobs import job_owner
+    from blocks.components.util.widget_memo import current_widgets, widget_memo
+    from blocks.components.util.widget_prefetch import neighbor_overrides, start_prefetch
+
+    if st.session_state.get("_app_memo_sha") != sha:  # neuer Code → frisches Memo
+        st.session_state["_app_memo_sha"] = sha
+        st.session_state["_app_memo"] = OrderedDict()
+        st.session_state["_app_prefetched"] = set()
+    reads, ok = [], False
+    with artifacts.capture(sha) as cap, widget_memo(st.session_state["_app_memo"]) as stats, \
+            job_owner(st.session_state.agent_session_id):
+        ns: dict[str, object] = {"__name__": "__generated__", "__builtins__": artifacts.recording_builtins(),
+                                 **_sh_code_namespace(), "st": artifacts.recording(st)}
+        try:
+            run_generated_code_visible(code, ns)
+            ok = True
+        except Exception as e:
+            st.exception(e)
+        reads = current_widgets()
+    if ok:
+        manifest = cap.manifest(code)
+        st.session_state["_app_artifacts"] = manifest
+        artifacts.save_manifest(st.session_state.app_restore_token, manifest)
+    if ok and reads:  # Nachbarwerte (v±step) im Hintergrund vorberechnen
+        start_prefetch(st.session_state.agent_session_id, _prefetch_runner(code),
+                       st.session_state["_app_memo"], neighbor_overrides(reads),
+                       st.session_state["_app_prefetched"])
+    st.caption(f"EE-Memo: {stats['hits']} Treffer, {stats['misses']} neu berechnet"
+               + (f" · Widgets {stats['widgets']}" if stats["widgets"] else ""))
+
+def _prefetch_runner(code_text: str):
+    """App ohne UI ausführen (Null-Streamlit wie im Dry-Run), nur um Caches zu füllen."""
+    compiled = compile(code_text, "<prefetch>", "exec")
+
+    def run() -> None:
+        ns = {"__name__": "__generated__", **_sh_code_namespace(), "st": _SH_NullStreamlit()}
+        exec(compiled, ns, ns)
+    return run
+
+# Ohne st.fragment (ältere Streamlit-Versionen) läuft die App bei jedem Rerun mit.
+_generated_app = st.fragment(_generated_app_body) if hasattr(st, "fragment") else _generated_app_body
+
+# ===== Streamlit: echtes Chat-Interface ======================================
+st.set_page_config(page_title="talk2earth — EO Agent", layout="wide")
+st.title("talk2earth — EO Agent (Agents SDK + Streamlit)")
+
+# >>> NEU: Sichtbarer App-Ausgabebereich; wird am Skriptende mit dem App-Fragment gefüllt
+app_ph = st.empty()
+
+def _render_ee_status() -> None:
+    state = ee_init_state()
+    if state.status == "pending":
+        st.write("Earth Engine:", "⏳ wird im Hintergrund initialisiert …")
+    elif state.status == "ready":
+        st.write("Earth Engine:", f"✅ bereit ({state.elapsed:.1f} s)")
+    else:
+        st.write("Earth Engine:", f"❌ {state.error or 'nicht initialisiert'}")
+
+def _ee_status_indicator() -> None:
+    """Status live nachziehen, solange die Init läuft (Fragment-Polling, danach ein Rerun)."""
+    fragment = getattr(st, "fragment", None)
+    if fragment is None or ee_init_state().done.is_set():
+        _render_ee_status()
+        return
+
+    @fragment(run_every=1.0)
+    def _poll() -> None:
+        if ee_init_state().done.is_set():
+            st.rerun()
+        _render_ee_status()
+    _poll()
+
+with st.sidebar:
+    st.subheader("Status")
+    _ee_status_indicator()
+    st.write("Agents SDK:", "✅ verfügbar" if AGENTS_OK else f"❌ {AGENTS_IMPORT_ERROR}")
+    st.write("OPENAI_API_KEY gesetzt:", "✅" if os.environ.get("OPENAI_API_KEY") else "❌")
+    st.divider()
+    st.subheader("Ressourcen (debug)")
+    rss, n_sessions = _rss_mb(), _active_sessions()
+    st.caption(f"RSS {rss:.0f} MB · {n_sessions} Session(s) · {rss / n_sessions:.0f} MB/Session")
+    for name, info in sorted(_resource_registry().items()):
+        st.caption(f"geteilt: {name} ({info['build_s']:.2f} s, +{info['rss_mb']:.1f} MB)")
+    st.divider()
+    st.subheader("Knowledge (debug)")
+    try:
+        ucs = _ls_usecase_ids()
+        st.caption("Use-Cases: " + (", ".join(ucs) if ucs else "—"))
+        st.caption("Meta-Index: " + (_repo_rel(META_INDEX_PATH) if META_INDEX_PATH.exists() else "not found"))
+        st.caption("Policy: " + (_repo_rel(POLICY_PATH) if POLICY_PATH.exists() else "not found"))
+    except Exception as e:
+        st.warning(f"Debug-Auflistung fehlgeschlagen: {e}")
+    st.divider()
+    # ---- NEU: PLAN_SPEC Capture-Status
+    plan_present = bool(st.session_state.get("last_plan_spec"))
+    st.caption(f"PLAN_SPEC captured: {'✅' if plan_present else '—'}")
+    if plan_present and st.checkbox("PlanSpec (debug) anzeigen"):
+        st.json(st.session_state.get("last_plan_spec"))
+
+    # >>> NEU: Code nur auf Wunsch sichtbar machen
+    if st.button("Code anzeigen", type="secondary", help="Zeigt den aktuell erzeugten (ggf. reparierten) Code im Chat."):
+        code_to_show = st.session_state.get("healed_code") or st.session_state.get("last_code")
+        if code_to_show:
+            st.session_state["show_code"] = True
+            st.session_state.messages.append({"role": "assistant", "content": f"```python\n{code_to_show}\n```"})
+            st.rerun()
+
+    st.caption("Hinweis: AOI/Zeitraum/Parameter werden im Dialog geklärt; der Agent bündelt Komponenten vor dem Code.")
+
+# Chat-Speicher (UI) — unabhängig von der SDK-Session
+if "messages" not in st.session_state:
+    st.session_state.messages = []  # [{"role":"user"/"assistant","content":str}]
+if "last_code" not in st.session_state:
+    st.session_state.last_code = ""
+if "agent_session_id" not in st.session_state:
+    # stabile ID pro Browser-Session (SDK-Verlauf, Job-Owner); nie aus der URL übernommen
+    st.session_state.agent_session_id = uuid.uuid4().hex
+if "app_restore_token" not in st.session_state:
+    # Eigenes Zufalls-Token nur für die Artefakte der App (?app=…); ein geteilter Link
+    # stellt die App wieder her, aber weder Agent-Verlauf noch Jobs der Session
+    _token = str(st.query_params.get("app", "")) if hasattr(st, "query_params") else ""
+    st.session_state.app_restore_token = _token if re.fullmatch(r"[0-9a-f]{32}", _token) else uuid.uuid4().hex
+    if _token == st.session_state.app_restore_token:  # Reload: zuletzt geheilte App wiederherstellen
+        from blocks.components.util.artifacts import load_manifest
+        _manifest = load_manifest(_token)
+        if _manifest and _manifest.get("code"):
+            st.session_state["healed_code"] = _manifest["code"]
+            st.session_state["_app_artifacts"] = _manifest
+            st.session_state.last_code = _manifest["code"]
+if hasattr(st, "query_params") and st.query_params.get("app") != st.session_state.app_restore_token:
+    st.query_params["app"] = st.session_state.app_restore_token
+# Neu: PlanSpec-Speicher
+if "last_plan_spec" not in st.session_state:
+    st.session_state.last_plan_spec = None
+if "last_plan_spec_raw" not in st.session_state:
+    st.session_state.last_plan_spec_raw = ""
+# --- NEU: Vorschlags-UI (Layer 1) ---
+if "l1_suggestions" not in st.session_state:
+    st.session_state["l1_suggestions"] = []          # wird vom Tool gefüllt
+if "queued_input" not in st.session_state:
+    st.session_state["queued_input"] = None          # nächste "synthetische" User-Eingabe
+if "queued_label" not in st.session_state:
+    st.session_state["queued_label"] = None          # Anzeige-Label für die Auswahl
+
+# SDK-Session (persistentes Gedächtnis via SQLite) — erst beim ersten Agent-Aufruf gebaut
+SESSIONS_DB = str((RUNNER_DIR / "sessions.db").resolve())
+
+def _get_sdk_session():
+    """Einzige Agent-Ressource je Browser-Session; überlebt Reruns in st.session_state."""
+    if st.session_state.get("_sdk_session") is None:
+        agents, _, _ = _agents_sdk()
+        try:
+            st.session_state["_sdk_session"] = agents.SQLiteSession(st.session_state.agent_session_id, SESSIONS_DB)
+        except Exception as e:
+            with st.sidebar:
+                st.warning(f"SDK-Session init: Fallback in-memory ({e})")
+            st.session_state["_sdk_session"] = agents.SQLiteSession(st.session_state.agent_session_id)  # in-memory fallback
+    return st.session_state["_sdk_session"]
+
+if AGENTS_OK:
+    with st.sidebar:
+        st.caption(f"Session: {st.session_state.agent_session_id[:8]}… (SQLite @ {SESSIONS_DB})")
+
+def _render_session_jobs() -> None:
+    """Hintergrund-Jobs dieser Session; Ergebnisse holt ui_job_status in der App ab."""
+    from blocks.components.util.jobs import list_jobs
+    session_jobs = list_jobs(owner=st.session_state.agent_session_id, limit=5)
+    if not session_jobs:
+        return
+    st.subheader("Jobs")
+    for job in session_jobs:
+        detail = ""
+        if job["status"] == "running":
+            detail = f" {job['progress']:.0%}" + (f" · {job['message']}" if job["message"] else "")
+        st.caption(f"{job['target'].rpartition(':')[2]}: {job['status']}{detail}")
+
+with st.sidebar:
+    _render_session_jobs()
+
+# Verlauf (UI) rendern
+for m in st.session_state.messages:
+    with st.chat_message(m["role"]):
+        st.markdown(m["content"])
+
+# ---- NEU: Vorschläge-Block (immer sichtbar, vor der Chat-Eingabe) -----------
+chosen = render_l1_suggestions()
+if chosen:
+    # Klick wird zur nächsten User-Eingabe umgewandelt
+    st.session_state["queued_input"] = "USE_SUGGESTION " + json.dumps(chosen.get("payload", {}), ensure_ascii=False)
+    st.session_state["queued_label"] = chosen.get("label")
+    st.rerun()
+
+# ---- NEU: Chat-Eingabe (Queue zuerst, dann normales Eingabefeld) ------------
+queued = st.session_state.pop("queued_input", None)
+queued_label = st.session_state.pop("queued_label", None)
+
+prompt = None
+if queued:
+    prompt = queued
+else:
+    prompt = st.chat_input("Nachricht an den Agenten eingeben und mit Enter senden…")
+
+if prompt:
+    # 1) User Nachricht anzeigen/speichern
+    display_text = prompt
+    if prompt.startswith("USE_SUGGESTION ") and queued_label:
+        display_text = f"[Auswahl] {queued_label}"
+    st.session_state.messages.append({"role": "user", "content": display_text})
+    with st.chat_message("user"):
+        st.markdown(display_text)
+
+    # 2) Agent call mit Iterations-Injektion + echter SDK-Session
+    if not AGENTS_OK:
+        answer = "**Fehler:** Agents SDK nicht verfügbar. Bitte SDK installieren/konfigurieren und Server neu starten."
+        raw_answer = answer
+        result = None
+    else:
+        iteration_context = ""
+        if st.session_state.last_code:
+            iteration_context = f"\n\n[EXISTING_CODE_BEGIN]\n{st.session_state.last_code}\n[EXISTING_CODE_END]\n"
+        history_note = ""
+        if st.session_state.messages[:-1]:
+            history_note = "\n\n[HISTORY NOTE] Continue this session; respond naturally and follow iteration rules.\n"
+
+        # Alte Vorschläge ausblenden – neue wird das Tool setzen
+        st.session_state["l1_suggestions"] = []
+
+        # >>> Persistente SDK-Session übergeben (SQLiteSession)
+        try:
+            result = run_agent(
+                _get_agent(),
+                input=(prompt + history_note + iteration_context),
+                session=_get_sdk_session(),  # type: ignore
+            )
+            raw_answer = result.final_output or ""
+        except TimeoutError as e:
+            result, raw_answer = None, f"**Fehler:** {e}"
+        answer = raw_answer
+
+        # ---- NEU: Versuche, PLAN_SPEC zuerst direkt aus result-Objekt zu lesen
+        plan_spec_obj = None
+        try:
+            # gängige Pfade in der Agents SDK (robust gegen Varianten)
+            if hasattr(result, "outputs") and isinstance(result.outputs, dict) and result.outputs.get("plan_spec"):
+                plan_spec_obj = result.outputs.get("plan_spec")
+            elif hasattr(result, "named_outputs") and isinstance(result.named_outputs, dict) and result.named_outputs.get("plan_spec"):
+                plan_spec_obj = result.named_outputs.get("plan_spec")
+            elif hasattr(result, "get_output") and callable(result.get_output):
+                plan_spec_obj = result.get_output("plan_spec")  # type: ignore
+        except Exception:
+            plan_spec_obj = None
+
+        # Falls nicht im Result-Kanal: aus sichtbarem Text extrahieren & entfernen
+        if plan_spec_obj is None:
+            extracted, cleaned_text = _extract_plan_spec_from_text(raw_answer)
+            if extracted:
+                plan_spec_obj = extracted
+                answer = cleaned_text  # UI-bereinigte Antwort
+        # persistieren (debugbar, aber nicht in UI angezeigt)
+        if plan_spec_obj is not None and _looks_like_plan_spec(plan_spec_obj):
+            st.session_state.last_plan_spec = plan_spec_obj
+            st.session_state.last_plan_spec_raw = json.dumps(plan_spec_obj, ensure_ascii=False, indent=2)
+
+    # 3) Assistant-Antwort rendern — PLAN_SPEC ist ggf. schon entfernt
+    with st.chat_message("assistant"):
+        st.markdown(answer)
+    st.session_state.messages.append({"role": "assistant", "content": answer})
+
+    # 4) Hidden execution pipeline: auto-heal, dann rendern (keine Code-Anzeige)
+    code_block = extract_first_python_block(answer)
+    if code_block:
+        st.session_state.last_code = code_block  # nur für "Code anzeigen"
+        with st.spinner("Warte auf Earth Engine …"):
+            ee_ready = ee_wait_ready(timeout=120)
+        if not ee_ready:
+            st.error(f"Earth Engine ist nicht initialisiert: {ee_init_state().error or 'Timeout'}")
+            ok, final_code, heal_log = False, code_block, "EE nicht bereit."
+        else:
+            from blocks.components.util.jobs import job_owner
+            with job_owner(st.session_state.agent_session_id):  # Jobs aus dem Dry-Run gehören der Session
+                ok, final_code, heal_log = self_heal_until_runs(code_block, max_rounds=5)
+        if ok:
+            # neue App wird unten als Fragment im Ausgabebereich gemountet
+            st.session_state["healed_code"] = final_code
+            with st.sidebar:
+                st.caption("✅ Code automatisch repariert & ausgeführt.")
+        else:
+            # Keine Code-Anzeige – nur Logs, damit Fixer weiter iterieren kann
+            with st.expander("Fehler beim automatischen Ausführen – Logs", expanded=True):
+                st.write(heal_log)
+            with st.sidebar:
+                st.warning("Automatische Reparatur noch nicht erfolgreich.")
+
+# === Generierte App: bleibt über Reruns stehen, Widgets rerunnen nur das Fragment ===
+if st.session_state.get("healed_code"):
+    with app_ph.container():
+        _generated_app()
+
 # === Debug: Code nur anzeigen, wenn explizit gewünscht ========================
 if st.session_state.get("show_code", False):
     shown = st.session_state.get("healed_code") or st.session_state.get("last_code")
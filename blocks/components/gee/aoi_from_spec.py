@@ -11,21 +11,30 @@ Unterstützte Varianten:
 
 Contracts
 ---------
-def aoi_from_spec(spec: dict) -> ee.Geometry
+def aoi_from_spec(spec: dict, with_info: bool = False) -> ee.Geometry | tuple[ee.Geometry, AoiInfo]
+def map_zoom(info: AoiInfo, width_px: int = 600) -> int
 
 Args
 ----
 spec : dict
     Strukturierte AOI-Spezifikation (siehe Varianten).
+with_info : bool
+    True → zusätzlich lokaler Geometrie-Deskriptor (AoiInfo), ohne EE-Round-Trip.
+info, width_px : Deskriptor und Kartenbreite in Pixeln für map_zoom.
 
 Returns
 -------
 ee.Geometry
     Rechteck, Polygon oder Punkt (bei Buffer → bounds()).
+AoiInfo (TypedDict, nur with_info=True)
+    kind, bbox (W, S, E, N), centroid (lon, lat), area_km2, width_km, height_km.
 
 Side Effects
 ------------
-Keine (kein Streamlit, kein globaler State).
+Kein Streamlit. "place": aufgelöste Namen landen im Place-Cache (Prozess-LRU +
+SQLite, util/place_cache.py). with_info für Place-Polygone ohne lokal bekannte
+Bounds/Fläche holt Bounds, Centroid und Fläche einmalig per getInfo() und legt
+sie dort ab.
 
 Raises
 ------
@@ -35,17 +44,48 @@ ValueError
 Notes
 -----
 - Keine UI. Kein Freitext-Parser.
-- "place" nutzt geemap.geocode(...) und bevorzugt die Bounding Box des Geocoders.
+- "place": Place-Cache → lokaler GAUL-Index (gaul_index.py; ADM1 nur mit Länderzusatz) →
+  geemap.geocode(...) (bevorzugt die Bounding Box des Geocoders).
 - Bei vorhandenem radius_km wird auf den Centroid gepuffert und .bounds() genutzt.
+  Geometrie und AoiInfo nutzen denselben Punkt: Polygon-Records ohne Centroid
+  (GAUL-Index) holen ihn bei with_info einmal per getInfo (dann im Place-Cache).
+- AoiInfo wird geodätisch berechnet: Fläche auf dem WGS84-Ellipsoid (authalische
+  Breite), Buffer-Bounds und Kantenlängen auf der Kugel (R = 6371.0088 km).
+  Werte entsprechen den EE-Geometrien bis auf die Polygon-Approximation des Buffers.
+- area_km2 ist die Fläche der zurückgegebenen Geometrie, nicht der Bounding Box:
+  Rechtecke (bbox, Buffer-Bounds, Geocoder-Box) lokal, GAUL-Polygone aus dem
+  Index bzw. per geom.area() (zusammen mit den Bounds geholt, dann gecacht).
+- Gedacht für Karten-Zentrierung, Maßstabs- und Kachel-Entscheidungen ohne getInfo().
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import math
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
 
 import ee
 import geemap
 
+from ..util.place_cache import get_place, put_place
+from .gaul_index import load_gaul_index, lookup_place
+
+BBox = Tuple[float, float, float, float]  # (W, S, E, N)
+
+_R_MEAN_KM = 6371.0088
+_WGS84_A_KM = 6378.137
+_WGS84_E2 = 6.69437999014e-3
+_GAUL0 = "FAO/GAUL/2015/level0"
+_GAUL1 = "FAO/GAUL/2015/level1"
+
+
+class AoiInfo(TypedDict):
+    kind: str                      # "bbox" | "point_buffer" | "place"
+    bbox: BBox
+    centroid: Tuple[float, float]  # (lon, lat)
+    area_km2: float                # Fläche der Geometrie (nicht der bbox)
+    width_km: float                # Ost-West-Ausdehnung auf Höhe des Centroids
+    height_km: float
+
 
 def _validate_lonlat(lon: float, lat: float) -> None:
     if not (-180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0):
@@ -61,6 +101,56 @@ def _to_float_pair(value: List[Any]) -> Tuple[float, float]:
     return lon, lat
 
 
+def _q_authalic(lat_deg: float) -> float:
+    e = math.sqrt(_WGS84_E2)
+    s = math.sin(math.radians(lat_deg))
+    return (1 - _WGS84_E2) * (s / (1 - _WGS84_E2 * s * s)
+                              - math.log((1 - e * s) / (1 + e * s)) / (2 * e))
+
+
+def _rect_area_km2(bbox: BBox) -> float:
+    """Fläche eines Länge/Breite-Rechtecks auf dem WGS84-Ellipsoid."""
+    west, south, east, north = bbox
+    dlon = math.radians(east - west)
+    return abs(0.5 * _WGS84_A_KM ** 2 * dlon * (_q_authalic(north) - _q_authalic(south)))
+
+
+def _buffer_bounds(lon: float, lat: float, radius_m: float) -> BBox:
+    """Bounds eines geodätischen Kreises (Kugel); über einen Pol → volle Längen."""
+    ang = radius_m / 1000.0 / _R_MEAN_KM
+    dlat = math.degrees(ang)
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    cos_lat = math.cos(math.radians(lat))
+    if north >= 90.0 or south <= -90.0 or cos_lat <= 0 or math.sin(ang) >= cos_lat:
+        return (-180.0, south, 180.0, north)
+    dlon = math.degrees(math.asin(math.sin(ang) / cos_lat))
+    return (max(-180.0, lon - dlon), south, min(180.0, lon + dlon), north)
+
+
+def _info(kind: str, bbox: BBox, centroid: Optional[Tuple[float, float]] = None,
+          area_km2: Optional[float] = None) -> AoiInfo:
+    west, south, east, north = (float(v) for v in bbox)
+    lon, lat = centroid if centroid is not None else ((west + east) / 2.0, (south + north) / 2.0)
+    return AoiInfo(
+        kind=kind,
+        bbox=(west, south, east, north),
+        centroid=(float(lon), float(lat)),
+        area_km2=float(area_km2) if area_km2 is not None else _rect_area_km2((west, south, east, north)),
+        width_km=_R_MEAN_KM * math.radians(east - west) * math.cos(math.radians(lat)),
+        height_km=_R_MEAN_KM * math.radians(north - south),
+    )
+
+
+def map_zoom(info: AoiInfo, width_px: int = 600) -> int:
+    """Web-Mercator-Zoomstufe, bei der die AOI-Bounds in width_px passen."""
+    west, south, east, north = info["bbox"]
+    span = max(east - west, (north - south) / max(1e-6, math.cos(math.radians(info["centroid"][1]))))
+    if span <= 0:
+        return 12
+    zoom = math.log2(360.0 * max(1, int(width_px)) / (256.0 * span))
+    return int(max(1, min(18, math.floor(zoom))))
+
+
 def _bbox_to_geometry(bbox: List[Any]) -> ee.Geometry:
     if not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
         raise ValueError("bbox must be [minLon, minLat, maxLon, maxLat].")
@@ -75,36 +165,11 @@ def _bbox_to_geometry(bbox: List[Any]) -> ee.Geometry:
     return ee.Geometry.Rectangle([min_lon, min_lat, max_lon, max_lat])
 
 
-def _place_to_geometry(name: str) -> ee.Geometry:
+def _geocode_bbox(place: str) -> BBox:
     """
-    Erzeuge Geometrie aus einem "place"-Namen.
-    Reihenfolge:
-      1) GAUL Admin-Grenze Level 1 (z. B. 'Berlin, Germany').
-      2) Fallback: geemap.geocode(name) – funktioniert mit Nominatim-Dicts ODER ArcGIS-Objekten.
+    Bounds (W, S, E, N) via geemap.geocode(name) – funktioniert mit Nominatim-Dicts
+    ODER ArcGIS-Objekten. Punkt-Treffer → degenerierte Box (lon, lat, lon, lat).
     """
-    if not isinstance(name, str) or not name.strip():
-        raise ValueError("place.name must be a non-empty string.")
-    place = name.strip()
-
-    # 1) Admin-Grenze (GAUL L1): '<Region>, <Country>'
-    try:
-        parts = [p.strip() for p in place.split(",")]
-        if len(parts) >= 2:
-            region = parts[0]
-            country = parts[-1]
-            gaul = ee.FeatureCollection("FAO/GAUL/2015/level1")
-            fc = gaul.filter(ee.Filter.And(
-                ee.Filter.eq("ADM1_NAME", region),
-                ee.Filter.eq("ADM0_NAME", country)
-            ))
-            candidate = fc.first()
-            geom = ee.Feature(candidate).geometry()
-            _ = geom.bounds()  # Validierung
-            return geom
-    except Exception:
-        pass  # Fallback auf Geocoding
-
-    # 2) Geocoding via geemap (provider-agnostisch)
     try:
         results = geemap.geocode(place)
     except Exception as ge:
@@ -124,11 +189,11 @@ def _place_to_geometry(name: str) -> ee.Geometry:
             south, north, west, east = map(float, bbox)  # [S, N, W, E]
             _validate_lonlat(west, south); _validate_lonlat(east, north)
             if west < east and south < north:
-                return ee.Geometry.Rectangle([west, south, east, north])
+                return (west, south, east, north)
         if lat is not None and lon is not None:
             lon_f, lat_f = float(lon), float(lat)
             _validate_lonlat(lon_f, lat_f)
-            return ee.Geometry.Point([lon_f, lat_f])
+            return (lon_f, lat_f, lon_f, lat_f)
         raise ValueError(f"Geocoding (Nominatim) result for '{place}' lacks usable geometry.")
 
     # 2b) ArcGIS: Objekt mit .bbox (W,S,E,N), .latlng (lat, lon) oder .json
@@ -138,13 +203,13 @@ def _place_to_geometry(name: str) -> ee.Geometry:
             west, south, east, north = map(float, bbox_attr)
             _validate_lonlat(west, south); _validate_lonlat(east, north)
             if west < east and south < north:
-                return ee.Geometry.Rectangle([west, south, east, north])
+                return (west, south, east, north)
 
         latlng_attr = getattr(best, "latlng", None)
         if latlng_attr and len(latlng_attr) == 2:
             lat, lon = float(latlng_attr[0]), float(latlng_attr[1])
             _validate_lonlat(lon, lat)
-            return ee.Geometry.Point([lon, lat])
+            return (lon, lat, lon, lat)
 
         json_attr = getattr(best, "json", None)
         if isinstance(json_attr, dict):
@@ -153,25 +218,25 @@ def _place_to_geometry(name: str) -> ee.Geometry:
                 west, south, east, north = map(float, jbbox)
                 _validate_lonlat(west, south); _validate_lonlat(east, north)
                 if west < east and south < north:
-                    return ee.Geometry.Rectangle([west, south, east, north])
+                    return (west, south, east, north)
             extent = json_attr.get("extent") or json_attr.get("Extents")
             if isinstance(extent, dict):
                 xmin = float(extent.get("xmin")); ymin = float(extent.get("ymin"))
                 xmax = float(extent.get("xmax")); ymax = float(extent.get("ymax"))
                 _validate_lonlat(xmin, ymin); _validate_lonlat(xmax, ymax)
                 if xmin < xmax and ymin < ymax:
-                    return ee.Geometry.Rectangle([xmin, ymin, xmax, ymax])
+                    return (xmin, ymin, xmax, ymax)
 
         loc = getattr(best, "location", None)
         if isinstance(loc, dict) and "x" in loc and "y" in loc:
             lon, lat = float(loc["x"]), float(loc["y"])
             _validate_lonlat(lon, lat)
-            return ee.Geometry.Point([lon, lat])
+            return (lon, lat, lon, lat)
 
         if hasattr(best, "x") and hasattr(best, "y"):
             lon, lat = float(getattr(best, "x")), float(getattr(best, "y"))
             _validate_lonlat(lon, lat)
-            return ee.Geometry.Point([lon, lat])
+            return (lon, lat, lon, lat)
 
     except Exception:
         pass
@@ -179,14 +244,96 @@ def _place_to_geometry(name: str) -> ee.Geometry:
     raise ValueError(f"Geocoding (ArcGIS) result for '{place}' lacks usable geometry.")
 
 
+def _geometry_from_record(rec: Dict[str, Any]) -> ee.Geometry:
+    src = rec.get("source")
+    if src == "gaul1":
+        fc = ee.FeatureCollection(_GAUL1).filter(ee.Filter.eq("ADM1_CODE", int(rec["code"])))
+        return fc.geometry()
+    if src == "gaul0":
+        fc = ee.FeatureCollection(_GAUL0).filter(ee.Filter.eq("ADM0_CODE", int(rec["code"])))
+        return fc.geometry()
+    if src == "gaul1_name":
+        fc = ee.FeatureCollection(_GAUL1).filter(ee.Filter.And(
+            ee.Filter.eq("ADM1_NAME", rec["adm1_name"]),
+            ee.Filter.eq("ADM0_NAME", rec["adm0_name"]),
+        ))
+        return ee.Feature(fc.first()).geometry()
+    west, south, east, north = (float(v) for v in rec["bbox"])
+    if west == east and south == north:
+        return ee.Geometry.Point([west, south])
+    return ee.Geometry.Rectangle([west, south, east, north])
+
+
+def _resolve_place(name: str) -> Tuple[ee.Geometry, Dict[str, Any]]:
+    """
+    Erzeuge Geometrie aus einem "place"-Namen, dazu den Place-Record
+    (bbox/centroid, soweit clientseitig bekannt).
+    Reihenfolge:
+      0) Place-Cache (In-Memory-LRU → SQLite), siehe util/place_cache.py.
+      1) GAUL Admin-Grenze aus dem lokalen Index (gaul_index.py, unscharf):
+         "Region, Country" → ADM1, Name ohne Zusatz → nur ADM0.
+         Ohne Index: Server-Filter auf GAUL L1 für '<Region>, <Country>'.
+      2) Fallback: geemap.geocode(name).
+    """
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("place.name must be a non-empty string.")
+    place = name.strip()
 
-def aoi_from_spec(spec: Dict[str, Any]) -> ee.Geometry:
+    rec = get_place(place)
+    if rec is not None and not (rec.get("source") == "gaul1" and "," not in place):
+        return _geometry_from_record(rec), rec  # ADM1 ohne Länderzusatz (alte Einträge) → neu auflösen
+
+    # 1) Admin-Grenze (GAUL): lokaler Index, sonst Server-Filter '<Region>, <Country>'
+    hit = lookup_place(place)
+    if hit is not None:
+        rec = {"source": f"gaul{hit['level']}", "code": hit["code"], "bbox": hit["bbox"],
+               "name": hit["name"], "adm0_name": hit["adm0_name"]}
+        if hit.get("area_km2") is not None:
+            rec["area_km2"] = hit["area_km2"]
+        put_place(place, rec)
+        return _geometry_from_record(rec), rec
+    parts = [p.strip() for p in place.split(",")]
+    if load_gaul_index() is None and len(parts) >= 2:
+        rec = {"source": "gaul1_name", "adm1_name": parts[0], "adm0_name": parts[-1]}
+        return _geometry_from_record(rec), rec  # unvalidiert → nicht persistieren
+
+    # 2) Geocoding via geemap (provider-agnostisch)
+    rec = {"source": "geocode", "bbox": list(_geocode_bbox(place))}
+    put_place(place, rec)
+    return _geometry_from_record(rec), rec
+
+
+def _place_to_geometry(name: str) -> ee.Geometry:
+    return _resolve_place(name)[0]
+
+
+def _server_place_info(name: str, geom: ee.Geometry,
+                       rec: Dict[str, Any]) -> Tuple[BBox, Tuple[float, float], float]:
+    """Bounds, Centroid und Fläche einer Place-Geometrie; ein getInfo, dann im Place-Cache."""
+    got = ee.Dictionary({
+        "bounds": geom.bounds(1),
+        "centroid": geom.centroid(1),
+        "area": geom.area(1),
+    }).getInfo()
+    ring = got["bounds"]["coordinates"][0]
+    lons = [pt[0] for pt in ring]
+    lats = [pt[1] for pt in ring]
+    bbox = (min(lons), min(lats), max(lons), max(lats))
+    centroid = tuple(got["centroid"]["coordinates"])
+    area_km2 = float(got["area"]) / 1e6
+    put_place(name, dict(rec, bbox=list(bbox), centroid=list(centroid), area_km2=area_km2))
+    return bbox, centroid, area_km2
+
+
+def aoi_from_spec(spec: Dict[str, Any],
+                  with_info: bool = False) -> Union[ee.Geometry, Tuple[ee.Geometry, AoiInfo]]:
     """
     Spec-Varianten (eine davon):
       {"type":"bbox","bbox":[minLon,minLat,maxLon,maxLat]}
       {"type":"point_buffer","point":[lon,lat],"radius_km":15}
       {"type":"place","name":"Shenzhen, China","radius_km":10}
       {"type":"region",...} → (optional) darf ValueError werfen, wenn nicht unterstützt
+    with_info=True → (ee.Geometry, AoiInfo)
     """
     if not isinstance(spec, dict):
         raise ValueError("aoi_spec must be a dict.")
@@ -198,6 +345,8 @@ def aoi_from_spec(spec: Dict[str, Any]) -> ee.Geometry:
     if t == "bbox":
         bbox = spec.get("bbox", None)
         geom = _bbox_to_geometry(bbox)
+        if with_info:
+            return geom, _info("bbox", tuple(float(v) for v in bbox))
         return geom
 
     if t == "point_buffer":
@@ -208,22 +357,41 @@ def aoi_from_spec(spec: Dict[str, Any]) -> ee.Geometry:
         lon, lat = _to_float_pair(point)
         radius_m = float(radius_km) * 1000.0
         pt = ee.Geometry.Point([lon, lat])
-        return pt.buffer(radius_m).bounds()
+        geom = pt.buffer(radius_m).bounds()
+        if with_info:
+            return geom, _info("point_buffer", _buffer_bounds(lon, lat, radius_m))
+        return geom
 
     if t == "place":
         name = spec.get("name", None)
         if not name:
             raise ValueError("place requires 'name'.")
-        geom = _place_to_geometry(name)
+        geom, rec = _resolve_place(name)
         radius_km = spec.get("radius_km", None)
-        if radius_km is not None:
-            try:
-                radius_m = float(radius_km) * 1000.0
-                centroid = geom.centroid()
-                return centroid.buffer(radius_m).bounds()
-            except Exception:
-                return geom.buffer(float(radius_km) * 1000.0).bounds()
-        return geom
+        radius_m = float(radius_km) * 1000.0 if radius_km is not None else None
+
+        place_bbox, place_center, place_area = rec.get("bbox"), rec.get("centroid"), rec.get("area_km2")
+        polygon = str(rec.get("source", "")).startswith("gaul")
+        if with_info and (place_bbox is None or (polygon and place_center is None)
+                          or (radius_m is None and polygon and place_area is None)):
+            place_bbox, place_center, place_area = _server_place_info(name, geom, rec)
+        if place_center is None and place_bbox is not None and not polygon:
+            # Geocoder-Box/-Punkt: Mitte der Box = Centroid der Geometrie
+            place_center = ((place_bbox[0] + place_bbox[2]) / 2.0, (place_bbox[1] + place_bbox[3]) / 2.0)
+
+        if radius_m is None:
+            out = geom
+        elif place_center is not None:
+            # Server-Geometrie und AoiInfo puffern denselben Punkt
+            out = ee.Geometry.Point([float(place_center[0]), float(place_center[1])]).buffer(radius_m).bounds()
+        else:
+            out = geom.centroid().buffer(radius_m).bounds()  # nur ohne with_info (kein getInfo)
+        if not with_info:
+            return out
+        if radius_m is None:
+            return out, _info("place", place_bbox, place_center, place_area)
+        lon, lat = place_center
+        return out, _info("place", _buffer_bounds(float(lon), float(lat), radius_m))
 
     if t == "region":
         # Optional: aktuell nicht implementiert — bewusst klarer Fehler
@@ -0,0 +1,182 @@
+# blocks/components/gee/batch_composite.py
+"""
+Purpose
+-------
+Batch-Engine für Komposite über viele Zeitfenster (z. B. "jeder Sommer 2013–2025"):
+- Beliebige Acquire-Funktion (start, end) → ee.Image wird EINMAL als Funktions-
+  körper serialisiert und serverseitig über die Fensterliste gemappt
+  → eine ImageCollection statt N einzelner Graphen
+- Statistiken aller Fenster in einem getInfo() (DataFrame)
+- Thumbnails aller Fenster in einem Abruf (Filmstreifen, lokal in Frames geteilt)
+
+Contracts
+---------
+def windows_from(window_fn: Callable[..., tuple[ee.Date, ee.Date]], keys: Iterable) -> list[tuple[str, ee.Date, ee.Date]]
+def batch_composites(acquire: Callable[[ee.Date, ee.Date], ee.Image],
+                     windows: Sequence[tuple[str, ee.Date, ee.Date]]) -> ee.ImageCollection
+def batch_stats(col: ee.ImageCollection, aoi: ee.Geometry, native_scale: float,
+                reducer: str = "mean", bands: Sequence[str] | None = None,
+                scale: float | None = None, pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                area_km2: float | None = None) -> pandas.DataFrame
+def batch_thumbs(col: ee.ImageCollection, labels: Sequence[str], vis_params: dict,
+                 region: ee.Geometry, dimensions: int = 256, timeout: int = 120) -> dict[str, bytes]
+
+Args
+----
+window_fn : z. B. summer_window, quarter_window, month_window
+keys : je Fenster ein Argument oder Argument-Tupel (z. B. range(2013, 2026), [(2023, 1), ...])
+acquire : (start, end) → ee.Image; AOI u. ä. per lambda/functools.partial binden,
+          z. B. lambda s, e: build_lst_image(aoi, s, e)
+windows : [(label, start, end), ...]  (start/end als ee.Date oder ISO-String)
+col : Ergebnis von batch_composites (Properties label, window_index)
+native_scale, scale, pixel_budget, area_km2 : siehe reduce_budget.py
+reducer : "mean" | "median" | "min" | "max" | "sum"
+bands : Bänder für die Statistik (None = alle)
+labels : Fenster-Labels in Reihenfolge von col (wie in windows)
+vis_params : Visualisierung (bands/min/max/palette) je Frame
+
+Returns
+-------
+batch_composites → ee.ImageCollection, je Fenster ein Bild mit Properties
+  label, window_index, system:time_start, window_end, n_bands
+batch_stats → DataFrame [label, start, <band>...] in Fensterreihenfolge
+  (None für Fenster ohne Daten)
+batch_thumbs → {label: PNG-Bytes}
+
+Side Effects
+------------
+batch_stats: ein getInfo(). batch_thumbs: ein HTTP-Abruf (Cache: util/thumb_cache.py).
+
+Notes
+-----
+- Die Acquire-Funktion muss rein serverseitig arbeiten (kein getInfo, keine
+  Python-Verzweigung auf start/end), da sie mit Platzhalter-Datumswerten
+  aufgerufen wird; das gilt für alle *_acquire_*-Bausteine im Repo.
+- Fenster ohne Daten liefern Bilder ohne Bänder (n_bands = 0); batch_thumbs
+  rendert sie als transparente Frames, batch_stats als None-Zeilen.
+"""
+from __future__ import annotations
+
+import io
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import ee
+import pandas as pd
+from PIL import Image
+
+from ..util.thumb_cache import fetch_filmstrip_thumb
+from .reduce_budget import DEFAULT_PIXEL_BUDGET, reduce_region_kwargs
+
+Window = Tuple[str, Union[ee.Date, str], Union[ee.Date, str]]
+
+_REDUCERS = ("mean", "median", "min", "max", "sum")
+_VIS_BANDS = ["vis-red", "vis-green", "vis-blue"]
+
+
+def windows_from(window_fn: Callable[..., Tuple[ee.Date, ee.Date]], keys: Iterable[Any]) -> List[Window]:
+    """Fensterliste aus einer Fensterfunktion; Label = Schlüssel, Tupel mit "-" verbunden ("2020", "2023-1")."""
+    out: List[Window] = []
+    for key in keys:
+        args = tuple(key) if isinstance(key, (tuple, list)) else (key,)
+        start, end = window_fn(*args)
+        out.append(("-".join(str(a) for a in args), start, end))
+    return out
+
+
+def batch_composites(acquire: Callable[[ee.Date, ee.Date], ee.Image],
+                     windows: Sequence[Window]) -> ee.ImageCollection:
+    """Alle Fenster als eine serverseitig gemappte ImageCollection."""
+    if not windows:
+        raise ValueError("windows must not be empty")
+    labels = ee.List([str(w[0]) for w in windows])
+    spans = ee.List([ee.List([ee.Date(w[1]).millis(), ee.Date(w[2]).millis()]) for w in windows])
+
+    def build(i):
+        i = ee.Number(i)
+        span = ee.List(spans.get(i))
+        start, end = ee.Date(span.get(0)), ee.Date(span.get(1))
+        img = ee.Image(acquire(start, end))
+        return img.set({
+            "label": labels.get(i),
+            "window_index": i,
+            "system:time_start": start.millis(),
+            "window_end": end.millis(),
+            "n_bands": img.bandNames().size(),
+        })
+
+    return ee.ImageCollection(ee.List.sequence(0, len(windows) - 1).map(build))
+
+
+def batch_stats(col: ee.ImageCollection,
+                aoi: ee.Geometry,
+                native_scale: float,
+                reducer: str = "mean",
+                bands: Optional[Sequence[str]] = None,
+                scale: Optional[float] = None,
+                pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                area_km2: Optional[float] = None) -> pd.DataFrame:
+    """AOI-Statistik je Fenster, alle Fenster in einem getInfo()."""
+    if reducer not in _REDUCERS:
+        raise ValueError(f"Unsupported reducer: {reducer!r}")
+    red = getattr(ee.Reducer, reducer)()
+    kwargs = reduce_region_kwargs(aoi, native_scale, scale, pixel_budget, False, area_km2)
+
+    def row(img):
+        img = ee.Image(img)
+        src = img.select(list(bands)) if bands else img
+        stats = src.reduceRegion(reducer=red, geometry=aoi, **kwargs)
+        return ee.Feature(None, stats).set({
+            "label": img.get("label"),
+            "window_index": img.get("window_index"),
+            "start": img.get("system:time_start"),
+        })
+
+    feats = ee.FeatureCollection(col.map(row)).getInfo()["features"]
+    rows = sorted((f["properties"] for f in feats), key=lambda p: p.get("window_index", 0))
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df["start"] = pd.to_datetime(df["start"], unit="ms")
+    value_cols = list(bands) if bands else [c for c in df.columns if c not in ("label", "window_index", "start")]
+    for c in value_cols:
+        if c not in df.columns:
+            df[c] = None
+    return df[["label", "start"] + value_cols].reset_index(drop=True)
+
+
+def _split_strip(data: bytes, n: int) -> List[bytes]:
+    strip = Image.open(io.BytesIO(data))
+    w, h = strip.size
+    vertical = h % n == 0 and (w % n != 0 or h >= w)
+    step = (h if vertical else w) // n
+    frames: List[bytes] = []
+    for k in range(n):
+        box = (0, k * step, w, (k + 1) * step) if vertical else (k * step, 0, (k + 1) * step, h)
+        buf = io.BytesIO()
+        strip.crop(box).save(buf, format="PNG")
+        frames.append(buf.getvalue())
+    return frames
+
+
+def batch_thumbs(col: ee.ImageCollection,
+                 labels: Sequence[str],
+                 vis_params: Dict[str, Any],
+                 region: ee.Geometry,
+                 dimensions: int = 256,
+                 timeout: int = 120) -> Dict[str, bytes]:
+    """PNG-Thumbnail je Fenster aus einem einzigen Filmstreifen-Abruf."""
+    labels = [str(l) for l in labels]
+    if not labels:
+        return {}
+    blank = ee.Image.constant([0, 0, 0]).rename(_VIS_BANDS).uint8().updateMask(0)
+
+    def vis(img):
+        img = ee.Image(img)
+        out = ee.Image(ee.Algorithms.If(
+            img.bandNames().size().gt(0), img.visualize(**vis_params), blank
+        ))
+        return ee.Image(out.copyProperties(img, ["system:time_start"]))
+
+    params = {"region": region, "dimensions": dimensions, "format": "png"}
+    data = fetch_filmstrip_thumb(col.map(vis), params, timeout=timeout)
+    return dict(zip(labels, _split_strip(data, len(labels))))
@@ -3,7 +3,10 @@
 Purpose
 -------
 GEE-Logik für 'cool_spots' (Sommer-Hitzeinseln):
-- Landsat 8/9 Collection 2 Level 2 laden/mergen
+- Landsat 8/9 Collection 2 Level 2 laden/mergen, nur benötigte Bänder
+  (LST_REQUIRED_BANDS) direkt beim Laden selektiert
+- Optionale Szenen-Vorauswahl: nach CLOUD_COVER + AOI-lokalem Klaranteil nur so
+  viele Szenen, wie für target_coverage nötig sind (scene_prune.prune_scenes)
 - QA-Masken anwenden (QA_PIXEL Bits 1..5 == 0)
 - LST in °C aus ST_B10 berechnen (Skalierung + Kelvin→°C)
 - Sommer-Median bilden
@@ -11,15 +14,22 @@ GEE-Logik für 'cool_spots' (Sommer-Hitzeinseln):
 
 Contracts
 ---------
+LST_REQUIRED_BANDS = ("ST_B10", "QA_PIXEL")
 def mask_landsat_l2(img: ee.Image) -> ee.Image
 def add_lst_celsius(img: ee.Image) -> ee.Image
-def build_lst_image(aoi: ee.Geometry, start: ee.Date, end: ee.Date) -> ee.Image
+def build_lst_image(aoi: ee.Geometry, start: ee.Date, end: ee.Date,
+                    target_coverage: float | None = None, max_candidates: int = 40,
+                    area_km2: float | None = None) -> ee.Image
 
 Args
 ----
 img : ee.Image
 aoi : ee.Geometry
 start, end : ee.Date
+target_coverage : float | None   Ziel-Klarabdeckung der AOI (opt-in, z. B. 0.98);
+                                 None = alle Szenen (Default, bisheriges Verhalten)
+max_candidates : int    Obergrenze der Kandidaten nach CLOUD_COVER (L8+L9 zusammen)
+area_km2 : float | None AOI-Fläche, falls lokal bekannt (AoiInfo) → grober QA-Maßstab als Zahl
 
 Returns
 -------
@@ -33,24 +43,36 @@ Keine.
 Notes
 -----
 - QA-Bits, Formeln und Datasets 1:1 aus der Vorlage übernommen.
+- Band-Pushdown: Maske/LST laufen pro Bild nur über ST_B10 + QA_PIXEL und
+  liefern nur LST_C (Prüfung: scripts/check_band_pushdown.py).
+- Vorauswahl nutzt dieselben QA-Bits wie die Maske (grob reduziert, ≈1e4 Pixel je Szene).
 """
 
+from typing import Optional
+
 import ee
 
-def mask_landsat_l2(img: ee.Image) -> ee.Image:
-    """
-    Mask Landsat Collection 2 Level 2 image using QA_PIXEL:
-    Bits: 1=dilated, 2=cirrus, 3=cloud, 4=cloud shadow, 5=snow → all must be 0.
-    """
+from .scene_prune import prune_scenes
+
+LST_REQUIRED_BANDS = ("ST_B10", "QA_PIXEL")
+_LANDSAT_L2_IDS = ("LANDSAT/LC08/C02/T1_L2", "LANDSAT/LC09/C02/T1_L2")
+
+def _landsat_clear(img: ee.Image) -> ee.Image:
     qa = img.select("QA_PIXEL")
-    cond = (
+    return (
         qa.bitwiseAnd(1 << 1).eq(0)  # dilated
         .And(qa.bitwiseAnd(1 << 2).eq(0))  # cirrus
         .And(qa.bitwiseAnd(1 << 3).eq(0))  # cloud
         .And(qa.bitwiseAnd(1 << 4).eq(0))  # cloud shadow
         .And(qa.bitwiseAnd(1 << 5).eq(0))  # snow
     )
-    return img.updateMask(cond)
+
+def mask_landsat_l2(img: ee.Image) -> ee.Image:
+    """
+    Mask Landsat Collection 2 Level 2 image using QA_PIXEL:
+    Bits: 1=dilated, 2=cirrus, 3=cloud, 4=cloud shadow, 5=snow → all must be 0.
+    """
+    return img.updateMask(_landsat_clear(img))
 
 def add_lst_celsius(img: ee.Image) -> ee.Image:
     """
@@ -62,24 +84,29 @@ def add_lst_celsius(img: ee.Image) -> ee.Image:
     lst_c = lst_k.subtract(273.15).rename("LST_C")
     return img.addBands(lst_c)
 
-def build_lst_image(aoi: ee.Geometry, start: ee.Date, end: ee.Date) -> ee.Image:
+def _lst_c_only(img: ee.Image) -> ee.Image:
+    return add_lst_celsius(mask_landsat_l2(img)).select("LST_C")
+
+def build_lst_image(aoi: ee.Geometry, start: ee.Date, end: ee.Date,
+                    target_coverage: Optional[float] = None,
+                    max_candidates: int = 40,
+                    area_km2: Optional[float] = None) -> ee.Image:
     """
-    Merge Landsat 8/9 L2, mask by QA, compute LST_C band, take summer median, clip to AOI.
+    Merge Landsat 8/9 L2, keep the scenes needed for target_coverage, mask by QA,
+    compute LST_C band, take summer median, clip to AOI.
     """
-    l8 = (
-        ee.ImageCollection("LANDSAT/LC08/C02/T1_L2")
+    parts = [
+        ee.ImageCollection(cid)
         .filterDate(start, end)
         .filterBounds(aoi)
-        .map(mask_landsat_l2)
-        .map(add_lst_celsius)
-    )
-    l9 = (
-        ee.ImageCollection("LANDSAT/LC09/C02/T1_L2")
-        .filterDate(start, end)
-        .filterBounds(aoi)
-        .map(mask_landsat_l2)
-        .map(add_lst_celsius)
-    )
-    merged = l8.merge(l9)
-    lst_median = merged.select("LST_C").median().clip(aoi)
+        .select(list(LST_REQUIRED_BANDS))
+        for cid in _LANDSAT_L2_IDS
+    ]
+    merged = parts[0].merge(parts[1])
+    if target_coverage is not None:
+        merged = prune_scenes(merged, aoi, _landsat_clear, "CLOUD_COVER",
+                              target_coverage=target_coverage, max_candidates=max_candidates,
+                              qa_scale=30, area_km2=area_km2)
+    merged = merged.map(_lst_c_only)
+    lst_median = merged.median().clip(aoi)
     return lst_median
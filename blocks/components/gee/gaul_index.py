@@ -0,0 +1,204 @@
+# blocks/components/gee/gaul_index.py
+"""
+Purpose
+-------
+Lokaler Gazetteer für FAO GAUL 2015 (ADM0 Länder, ADM1 Regionen): Namen, Codes
+und Bounding Boxes in einer vorab gebauten Indexdatei. "Region, Country" und
+Ländernamen werden damit offline und ohne EE-/Geocoder-Aufruf aufgelöst,
+tolerant gegenüber Tippfehlern, Akzenten und Groß/Kleinschreibung.
+
+Contracts
+---------
+def index_path() -> pathlib.Path
+def load_gaul_index() -> dict | None
+def lookup_place(name: str, cutoff: float = 0.85) -> dict | None
+def build_gaul_index(path: str | pathlib.Path | None = None, max_error_m: float = 1000) -> pathlib.Path
+
+Args
+----
+name : str          "Region, Country" (ADM1) oder nur "Country" (ADM0)
+cutoff : float      Mindestähnlichkeit (difflib-Ratio) für unscharfe Treffer
+path : Zielpfad der Indexdatei (Default: index_path())
+max_error_m : Fehlertoleranz der Bounds-/Flächenberechnung beim Bauen
+
+Returns
+-------
+lookup_place → {"level": 0|1, "code": int, "name": str, "adm0_code": int,
+                "adm0_name": str, "bbox": [W, S, E, N], "area_km2": float | None,
+                "score": float} oder None
+load_gaul_index → {"version", "source", "adm0": [...], "adm1": [...]} oder None
+
+Side Effects
+------------
+lookup_place: liest die Indexdatei (einmal pro Prozess/mtime); fehlt sie, einmal
+pro Prozess eine Warnung im Log.
+build_gaul_index: liest GAUL aus Earth Engine (getInfo in Blöcken), schreibt die Datei.
+
+Notes
+-----
+- Indexdatei: T2E_GAUL_INDEX oder <repo>/knowledge/gazetteer/gaul_adm.json.gz.
+  Sie ist nicht eingecheckt (abgeleitete Daten, braucht EE-Zugang) und wird pro
+  Deployment einmal per `python scripts/build_gaul_index.py` erzeugt. Fehlt sie,
+  liefert lookup_place None und loggt das einmal; aoi_from_spec fällt dann für
+  "Region, Country" auf den GAUL-Server-Filter, sonst auf Geocoding zurück.
+- "Region, Country" liefert nur ADM1-Treffer; passt die Region nicht, None
+  (eine Stadt soll nicht stillschweigend zum ganzen Land werden).
+- Ein Name ohne Länderzusatz wird nur gegen ADM0 aufgelöst. Regionsnamen allein
+  gehen an den Geocoder: eine Stadt ("Valencia") soll nicht zur gleichnamigen
+  ADM1-Provinz werden.
+"""
+from __future__ import annotations
+
+import difflib
+import gzip
+import json
+import logging
+import os
+import pathlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import ee
+
+from ..util.place_cache import normalize_place
+
+_DEFAULT_PATH = pathlib.Path(__file__).resolve().parents[3] / "knowledge" / "gazetteer" / "gaul_adm.json.gz"
+_GAUL0 = "FAO/GAUL/2015/level0"
+_GAUL1 = "FAO/GAUL/2015/level1"
+_BUILD_BATCH = 500
+_log = logging.getLogger(__name__)
+
+
+def index_path() -> pathlib.Path:
+    return pathlib.Path(os.environ.get("T2E_GAUL_INDEX") or _DEFAULT_PATH)
+
+
+@lru_cache(maxsize=2)
+def _load(path: str, mtime: float) -> Optional[Dict[str, Any]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    by0: Dict[str, Dict[str, Any]] = {}
+    for row in data.get("adm0", []):
+        by0.setdefault(normalize_place(row["name"]), row)
+    by1: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for row in data.get("adm1", []):
+        by1.setdefault(int(row["adm0_code"]), {}).setdefault(normalize_place(row["name"]), row)
+    data["_by0"], data["_by1"] = by0, by1
+    return data
+
+
+@lru_cache(maxsize=1)
+def _warn_missing(path: str) -> None:
+    _log.warning("GAUL index %s not found; place names fall back to the GAUL server filter/geocoding. "
+                 "Build it with: python scripts/build_gaul_index.py", path)
+
+
+def load_gaul_index() -> Optional[Dict[str, Any]]:
+    path = index_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        _warn_missing(str(path))
+        return None
+    return _load(str(path), mtime)
+
+
+def _best(query: str, keys, cutoff: float) -> Tuple[Optional[str], float]:
+    if query in keys:
+        return query, 1.0
+    hits = difflib.get_close_matches(query, list(keys), n=1, cutoff=cutoff)
+    if not hits:
+        return None, 0.0
+    return hits[0], difflib.SequenceMatcher(None, query, hits[0]).ratio()
+
+
+def _result(level: int, row: Dict[str, Any], adm0_name: str, score: float) -> Dict[str, Any]:
+    return {
+        "level": level,
+        "code": int(row["code"]),
+        "name": row["name"],
+        "adm0_code": int(row.get("adm0_code", row["code"])),
+        "adm0_name": adm0_name,
+        "bbox": [float(v) for v in row["bbox"]],
+        "area_km2": float(row["area_km2"]) if row.get("area_km2") is not None else None,
+        "score": round(float(score), 3),
+    }
+
+
+def lookup_place(name: str, cutoff: float = 0.85) -> Optional[Dict[str, Any]]:
+    """GAUL-Treffer für einen Ortsnamen aus dem lokalen Index (oder None)."""
+    idx = load_gaul_index()
+    if idx is None:
+        return None
+    parts = normalize_place(name).split(", ")
+    if not parts or not parts[0]:
+        return None
+
+    if len(parts) >= 2:
+        c_key, c_score = _best(parts[-1], idx["_by0"], cutoff)
+        if c_key is None:
+            return None
+        country = idx["_by0"][c_key]
+        regions = idx["_by1"].get(int(country["code"]), {})
+        r_key, r_score = _best(parts[0], regions, cutoff)
+        if r_key is None:
+            return None
+        return _result(1, regions[r_key], country["name"], min(c_score, r_score))
+
+    c_key, c_score = _best(parts[0], idx["_by0"], max(cutoff, 0.9))
+    if c_key is None:
+        return None  # kein Land → Geocoder (Städte nicht auf gleichnamige ADM1 abbilden)
+    row = idx["_by0"][c_key]
+    return _result(0, row, row["name"], c_score)
+
+
+def _bbox_rows(fc: ee.FeatureCollection, props: Dict[str, str], max_error_m: float) -> List[Dict[str, Any]]:
+    """Properties, Bounds und Fläche (km²) aller Features, blockweise per getInfo()."""
+    def slim(f):
+        f = ee.Feature(f)
+        out = {k: f.get(src) for k, src in props.items()}
+        out["ring"] = f.geometry().bounds(max_error_m).coordinates().get(0)
+        out["area_km2"] = f.geometry().area(max_error_m).divide(1e6)
+        return ee.Feature(None, out)
+
+    total = fc.size().getInfo()
+    rows: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, total, _BUILD_BATCH):
+        chunk = ee.FeatureCollection(fc.toList(_BUILD_BATCH, start)).map(slim).getInfo()["features"]
+        for feat in chunk:
+            p = feat["properties"]
+            ring = p.pop("ring") or []
+            if not ring or p.get("code") is None:
+                continue
+            lons = [pt[0] for pt in ring]
+            lats = [pt[1] for pt in ring]
+            bbox = [min(lons), min(lats), max(lons), max(lats)]
+            prev = rows.get(int(p["code"]))
+            if prev is not None:  # mehrteilige Einheiten: Bounds vereinigen, Flächen addieren
+                b = prev["bbox"]
+                bbox = [min(b[0], bbox[0]), min(b[1], bbox[1]), max(b[2], bbox[2]), max(b[3], bbox[3])]
+                p["area_km2"] = (p.get("area_km2") or 0.0) + (prev.get("area_km2") or 0.0)
+            p["bbox"] = bbox
+            rows[int(p["code"])] = p
+    return list(rows.values())
+
+
+def build_gaul_index(path=None, max_error_m: float = 1000) -> pathlib.Path:
+    """GAUL ADM0/ADM1 aus Earth Engine lesen und als Indexdatei schreiben."""
+    target = pathlib.Path(path) if path else index_path()
+    adm0 = _bbox_rows(ee.FeatureCollection(_GAUL0), {"code": "ADM0_CODE", "name": "ADM0_NAME"}, max_error_m)
+    adm1 = _bbox_rows(
+        ee.FeatureCollection(_GAUL1),
+        {"code": "ADM1_CODE", "name": "ADM1_NAME", "adm0_code": "ADM0_CODE"},
+        max_error_m,
+    )
+    data = {"version": 2, "source": "FAO/GAUL/2015", "adm0": adm0, "adm1": adm1}
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False)
+    os.replace(tmp, target)
+    return target
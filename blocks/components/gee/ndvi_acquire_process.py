@@ -4,42 +4,84 @@ Purpose
 -------
 Baue eine ImageCollection, in der jedes Element der Median aller MODIS NDVI
 Bilder mit identischem DOY (day-of-year) über das gesamte Archiv ist.
+Optional aus einer materialisierten Asset-Kollektion lesen (einmal pro
+Archivstand berechnet), statt den Archiv-Join bei jedem Aufruf auszuführen.
 
 Contracts
 ---------
-def build_ndvi_doy_composite(ref_year: int = 2019) -> ee.ImageCollection
+def build_ndvi_doy_composite(ref_year: int = 2019, use_materialized: bool = True) -> ee.ImageCollection
+def compute_ndvi_doy_composite(ref_year: int = 2019) -> ee.ImageCollection
+def ndvi_archive_signature() -> dict
+def materialized_ndvi_doy(asset_id: str | None = None, ref_year: int = 2019) -> ee.ImageCollection | None
+def materialize_ndvi_doy_composite(asset_id: str, ref_year: int = 2019, scale: float | None = None) -> list[str]
 
 Args
 ----
 ref_year : int
     Referenzjahr zur Enumeration der DOYs.
+use_materialized : bool
+    Asset nutzen, wenn konfiguriert (T2E_NDVI_DOY_ASSET) und aktuell.
+asset_id : str
+    Ziel-/Quell-ImageCollection-Asset (z. B. "projects/<p>/assets/ndvi_doy_median").
 
 Returns
 -------
 ee.ImageCollection
     Kollektion, deren Bilder nach DOY gruppiert und per Median reduziert sind.
-    Jedes Bild trägt die Eigenschaft 'doy'.
+    Jedes Bild trägt die Eigenschaft 'doy' (Band 'NDVI_median').
+materialize_ndvi_doy_composite → IDs der gestarteten Export-Tasks.
 
 Side Effects
 ------------
-Keine.
+build_ndvi_doy_composite/materialized_ndvi_doy: höchstens ein Metadaten-Call
+für den Frische-Check (lokal gecacht, siehe _FRESHNESS_TTL_S).
+materialize_ndvi_doy_composite: legt das Asset an (falls es fehlt) und startet Export-Tasks
+(overwrite=True: Bilder eines älteren Archivstands werden ersetzt).
 
 Notes
 -----
 Logik 1:1 aus der Vorlage übernommen; Visualisierung/Paletten nicht enthalten.
+Invalidierung: jedes materialisierte Bild trägt 'archive_last_start' (jüngstes
+MOD13A2-Komposit zum Materialisierungszeitpunkt). Ist das Archiv inzwischen
+weiter, gilt das Asset als veraltet → Fallback auf die Live-Berechnung, bis
+neu materialisiert wurde.
+Vollständigkeit: jedes Bild trägt zusätzlich 'doy_count' (Anzahl DOYs des
+Exports). Frisch ist das Asset nur, wenn so viele verschiedene DOYs vorliegen
+und alle Bilder denselben Archivstand tragen; ein halb fertiger oder
+abgebrochener Export wird nicht ausgeliefert (Assets ohne 'doy_count' ebenfalls
+nicht → neu materialisieren).
 """
 
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, List, Optional
+
 import ee
 
-def build_ndvi_doy_composite(ref_year: int = 2019) -> ee.ImageCollection:
-    """Median-per-DOY Composite für MODIS/061/MOD13A2 NDVI."""
-    col = ee.ImageCollection("MODIS/061/MOD13A2").select("NDVI")
+from ..util.ee_async import gather, submit
+from ..util.local_cache import load_json, save_json, stable_key
+
+_MODIS_ID = "MODIS/061/MOD13A2"
+_ASSET_ENV = "T2E_NDVI_DOY_ASSET"
+_FRESHNESS_NS = "ndvi_doy_freshness"
+_FRESHNESS_TTL_S = 6 * 3600  # neue Komposite kommen im 16-Tage-Takt
+
+
+def _ndvi_with_doy() -> ee.ImageCollection:
+    col = ee.ImageCollection(_MODIS_ID).select("NDVI")
 
     def add_doy(img):
         doy = ee.Date(img.get("system:time_start")).getRelative("day", "year")
         return img.set("doy", doy)
 
-    col = col.map(add_doy)
+    return col.map(add_doy)
+
+
+def compute_ndvi_doy_composite(ref_year: int = 2019) -> ee.ImageCollection:
+    """Median-per-DOY Composite für MODIS/061/MOD13A2 NDVI (Live-Join über das Archiv)."""
+    col = _ndvi_with_doy()
     distinct = col.filterDate(f"{ref_year}-01-01", f"{ref_year+1}-01-01")
 
     join_filter = ee.Filter.equals(leftField="doy", rightField="doy")
@@ -52,3 +94,96 @@ def build_ndvi_doy_composite(ref_year: int = 2019) -> ee.ImageCollection:
 
     comp = joined.map(median_by_doy)
     return comp
+
+
+def ndvi_archive_signature() -> Dict[str, int]:
+    """Stand des MOD13A2-Archivs: jüngstes system:time_start (ms) und Anzahl Bilder."""
+    col = ee.ImageCollection(_MODIS_ID)
+    info = ee.Dictionary({
+        "last_start": col.aggregate_max("system:time_start"),
+        "count": col.size(),
+    }).getInfo()
+    return {"last_start": int(info["last_start"]), "count": int(info["count"])}
+
+
+def materialized_ndvi_doy(asset_id: Optional[str] = None, ref_year: int = 2019) -> Optional[ee.ImageCollection]:
+    """Materialisierte Kollektion, falls vorhanden und zum aktuellen Archivstand passend; sonst None."""
+    asset_id = asset_id or os.environ.get(_ASSET_ENV)
+    if not asset_id:
+        return None
+
+    asset = ee.ImageCollection(asset_id).filter(ee.Filter.eq("ref_year", int(ref_year)))
+    key = stable_key(asset_id, int(ref_year))
+    state = load_json(_FRESHNESS_NS, key)
+    if not (isinstance(state, dict) and time.time() - float(state.get("checked_at", 0)) < _FRESHNESS_TTL_S):
+        try:
+            info = ee.Dictionary({
+                "archive_last_start": ee.ImageCollection(_MODIS_ID).aggregate_max("system:time_start"),
+                "asset_last_start": asset.aggregate_min("archive_last_start"),
+                "asset_last_start_max": asset.aggregate_max("archive_last_start"),
+                "asset_doys": asset.aggregate_count_distinct("doy"),
+                "expected_doys": asset.aggregate_min("doy_count"),
+            }).getInfo()
+        except Exception:
+            return None  # Asset fehlt/kein Zugriff → Live-Berechnung
+        complete = bool(info.get("expected_doys")) and info.get("asset_doys") == info.get("expected_doys")
+        fresh = complete and (info.get("asset_last_start") == info.get("asset_last_start_max")
+                              == info.get("archive_last_start"))
+        state = {"checked_at": time.time(), "fresh": fresh}
+        save_json(_FRESHNESS_NS, key, state)
+
+    if not state.get("fresh"):
+        return None
+    return asset.sort("doy")
+
+
+def build_ndvi_doy_composite(ref_year: int = 2019, use_materialized: bool = True) -> ee.ImageCollection:
+    """Median-per-DOY Composite; bevorzugt aus dem materialisierten Asset."""
+    if use_materialized:
+        comp = materialized_ndvi_doy(ref_year=ref_year)
+        if comp is not None:
+            return comp
+    return compute_ndvi_doy_composite(ref_year)
+
+
+def materialize_ndvi_doy_composite(asset_id: str, ref_year: int = 2019, scale: Optional[float] = None) -> List[str]:
+    """
+    Exportiert jedes DOY-Medianbild (global, native MODIS-Projektion) als Bild in
+    die ImageCollection 'asset_id'. Einmal pro Archivstand auszuführen; vorhandene
+    DOY-Bilder eines älteren Archivstands werden überschrieben.
+    """
+    if ee.data.getInfo(asset_id) is None:  # Rechte-/Quota-Fehler nicht verschlucken
+        ee.data.createAsset({"type": "IMAGE_COLLECTION"}, asset_id)
+
+    comp = compute_ndvi_doy_composite(ref_year)
+    signature_f = submit(ndvi_archive_signature)
+    proj, doys = gather(
+        ee.Image(ee.ImageCollection(_MODIS_ID).first()).select("NDVI").projection(),
+        comp.aggregate_array("doy"),
+    )
+    signature = signature_f.result()
+    world = ee.Geometry.Rectangle([-180, -90, 180, 90], None, False)
+
+    task_ids: List[str] = []
+    for i, doy in enumerate(doys):
+        img = (ee.Image(comp.filter(ee.Filter.eq("doy", doy)).first())
+               .set({"doy": doy, "ref_year": int(ref_year), "doy_count": len(doys),
+                     "archive_last_start": signature["last_start"],
+                     "archive_count": signature["count"]}))
+        export_args = {
+            "image": img,
+            "description": f"ndvi_doy_{int(ref_year)}_{int(doy):03d}",
+            "assetId": f"{asset_id}/doy_{int(ref_year)}_{int(doy):03d}",
+            "region": world,
+            "crs": proj["crs"],
+            "maxPixels": 1e13,
+            "overwrite": True,  # sonst scheitert jede Neu-Materialisierung am vorhandenen Asset
+        }
+        if scale is not None:
+            export_args["scale"] = float(scale)
+        else:
+            export_args["crsTransform"] = proj["transform"]
+        task = ee.batch.Export.image.toAsset(**export_args)
+        task.start()
+        task_ids.append(task.id)
+    return task_ids
@@ -9,6 +9,7 @@ Reine GEE-/Datenlogik für VIIRS Nighttime Lights:
 - Zeitreihe (Mean über AOI) als Pandas DataFrame
 - Pre/Post Bilddifferenz (absolut, prozentual)
 - Blackout-Maske (großer %-Rückgang + niedrige absolute Radiance)
+- Fusionierte Change-Statistik (ein reduceRegion-Call statt mehrerer)
 
 Contracts
 ---------
@@ -17,26 +18,43 @@ month_image(col: ee.ImageCollection, year: int, month: int) -> ee.Image
 jrc_non_water_mask(threshold: int = 30, dataset_id: str = 'JRC/GSW1_4/GlobalSurfaceWater') -> ee.Image
 region_timeseries(col: ee.ImageCollection, aoi: ee.Geometry,
                   start_year:int, start_month:int, end_year:int, end_month:int,
-                  scale:int=500) -> pandas.DataFrame
+                  scale: float | None = None, pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                  best_effort: bool = False, area_km2: float | None = None,
+                  tiles: int | None = None, bbox: tuple | None = None,
+                  max_workers: int = 4) -> pandas.DataFrame
 compute_change(pre_img: ee.Image, post_img: ee.Image) -> tuple[ee.Image, ee.Image]
 blackout_mask(post_img: ee.Image, pct_img: ee.Image,
               pct_thresh: float=-70, abs_thresh: float=0.5) -> ee.Image
+change_stats(d_img: ee.Image, pct_img: ee.Image, blackout_img: ee.Image, aoi: ee.Geometry,
+             scale: float | None = None, percentiles=(5, 50, 95),
+             hist_range=(-100.0, 100.0), hist_bins: int=40,
+             pixel_budget: float = DEFAULT_PIXEL_BUDGET, best_effort: bool = False,
+             area_km2: float | None = None) -> ChangeStats
+
+Reduktionsmaßstab: scale=None → automatisch (native ~500 m, bei großen AOIs gröber
+gemäß pixel_budget); siehe reduce_budget.py.
+region_timeseries mit tiles=N: AOI in N Kacheln, parallel reduziert und exakt
+(gewichtetes Mittel) zusammengeführt, siehe reduce_tiled.py; bbox wie AoiInfo["bbox"].
 
 Side-effects
 ------------
 Keine Streamlit-Abhängigkeiten, keine UI.
 """
 from __future__ import annotations
-from typing import Tuple
+from typing import Dict, List, Sequence, Tuple, TypedDict
 import datetime as dt
 import ee
 import pandas as pd
 
+from .reduce_budget import DEFAULT_PIXEL_BUDGET, reduce_region_kwargs
+from .reduce_tiled import run_tiled
+
 # 1:1 aus der Vorlage: bevorzugter Datensatz + Fallback. :contentReference[oaicite:1]{index=1}
 VIIRS_IDS = [
     "NOAA/VIIRS/DNB/MONTHLY_V1/VCMSLCFG",  # stray-light corrected, gap-filled
     "NOAA/VIIRS/DNB/MONTHLY_V1/VCMCFG",
 ]
+_VIIRS_SCALE = 500.0  # bisheriger fester Maßstab, ~native 463 m
 
 def get_viirs_collection() -> ee.ImageCollection:
     """Erstes verfügbares VIIRS-Monatsprodukt (Band 'avg_rad') zurückgeben."""
@@ -70,16 +88,28 @@ def region_timeseries(col: ee.ImageCollection,
                       start_month: int,
                       end_year: int,
                       end_month: int,
-                      scale: int = 500) -> pd.DataFrame:
+                      scale: float | None = None,
+                      pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                      best_effort: bool = False,
+                      area_km2: float | None = None,
+                      tiles: int | None = None,
+                      bbox: Tuple[float, float, float, float] | None = None,
+                      max_workers: int = 4) -> pd.DataFrame:
     """
     Zeitreihe (Mean 'avg_rad') über AOI von [startY,startM]..[endY,endM] (inkl.).
     """
     start = ee.Date.fromYMD(int(start_year), int(start_month), 1)
     end = ee.Date.fromYMD(int(end_year), int(end_month), 1).advance(1, "month")
     ts_col = col.filterBounds(aoi).filterDate(start, end)
+    if tiles and int(tiles) > 1:
+        if best_effort:
+            raise ValueError("best_effort cannot be combined with tiles (scale must be identical per tile)")
+        kwargs = reduce_region_kwargs(aoi, _VIIRS_SCALE, scale, pixel_budget, False, area_km2)
+        return _region_timeseries_tiled(ts_col, aoi, kwargs, int(tiles), bbox, max_workers)
+    kwargs = reduce_region_kwargs(aoi, _VIIRS_SCALE, scale, pixel_budget, best_effort, area_km2)
 
     def to_feature(img):
-        mean = img.reduceRegion(ee.Reducer.mean(), aoi, scale=scale, maxPixels=1e13).get("avg_rad")
+        mean = img.reduceRegion(ee.Reducer.mean(), aoi, **kwargs).get("avg_rad")
         return ee.Feature(None, {
             "date": ee.Date(img.get("system:time_start")).format("YYYY-MM"),
             "mean_rad": mean,
@@ -92,6 +122,34 @@ def region_timeseries(col: ee.ImageCollection,
     df = df.sort_values("date").reset_index(drop=True)
     return df
 
+def _region_timeseries_tiled(ts_col: ee.ImageCollection, aoi: ee.Geometry, kwargs: Dict,
+                             tiles: int, bbox, max_workers: int) -> pd.DataFrame:
+    """Σ(w·avg_rad) und Σw je Monat und Kachel; Mittel = Summe über Kacheln / Gewicht."""
+    def per_tile(geom):
+        def to_feature(img):
+            v = img.select("avg_rad")
+            r = v.addBands(ee.Image(1).updateMask(v.mask()).rename("w")).reduceRegion(
+                ee.Reducer.sum(), geom, **kwargs)
+            return ee.Feature(None, {
+                "date": ee.Date(img.get("system:time_start")).format("YYYY-MM"),
+                "s": r.get("avg_rad"),
+                "w": r.get("w"),
+            })
+        fc = ts_col.map(to_feature).filter(ee.Filter.notNull(["s", "w"]))
+        return ee.Dictionary({"date": fc.aggregate_array("date"),
+                              "s": fc.aggregate_array("s"),
+                              "w": fc.aggregate_array("w")})
+
+    sums: Dict[str, List[float]] = {}
+    for part in run_tiled(aoi, per_tile, tiles, bbox, max_workers):
+        for d, s, w in zip(part["date"], part["s"], part["w"]):
+            acc = sums.setdefault(d, [0.0, 0.0])
+            acc[0] += float(s)
+            acc[1] += float(w)
+    rows = [(d, s / w) for d, (s, w) in sums.items() if w > 0]
+    df = pd.DataFrame({"date": pd.to_datetime([d for d, _ in rows]), "mean_rad": [v for _, v in rows]})
+    return df.sort_values("date").reset_index(drop=True)
+
 def compute_change(pre_img: ee.Image, post_img: ee.Image) -> Tuple[ee.Image, ee.Image]:
     """(absolute Δ, prozentuale Δ) zwischen 'avg_rad' der Bilder."""
     pre = pre_img.select("avg_rad")
@@ -106,3 +164,67 @@ def blackout_mask(post_img: ee.Image, pct_img: ee.Image,
     """Maske möglicher Blackouts: starker negativer %-Change + niedrige absolute Radiance."""
     cond = pct_img.lte(float(pct_thresh)).And(post_img.select("avg_rad").lte(float(abs_thresh)))
     return cond.selfMask().rename("blackout")
+
+class ChangeStats(TypedDict):
+    mean_delta: float | None                # Mittel 'd_rad'
+    delta_percentiles: Dict[int, float | None]
+    mean_pct: float | None                  # Mittel 'pct_change'
+    pct_percentiles: Dict[int, float | None]
+    pct_histogram: List[Tuple[float, float]]  # [(bucket_min, count), ...]
+    valid_km2: float                        # Fläche mit gültigem Change
+    blackout_km2: float                     # Fläche der Blackout-Maske
+    blackout_fraction: float | None         # blackout_km2 / valid_km2
+
+def change_stats(d_img: ee.Image,
+                 pct_img: ee.Image,
+                 blackout_img: ee.Image,
+                 aoi: ee.Geometry,
+                 scale: float | None = None,
+                 percentiles: Sequence[int] = (5, 50, 95),
+                 hist_range: Tuple[float, float] = (-100.0, 100.0),
+                 hist_bins: int = 40,
+                 pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                 best_effort: bool = False,
+                 area_km2: float | None = None) -> ChangeStats:
+    """
+    Mittel/Perzentile von Δ und %-Δ, Histogramm von %-Δ und Blackout-Fläche
+    in EINEM reduceRegion (kombinierter Reducer über gestapelte Bänder).
+    """
+    ps = [int(p) for p in percentiles]
+    pct = pct_img.select("pct_change")
+    area = ee.Image.pixelArea().updateMask(pct.mask())
+    stacked = ee.Image.cat(
+        d_img.select("d_rad"),
+        pct,
+        blackout_img.unmask(0).gt(0).multiply(area).rename("blackout_m2"),
+        area.rename("valid_m2"),
+    )
+
+    # Ein Input je Band (sharedInputs=False); Präfixe halten die Ausgaben getrennt
+    delta_red = ee.Reducer.mean().combine(ee.Reducer.percentile(ps), "", True)
+    pct_red = (ee.Reducer.mean()
+               .combine(ee.Reducer.percentile(ps), "", True)
+               .combine(ee.Reducer.fixedHistogram(float(hist_range[0]), float(hist_range[1]), int(hist_bins)), "", True))
+    reducer = (delta_red
+               .combine(pct_red, "pct_", False)
+               .combine(ee.Reducer.sum(), "blackout_", False)
+               .combine(ee.Reducer.sum(), "valid_", False))
+
+    res = stacked.reduceRegion(
+        reducer=reducer, geometry=aoi,
+        **reduce_region_kwargs(aoi, _VIIRS_SCALE, scale, pixel_budget, best_effort, area_km2),
+    ).getInfo() or {}
+
+    valid_km2 = float(res.get("valid_sum") or 0.0) / 1e6
+    blackout_km2 = float(res.get("blackout_sum") or 0.0) / 1e6
+    hist = res.get("pct_histogram") or []
+    return ChangeStats(
+        mean_delta=res.get("mean"),
+        delta_percentiles={p: res.get(f"p{p}") for p in ps},
+        mean_pct=res.get("pct_mean"),
+        pct_percentiles={p: res.get(f"pct_p{p}") for p in ps},
+        pct_histogram=[(float(b), float(c)) for b, c in hist],
+        valid_km2=valid_km2,
+        blackout_km2=blackout_km2,
+        blackout_fraction=(blackout_km2 / valid_km2) if valid_km2 > 0 else None,
+    )
@@ -0,0 +1,287 @@
+# blocks/components/gee/nightlights_break_raster.py
+"""
+Purpose
+-------
+Pixelweise Trendbruch-Karten für VIIRS Nighttime Lights (Client-Modus):
+- Monatlichen 'avg_rad'-Stapel der AOI als (time, y, x)-Array laden
+  (ee.data.computePixels, zeilenweise Kacheln unter dem Request-Limit)
+- BIC-Bruchbewertung aus find_trend_break vektorisiert über alle Pixel
+  (in Pixel-Chunks, ohne Python-Schleife pro Pixel)
+- Ergebnis-Raster (ΔBIC, Bruchmonat, Pre/Post-Mittel) als ee.Image zurückführen,
+  damit die bestehenden Split-Map-Komponenten sie rendern können
+
+Contracts
+---------
+def viirs_monthly_stack(col: ee.ImageCollection, aoi: ee.Geometry,
+                        start_year: int, start_month: int, end_year: int, end_month: int,
+                        scale: int = 500, max_request_bytes: int = 32 * 2**20,
+                        bbox: tuple[float, float, float, float] | None = None)
+    -> tuple[numpy.ndarray, list[pandas.Timestamp], dict]
+def find_trend_break_stack(stack: numpy.ndarray, dates: list,
+                           min_segment: int = 6, bic_threshold: float = -10,
+                           chunk_size: int = 4096) -> dict
+def raster_to_image(raster: numpy.ndarray, grid: dict, band_name: str) -> ee.Image
+def month_starts(start_year: int, start_month: int, end_year: int, end_month: int)
+    -> list[pandas.Timestamp]
+def split_bases(n: int, min_segment: int) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+Args
+----
+col : ee.ImageCollection   (typisch get_viirs_collection())
+aoi : ee.Geometry
+start_year, start_month, end_year, end_month : int   Intervall inkl. beider Monate
+scale : int                Pixelgröße in Metern (Raster in EPSG:4326)
+bbox : (W, S, E, N) | None AOI-Bounds, wenn lokal bekannt (AoiInfo["bbox"]) → kein getInfo()
+stack : numpy.ndarray      (time, y, x), fehlende Werte als NaN
+min_segment, bic_threshold : wie find_trend_break
+chunk_size : int           Pixel pro Vektorisierungs-Chunk (Speicherbegrenzung)
+n : int                    Anzahl Zeitschritte (split_bases)
+
+Returns
+-------
+viirs_monthly_stack → (stack, dates, grid)
+    grid = {"crs", "transform": [scaleX, shearX, translateX, shearY, scaleY, translateY],
+            "width", "height"}
+find_trend_break_stack → dict mit 2D-Rastern (y, x):
+    delta_bic, has_break, break_index, break_month (YYYYMM), pre_mean, post_mean
+    sowie "dates" (Liste der Zeitschritte).
+raster_to_image → ee.Image mit einem Band 'band_name' im Raster-Grid.
+month_starts → Monatsanfänge im Intervall (ValueError bei leerem Intervall).
+split_bases → (q1 (n, 2), qk (K, n, 4), ks (K,)): orthonormale QR-Basen des
+    linearen Modells und je Bruch-Kandidat k; auch vom Server-Modus
+    (nightlights_break_server.py) genutzt, damit beide Modi identisch rechnen.
+
+Side Effects
+------------
+viirs_monthly_stack lädt Pixel von Earth Engine (Netzwerk). Keine Streamlit-Ausgaben.
+
+Notes
+-----
+- Statistik identisch zu find_trend_break: lineares Modell vs. piecewise-linear mit
+  Bruch bei k ∈ [min_segment, n - min_segment), ΔBIC = BIC(best k) - BIC(linear).
+- Die Designmatrizen hängen nicht vom Pixel ab. SSE je Kandidat k wird über
+  QR-Projektion berechnet: SSE_k = ||y||² - ||Q_kᵀ y||² (ein einsum pro Chunk).
+- Zeitschritte ohne gültiges Pixel werden verworfen (wie notNull in region_timeseries).
+  Pixel mit Lücken in den verbleibenden Zeitschritten bleiben NaN.
+- raster_to_image bettet das Raster als ee.Array in den Request ein; nur für
+  Ergebnis-Raster in Download-Größe gedacht (siehe _MAX_EMBED_CELLS).
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import numpy as np
+import pandas as pd
+import ee
+
+from .nightlights_acquire_reduce import month_image
+
+_NODATA = -9999.0
+_METERS_PER_DEGREE = 111320.0
+_MAX_EMBED_CELLS = 250_000
+
+
+def month_starts(start_year: int, start_month: int, end_year: int, end_month: int) -> List[pd.Timestamp]:
+    """Monatsanfänge von start bis end (inklusiv)."""
+    start = pd.Timestamp(int(start_year), int(start_month), 1)
+    end = pd.Timestamp(int(end_year), int(end_month), 1)
+    if end < start:
+        raise ValueError(f"Empty month range: {start:%Y-%m} .. {end:%Y-%m}")
+    return list(pd.date_range(start, end, freq="MS"))
+
+
+def _grid_for_aoi(aoi: ee.Geometry, scale: int,
+                  bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+    """EPSG:4326-Grid über die AOI-Bounds mit ~scale Metern Pixelgröße."""
+    if bbox is not None:
+        west, south, east, north = (float(v) for v in bbox)
+    else:
+        ring = aoi.bounds().getInfo()["coordinates"][0]
+        lons = [p[0] for p in ring]
+        lats = [p[1] for p in ring]
+        west, east, south, north = min(lons), max(lons), min(lats), max(lats)
+    step = float(scale) / _METERS_PER_DEGREE
+    width = max(1, int(math.ceil((east - west) / step)))
+    height = max(1, int(math.ceil((north - south) / step)))
+    return {
+        "crs": "EPSG:4326",
+        "transform": [step, 0.0, west, 0.0, -step, north],
+        "width": width,
+        "height": height,
+    }
+
+
+def viirs_monthly_stack(col: ee.ImageCollection,
+                        aoi: ee.Geometry,
+                        start_year: int,
+                        start_month: int,
+                        end_year: int,
+                        end_month: int,
+                        scale: int = 500,
+                        max_request_bytes: int = 32 * 2**20,
+                        bbox: Optional[Tuple[float, float, float, float]] = None) -> Tuple[np.ndarray, List[pd.Timestamp], Dict[str, Any]]:
+    """
+    Monatlicher 'avg_rad'-Stapel (time, y, x) über die AOI, fehlende Werte als NaN.
+    """
+    months = month_starts(start_year, start_month, end_year, end_month)
+    if len(months) > 1024:
+        raise ValueError(f"Too many months for one stack ({len(months)} > 1024 bands).")
+
+    grid = _grid_for_aoi(aoi, scale, bbox)
+    band_names = [f"m{d:%Y_%m}" for d in months]
+    stack_img = ee.Image.cat(*[
+        month_image(col, d.year, d.month).select("avg_rad").rename(name)
+        for d, name in zip(months, band_names)
+    ]).clip(aoi).unmask(_NODATA).toFloat()
+
+    width, height = grid["width"], grid["height"]
+    sx, _, x0, _, sy, y0 = grid["transform"]
+    row_bytes = width * len(band_names) * 4
+    rows_per_request = max(1, min(height, int(max_request_bytes // max(1, row_bytes))))
+
+    stack = np.full((len(months), height, width), np.nan, dtype=np.float32)
+    for row in range(0, height, rows_per_request):
+        nrows = min(rows_per_request, height - row)
+        request = {
+            "expression": stack_img,
+            "fileFormat": "NUMPY_NDARRAY",
+            "bandIds": band_names,
+            "grid": {
+                "dimensions": {"width": width, "height": nrows},
+                "affineTransform": {
+                    "scaleX": sx, "shearX": 0, "translateX": x0,
+                    "shearY": 0, "scaleY": sy, "translateY": y0 + row * sy,
+                },
+                "crsCode": grid["crs"],
+            },
+        }
+        block = ee.data.computePixels(request)
+        for t, name in enumerate(band_names):
+            stack[t, row:row + nrows, :] = block[name]
+
+    stack[stack <= _NODATA] = np.nan
+
+    # Zeitschritte ohne gültiges Pixel verwerfen (leere Monate)
+    valid_t = ~np.all(np.isnan(stack), axis=(1, 2))
+    stack = stack[valid_t]
+    dates = [d for d, ok in zip(months, valid_t) if ok]
+    return stack, dates, grid
+
+
+def split_bases(n: int, min_segment: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Orthonormale Basen (QR) für das lineare Modell und alle Bruch-Kandidaten."""
+    t = np.arange(n, dtype=float)
+    X1 = np.column_stack([np.ones(n), t])
+    q1, _ = np.linalg.qr(X1)
+
+    ks = np.arange(min_segment, n - min_segment)
+    qk = np.empty((len(ks), n, 4))
+    for i, k in enumerate(ks):
+        I = (t >= k).astype(float)
+        dt = (t - t[k]) * I
+        Xk = np.column_stack([np.ones(n), t, I, dt])
+        qk[i], _ = np.linalg.qr(Xk)
+    return q1, qk, ks
+
+
+def find_trend_break_stack(stack: np.ndarray,
+                           dates: List[Any],
+                           min_segment: int = 6,
+                           bic_threshold: float = -10,
+                           chunk_size: int = 4096) -> Dict[str, Any]:
+    """
+    Vektorisierte Variante von find_trend_break für einen (time, y, x)-Stapel.
+    """
+    if stack.ndim != 3:
+        raise ValueError(f"stack must be (time, y, x), got shape {stack.shape}.")
+    n, h, w = stack.shape
+    if len(dates) != n:
+        raise ValueError(f"dates ({len(dates)}) must match stack time axis ({n}).")
+    if n < 2 * min_segment + 1:
+        raise ValueError(f"Need at least {2*min_segment+1} time steps, got {n}.")
+
+    q1, qk, ks = split_bases(n, min_segment)
+    log_n = np.log(n)
+    tiny = np.finfo(float).tiny
+
+    Y_all = stack.reshape(n, h * w)
+    complete = ~np.any(np.isnan(Y_all), axis=0)
+    idx = np.flatnonzero(complete)
+
+    delta_bic = np.full(h * w, np.nan)
+    best_k = np.full(h * w, -1, dtype=np.int64)
+    pre_mean = np.full(h * w, np.nan)
+    post_mean = np.full(h * w, np.nan)
+
+    for start in range(0, len(idx), int(chunk_size)):
+        sel = idx[start:start + int(chunk_size)]
+        Y = Y_all[:, sel].astype(float)                      # (n, P)
+        ss = np.einsum("np,np->p", Y, Y)
+
+        p1 = q1.T @ Y                                        # (2, P)
+        sse1 = np.maximum(ss - np.einsum("ip,ip->p", p1, p1), tiny)
+        bic1 = n * np.log(sse1 / n) + 2 * log_n
+
+        pk = np.einsum("kni,np->kip", qk, Y)                 # (K, 4, P)
+        ssek = np.maximum(ss[None, :] - np.einsum("kip,kip->kp", pk, pk), tiny)
+        bick = n * np.log(ssek / n) + 4 * log_n              # (K, P)
+
+        arg = np.argmin(bick, axis=0)
+        k = ks[arg]
+        delta_bic[sel] = bick[arg, np.arange(len(sel))] - bic1
+        best_k[sel] = k
+
+        # Segment-Mittel über kumulative Summen
+        cs = np.cumsum(Y, axis=0)
+        total = cs[-1]
+        pre_sum = cs[k - 1, np.arange(len(sel))]
+        pre_mean[sel] = pre_sum / k
+        post_mean[sel] = (total - pre_sum) / (n - k)
+
+    has_break = np.zeros(h * w, dtype=bool)
+    has_break[complete] = delta_bic[complete] <= float(bic_threshold)
+
+    # Wie find_trend_break: Bruchinfos nur bei has_break
+    break_index = np.where(has_break, best_k, -1)
+    pre_mean[~has_break] = np.nan
+    post_mean[~has_break] = np.nan
+    yyyymm = np.array([pd.Timestamp(d).year * 100 + pd.Timestamp(d).month for d in dates], dtype=float)
+    break_month = np.full(h * w, np.nan)
+    break_month[has_break] = yyyymm[break_index[has_break]]
+
+    return {
+        "delta_bic": delta_bic.reshape(h, w),
+        "has_break": has_break.reshape(h, w),
+        "break_index": break_index.reshape(h, w),
+        "break_month": break_month.reshape(h, w),
+        "pre_mean": pre_mean.reshape(h, w),
+        "post_mean": post_mean.reshape(h, w),
+        "dates": [pd.Timestamp(d) for d in dates],
+    }
+
+
+def raster_to_image(raster: np.ndarray, grid: Dict[str, Any], band_name: str) -> ee.Image:
+    """
+    Client-Raster (y, x) als ee.Image im Grid des Stapels; NaN → maskiert.
+    """
+    arr = np.asarray(raster, dtype=float)
+    if arr.shape != (grid["height"], grid["width"]):
+        raise ValueError(f"raster shape {arr.shape} does not match grid {(grid['height'], grid['width'])}.")
+    if arr.size > _MAX_EMBED_CELLS:
+        raise ValueError(f"raster too large to embed ({arr.size} > {_MAX_EMBED_CELLS} cells); increase scale.")
+
+    valid = ~np.isnan(arr)
+    values = np.where(valid, arr, 0.0).tolist()
+    mask = valid.astype(int).tolist()
+
+    proj = ee.Projection(grid["crs"], grid["transform"])
+    coords = ee.Image.pixelCoordinates(proj).floor().toInt()
+    col_idx = coords.select("x")
+    row_idx = coords.select("y")
+    inside = (col_idx.gte(0).And(col_idx.lt(grid["width"]))
+              .And(row_idx.gte(0)).And(row_idx.lt(grid["height"])))
+    pos = ee.Image.cat(row_idx, col_idx).updateMask(inside)
+
+    val_img = ee.Image(ee.Array(values)).arrayGet(pos)
+    mask_img = ee.Image(ee.Array(mask)).arrayGet(pos)
+    return (val_img.updateMask(mask_img).rename(band_name)
+            .setDefaultProjection(proj))
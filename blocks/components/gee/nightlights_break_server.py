@@ -0,0 +1,175 @@
+# blocks/components/gee/nightlights_break_server.py
+"""
+Purpose
+-------
+Pixelweise Trendbruch-Detektion für VIIRS Nighttime Lights komplett serverseitig
+(Earth Engine Array-Images), für AOIs, die zu groß für einen Download sind:
+- Monatsbilder (month_image) der verfügbaren Monate → toArray() je Pixel
+- BIC-Vergleich linear vs. piecewise-linear für alle Bruch-Kandidaten k
+  als Matrixprodukte mit konstanten Projektionsmatrizen
+- Gleiche Schwellen und Fenster-Heuristiken wie find_trend_break
+  (min_segment, bic_threshold, pre_window, post_window, min_gap_post)
+
+Contracts
+---------
+def break_detection_image(col: ee.ImageCollection, aoi: ee.Geometry,
+                          start_year: int, start_month: int, end_year: int, end_month: int,
+                          min_segment: int = 6, bic_threshold: float = -10,
+                          pre_window: int = 6, post_window: int = 12,
+                          min_gap_post: int = 1) -> ee.Image
+
+Args
+----
+col : ee.ImageCollection   (typisch get_viirs_collection())
+aoi : ee.Geometry
+start_year, start_month, end_year, end_month : int   Intervall inkl. beider Monate
+min_segment, bic_threshold, pre_window, post_window, min_gap_post : wie find_trend_break
+
+Returns
+-------
+ee.Image mit Bändern:
+  delta_bic   : ΔBIC (alle Pixel mit vollständiger Zeitreihe)
+  has_break   : 1/0
+  break_month : YYYYMM des Bruchs (nur has_break)
+  pre_mean, post_mean : Segment-Mittel (nur has_break)
+  pre_month, post_month : YYYYMM der repräsentativen Monate (nur has_break)
+
+Side Effects
+------------
+Ein kleiner Metadaten-Call (verfügbare Monate), keine Pixel-Downloads.
+Keine Streamlit-Ausgaben.
+
+Notes
+-----
+- Die Länge n der Zeitreihe wird aus den verfügbaren Monaten bestimmt; die
+  Designmatrizen (QR-Basen, Segment-Summen, Fenster) werden einmal clientseitig
+  gebaut und als ee.Array-Konstanten eingebettet.
+- Pixel mit maskierten Monaten innerhalb der Zeitreihe werden maskiert
+  (find_trend_break arbeitet auf lückenlosen Reihen).
+- Ergebnis lässt sich direkt mit den Split-Map-Komponenten rendern.
+"""
+from __future__ import annotations
+from typing import List
+import numpy as np
+import pandas as pd
+import ee
+
+from .nightlights_acquire_reduce import month_image
+from .nightlights_break_raster import month_starts, split_bases
+
+_BIG = 1e30
+
+
+def _available_months(col: ee.ImageCollection, aoi: ee.Geometry,
+                      start_year: int, start_month: int,
+                      end_year: int, end_month: int) -> List[pd.Timestamp]:
+    """Monate im Intervall, für die die Kollektion Bilder enthält (ein Metadaten-Call)."""
+    months = month_starts(start_year, start_month, end_year, end_month)
+    start = ee.Date.fromYMD(months[0].year, months[0].month, 1)
+    end = start.advance(len(months), "month")
+    stamps = col.filterBounds(aoi).filterDate(start, end).aggregate_array("system:time_start").getInfo()
+    present = {(d.year, d.month) for d in pd.to_datetime(stamps, unit="ms")}
+    return [d for d in months if (d.year, d.month) in present]
+
+
+def _const(arr: np.ndarray) -> ee.Image:
+    return ee.Image(ee.Array(np.asarray(arr, dtype=float).tolist()))
+
+
+def _window_rows(n: int, ks: np.ndarray, pre_window: int, post_window: int,
+                 min_gap_post: int) -> tuple[np.ndarray, np.ndarray]:
+    """Fenster-Indikatoren (K×n) für Pre-/Post-Repräsentanten, 1:1 wie find_trend_break."""
+    w_pre = np.zeros((len(ks), n))
+    w_post = np.zeros((len(ks), n))
+    for i, k in enumerate(ks):
+        pre_lo = max(0, k - pre_window - 1)
+        pre_hi = max(pre_lo, k - 1)  # exclude k-1
+        if pre_hi > pre_lo:
+            w_pre[i, pre_lo:pre_hi] = 1
+        else:
+            w_pre[i, 0:k] = 1
+
+        post_start = min(k + max(1, min_gap_post), n - 1)
+        post_end = min(k + post_window, n - 1)
+        if post_end >= post_start:
+            w_post[i, post_start:post_end + 1] = 1
+        else:
+            w_post[i, k:n] = 1
+    return w_pre, w_post
+
+
+def _pick_in_window(y: ee.Image, target: ee.Image, window: ee.Image, kidx: ee.Image) -> ee.Image:
+    """Index (n-Achse) des Werts nächst 'target' innerhalb der Fensterzeile kidx."""
+    row = window.arraySlice(0, kidx, kidx.add(1)).arrayTranspose()          # (n×1)
+    dist = y.subtract(target).abs().add(ee.Image(1).subtract(row).multiply(_BIG))
+    return dist.multiply(-1).arrayArgmax().arrayGet([0])
+
+
+def break_detection_image(col: ee.ImageCollection,
+                          aoi: ee.Geometry,
+                          start_year: int,
+                          start_month: int,
+                          end_year: int,
+                          end_month: int,
+                          min_segment: int = 6,
+                          bic_threshold: float = -10,
+                          pre_window: int = 6,
+                          post_window: int = 12,
+                          min_gap_post: int = 1) -> ee.Image:
+    """
+    ΔBIC-/Bruchmonat-Bild je Pixel über die monatliche VIIRS-Zeitreihe.
+    """
+    months = _available_months(col, aoi, start_year, start_month, end_year, end_month)
+    n = len(months)
+    if n < 2 * min_segment + 1:
+        raise ValueError(f"Need at least {2*min_segment+1} months, got {n}.")
+
+    q1, qk, ks = split_bases(n, min_segment)
+    w_pre, w_post = _window_rows(n, ks, int(pre_window), int(post_window), int(min_gap_post))
+    seg = (np.arange(n)[None, :] < ks[:, None]).astype(float)               # (K×n) Pre-Summen
+    yyyymm = np.array([d.year * 100 + d.month for d in months], dtype=float)
+    log_n = float(np.log(n))
+
+    monthly = ee.ImageCollection.fromImages([
+        month_image(col, d.year, d.month).select("avg_rad") for d in months
+    ])
+    complete = monthly.count().eq(n)
+    y = monthly.map(lambda img: img.unmask(0)).toArray().updateMask(complete)   # (n×1)
+
+    yty = y.arrayTranspose().matrixMultiply(y).arrayGet([0, 0])
+
+    lin = _const(q1.T).matrixMultiply(y)
+    sse1 = yty.subtract(lin.pow(2).arrayReduce(ee.Reducer.sum(), [0]).arrayGet([0, 0])).max(1e-300)
+    bic1 = sse1.divide(n).log().multiply(n).add(2 * log_n)
+
+    proj_sq = None
+    for j in range(4):
+        part = _const(qk[:, :, j]).matrixMultiply(y).pow(2)                  # (K×1)
+        proj_sq = part if proj_sq is None else proj_sq.add(part)
+    ssek = yty.subtract(proj_sq).max(1e-300)
+    bick = ssek.divide(n).log().multiply(n).add(4 * log_n)
+
+    kidx = bick.multiply(-1).arrayArgmax().arrayGet([0]).toInt()
+    pos = ee.Image.cat(kidx, ee.Image.constant(0).toInt())
+    delta_bic = bick.arrayGet(pos).subtract(bic1).rename("delta_bic")
+    has_break = delta_bic.lte(float(bic_threshold)).rename("has_break")
+
+    k = _const(ks).arrayGet(kidx)
+    total = y.arrayReduce(ee.Reducer.sum(), [0]).arrayGet([0, 0])
+    pre_sum = _const(seg).matrixMultiply(y).arrayGet(pos)
+    pre_mean = pre_sum.divide(k).rename("pre_mean")
+    post_mean = total.subtract(pre_sum).divide(ee.Image.constant(n).subtract(k)).rename("post_mean")
+
+    months_img = _const(yyyymm)
+    pre_idx = _pick_in_window(y, pre_mean, _const(w_pre), kidx)
+    post_idx = _pick_in_window(y, post_mean, _const(w_post), kidx)
+
+    breaks = ee.Image.cat(
+        months_img.arrayGet(k.toInt()).rename("break_month"),
+        pre_mean,
+        post_mean,
+        months_img.arrayGet(pre_idx.toInt()).rename("pre_month"),
+        months_img.arrayGet(post_idx.toInt()).rename("post_month"),
+    ).updateMask(has_break)
+
+    return ee.Image.cat(delta_bic, has_break.toByte(), breaks).clip(aoi)
@@ -0,0 +1,218 @@
+# blocks/components/gee/no2_monthly_series.py
+"""
+Purpose
+-------
+Batch-Engine für NO₂-Monatsreihen (Sentinel-5P NRTI L3):
+- Ganze Monatsreihe als EINE gemappte ImageCollection (statt N Einzel-Scans)
+- Klimatologie (Baseline) je Kalendermonat über ein Basisjahr-Intervall
+- Anomalie-Bild (Monat − Baseline) für Karten
+- AOI-Mittel als DataFrame (Reihe + Anomalie), Baseline und abgeschlossene
+  Monate lokal gecacht → neue Monate kosten nur den neuen Monat
+
+Contracts
+---------
+def build_no2_monthly_series(start_year: int, start_month: int,
+                             end_year: int, end_month: int) -> ee.ImageCollection
+def no2_climatology_image(month: int, baseline_years: tuple[int, int] = (2019, 2023)) -> ee.Image
+def no2_anomaly_image(year: int, month: int,
+                      baseline_years: tuple[int, int] = (2019, 2023)) -> ee.Image
+def no2_baseline_means(aoi: ee.Geometry, baseline_years: tuple[int, int] = (2019, 2023),
+                       scale: float | None = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> dict[int, float | None]
+def no2_anomaly_series(aoi: ee.Geometry, start_year: int, start_month: int,
+                       end_year: int, end_month: int,
+                       baseline_years: tuple[int, int] = (2019, 2023),
+                       scale: float | None = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> pandas.DataFrame
+
+Args
+----
+start_year, start_month, end_year, end_month : int   Intervall inkl. beider Monate
+month : int (1..12)
+baseline_years : (erstes, letztes) Basisjahr, inklusiv
+aoi : ee.Geometry
+scale : float | None   Reduktionsmaßstab in m (None → automatisch, siehe reduce_budget.py)
+pixel_budget : float   Ziel-Pixelanzahl je Monats-Reduktion
+
+Returns
+-------
+ImageCollection: je Monat ein Bild 'NO2_column_number_density' mit
+  Properties year, month, n_images, system:time_start (leere Monate entfernt).
+Anomalie-Bild: Bänder 'NO2_anomaly' (absolut) und 'NO2_anomaly_pct'; für einen
+  Monat ohne Aufnahmen voll maskiert (kein Fehler, Karte bleibt leer).
+DataFrame: [date, no2_mean, baseline, anomaly, anomaly_pct].
+
+Side Effects
+------------
+no2_baseline_means / no2_anomaly_series: je ein getInfo() nur für fehlende
+Werte; Cache-Dateien unter runner/cache (siehe util/local_cache.py).
+
+Notes
+-----
+- Dataset/Band wie no2_acquire_reduce.build_no2_monthly_image (Mittel über [start, end)).
+- Cache-Schlüssel: serialisierte AOI + Basisjahre + scale (bzw. pixel_budget). Nur abgeschlossene
+  Monate (vor dem aktuellen Monat) werden als Monatswerte gecacht.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from typing import Dict, List, Optional, Tuple
+
+import ee
+import pandas as pd
+
+from ..util.local_cache import geometry_key, load_json, save_json, stable_key
+from .reduce_budget import DEFAULT_PIXEL_BUDGET, reduce_region_kwargs
+
+_NO2_ID = "COPERNICUS/S5P/NRTI/L3_NO2"
+_NO2_BAND = "NO2_column_number_density"
+_NO2_SCALE = 1113.2  # native Pixelgröße des L3-Grids (0.01°)
+_BASELINE_NS = "no2_baseline"
+_MONTHS_NS = "no2_monthly_means"
+
+
+def _month_list(start_year: int, start_month: int, end_year: int, end_month: int) -> List[Tuple[int, int]]:
+    first = int(start_year) * 12 + int(start_month) - 1
+    last = int(end_year) * 12 + int(end_month) - 1
+    if last < first:
+        raise ValueError("end month must not be before start month")
+    return [(i // 12, i % 12 + 1) for i in range(first, last + 1)]
+
+
+def _month_mean(start: ee.Date) -> ee.Image:
+    """Monatsmittel ab start; ohne Aufnahmen ein voll maskiertes Bild (n_images = 0)."""
+    sub = ee.ImageCollection(_NO2_ID).select(_NO2_BAND).filterDate(start, start.advance(1, "month"))
+    img = ee.Image(ee.Algorithms.If(
+        sub.size().gt(0),
+        sub.mean().rename(_NO2_BAND),
+        ee.Image.constant(0).rename(_NO2_BAND).toFloat().updateMask(0),
+    ))
+    return img.set("n_images", sub.size())
+
+
+def _monthly_collection(months: List[Tuple[int, int]]) -> ee.ImageCollection:
+    """Ein Monatsmittel je (year, month) als gemappte Kollektion (ein Graph)."""
+    starts = ee.List([ee.Date.fromYMD(y, m, 1).millis() for y, m in months])
+
+    def _one(millis):
+        start = ee.Date(millis)
+        return _month_mean(start).set({
+            "system:time_start": start.millis(),
+            "year": start.get("year"),
+            "month": start.get("month"),
+        })
+
+    col = ee.ImageCollection.fromImages(starts.map(_one))
+    return col.filter(ee.Filter.gt("n_images", 0))
+
+
+def build_no2_monthly_series(start_year: int, start_month: int,
+                             end_year: int, end_month: int) -> ee.ImageCollection:
+    """Alle Monatsmittel im Intervall als eine ImageCollection."""
+    return _monthly_collection(_month_list(start_year, start_month, end_year, end_month))
+
+
+def no2_climatology_image(month: int, baseline_years: Tuple[int, int] = (2019, 2023)) -> ee.Image:
+    """Mittel aller Aufnahmen eines Kalendermonats über die Basisjahre."""
+    if not (1 <= int(month) <= 12):
+        raise ValueError("month must be in 1..12")
+    y0, y1 = int(baseline_years[0]), int(baseline_years[1])
+    return (
+        ee.ImageCollection(_NO2_ID).select(_NO2_BAND)
+        .filter(ee.Filter.calendarRange(y0, y1, "year"))
+        .filter(ee.Filter.calendarRange(int(month), int(month), "month"))
+        .mean()
+        .rename(_NO2_BAND)
+        .set("month", int(month))
+    )
+
+
+def no2_anomaly_image(year: int, month: int,
+                      baseline_years: Tuple[int, int] = (2019, 2023)) -> ee.Image:
+    """Monatsmittel minus Klimatologie desselben Kalendermonats."""
+    current = _month_mean(ee.Date.fromYMD(int(year), int(month), 1))
+    base = no2_climatology_image(month, baseline_years)
+    anomaly = current.subtract(base).rename("NO2_anomaly")
+    pct = anomaly.divide(base).multiply(100).rename("NO2_anomaly_pct")
+    return anomaly.addBands(pct)
+
+
+def _scale_key(scale: Optional[float], pixel_budget: float) -> str:
+    return f"s{float(scale):g}" if scale is not None else f"auto{float(pixel_budget):g}"
+
+
+def _aoi_means(col: ee.ImageCollection, aoi: ee.Geometry, key_prop: str,
+               scale: Optional[float], pixel_budget: float) -> Dict[str, Optional[float]]:
+    """AOI-Mittel aller Bilder in einem getInfo(), Ergebnis {key_prop-Wert: mean}."""
+    kwargs = reduce_region_kwargs(aoi, _NO2_SCALE, scale, pixel_budget)
+
+    def to_feature(img):
+        mean = img.reduceRegion(ee.Reducer.mean(), aoi, **kwargs).get(_NO2_BAND)
+        return ee.Feature(None, {key_prop: img.get(key_prop), "mean": mean})
+
+    feats = ee.FeatureCollection(col.map(to_feature)).getInfo()["features"]
+    return {str(f["properties"][key_prop]): f["properties"].get("mean") for f in feats}
+
+
+def no2_baseline_means(aoi: ee.Geometry,
+                       baseline_years: Tuple[int, int] = (2019, 2023),
+                       scale: Optional[float] = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> Dict[int, Optional[float]]:
+    """AOI-Mittel der Klimatologie je Kalendermonat; einmal pro AOI berechnet, danach aus dem Cache."""
+    key = stable_key(geometry_key(aoi), list(baseline_years), _scale_key(scale, pixel_budget))
+    cached = load_json(_BASELINE_NS, key)
+    if isinstance(cached, dict) and len(cached) == 12:
+        return {int(m): v for m, v in cached.items()}
+
+    clim = ee.ImageCollection.fromImages([no2_climatology_image(m, baseline_years) for m in range(1, 13)])
+    means = _aoi_means(clim, aoi, "month", scale, pixel_budget)
+    result = {m: means.get(str(m)) for m in range(1, 13)}
+    save_json(_BASELINE_NS, key, {str(m): v for m, v in result.items()})
+    return result
+
+
+def no2_anomaly_series(aoi: ee.Geometry,
+                       start_year: int,
+                       start_month: int,
+                       end_year: int,
+                       end_month: int,
+                       baseline_years: Tuple[int, int] = (2019, 2023),
+                       scale: Optional[float] = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> pd.DataFrame:
+    """AOI-Monatsreihe + Anomalie gegen die Baseline; nur fehlende Monate werden berechnet."""
+    months = _month_list(start_year, start_month, end_year, end_month)
+    baseline = no2_baseline_means(aoi, baseline_years, scale, pixel_budget)
+
+    key = stable_key(geometry_key(aoi), _scale_key(scale, pixel_budget))
+    cached = load_json(_MONTHS_NS, key) or {}
+    labels = [f"{y:04d}-{m:02d}" for y, m in months]
+    missing = [ym for ym, lab in zip(months, labels) if lab not in cached]
+
+    values = dict(cached)
+    if missing:
+        col = _monthly_collection(missing).map(
+            lambda img: img.set("ym", ee.Date(img.get("system:time_start")).format("YYYY-MM"))
+        )
+        fresh = _aoi_means(col, aoi, "ym", scale, pixel_budget)
+        values.update(fresh)
+        today = dt.date.today()
+        current = f"{today.year:04d}-{today.month:02d}"
+        # Nur abgeschlossene Monate persistieren (laufender Monat ändert sich noch);
+        # Monate ohne Aufnahmen als None merken, damit sie nicht erneut gescannt werden
+        for y, m in missing:
+            lab = f"{y:04d}-{m:02d}"
+            if lab < current:
+                cached[lab] = fresh.get(lab)
+        save_json(_MONTHS_NS, key, cached)
+
+    rows = []
+    for (y, m), lab in zip(months, labels):
+        if values.get(lab) is None:
+            continue
+        v = float(values[lab])
+        base = baseline.get(m)
+        anomaly = (v - base) if base is not None else None
+        anomaly_pct = (anomaly / base * 100.0) if base else None
+        rows.append({"date": pd.Timestamp(y, m, 1), "no2_mean": v, "baseline": base,
+                     "anomaly": anomaly, "anomaly_pct": anomaly_pct})
+    return pd.DataFrame(rows, columns=["date", "no2_mean", "baseline", "anomaly", "anomaly_pct"])
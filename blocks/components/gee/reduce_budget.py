@@ -0,0 +1,123 @@
+# blocks/components/gee/reduce_budget.py
+"""
+Purpose
+-------
+Gemeinsame Parametrisierung für reduceRegion/reduceRegions: Maßstab und
+tileScale werden aus AOI-Fläche und einem Pixel-Budget abgeleitet, statt fest
+verdrahtet zu sein. Kleine AOIs laufen in nativer Auflösung, große AOIs
+automatisch gröber (Laufzeit bleibt ungefähr konstant, keine Timeouts).
+
+Contracts
+---------
+DEFAULT_PIXEL_BUDGET: float
+def reduce_region_kwargs(aoi: ee.Geometry, native_scale: float, scale: float | None = None,
+                         pixel_budget: float = DEFAULT_PIXEL_BUDGET, best_effort: bool = False,
+                         area_km2: float | None = None) -> dict
+def reduce_regions_kwargs(regions: ee.FeatureCollection, native_scale: float,
+                          scale: float | None = None, pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                          area_km2: float | None = None) -> dict
+def area_density(image: ee.Image, native_cell_m2: float) -> ee.Image
+
+Args
+----
+aoi / regions : Reduktionsgebiet(e)
+native_scale : float    Native Pixelgröße des Datensatzes in m (Untergrenze für scale)
+scale : float | None    Fester Maßstab (überschreibt die Automatik; tileScale bleibt automatisch)
+pixel_budget : float    Ziel-Pixelanzahl je Region
+best_effort : bool      EE wählt selbst einen gröberen Maßstab, sodass maxPixels=pixel_budget
+                        eingehalten wird (latenzbegrenzt; Maßstab nicht exakt vorhersagbar)
+area_km2 : float | None AOI-Fläche, falls lokal bekannt (AoiInfo["area_km2"]) → Parameter
+                        als Python-Zahlen; sonst serverseitig aus geometry.area()
+native_cell_m2 : float  Fläche einer nativen Zelle (für Flächensummen-Bänder)
+
+Returns
+-------
+kwargs für reduceRegion (scale, tileScale, maxPixels[, bestEffort]) bzw.
+reduceRegions (scale, tileScale). area_density: Bild in m² je Ausgabepixel.
+
+Side Effects
+------------
+Keine (kein getInfo; ohne area_km2 sind scale/tileScale ee.Number im Graphen).
+
+Notes
+-----
+- scale = max(native_scale, sqrt(Fläche / pixel_budget)).
+- tileScale = nächste Zweierpotenz ≥ Pixel / _PIXELS_PER_TILE, begrenzt auf 1..16.
+- Summen über Flächenbänder (z. B. GHSL m² je 100-m-Zelle) sind nur bei nativer
+  Auflösung korrekt; area_density macht sie maßstabsunabhängig.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Union
+
+import ee
+
+DEFAULT_PIXEL_BUDGET = 1e7
+_PIXELS_PER_TILE = 2.5e6
+_MAX_TILE_SCALE = 16
+_AREA_MAX_ERROR_M = 1000
+_MAX_PIXELS = 1e13
+
+Number = Union[float, ee.Number]
+
+
+def _tile_scale_local(pixels: float) -> int:
+    need = max(1.0, pixels / _PIXELS_PER_TILE)
+    return int(min(_MAX_TILE_SCALE, 2 ** math.ceil(math.log2(need) - 1e-9)))
+
+
+def _tile_scale_server(pixels: ee.Number) -> ee.Number:
+    exp = pixels.divide(_PIXELS_PER_TILE).max(1).log().divide(math.log(2)).subtract(1e-9).ceil()
+    return ee.Number(2).pow(exp).min(_MAX_TILE_SCALE)
+
+
+def _plan(area_m2: Union[float, ee.Number], native_scale: float, scale: Optional[float],
+          pixel_budget: float) -> Dict[str, Number]:
+    if isinstance(area_m2, ee.Number):
+        s = ee.Number(float(scale)) if scale is not None else \
+            area_m2.divide(float(pixel_budget)).sqrt().max(float(native_scale))
+        return {"scale": s, "tileScale": _tile_scale_server(area_m2.divide(s.pow(2)))}
+    s = float(scale) if scale is not None else max(float(native_scale), math.sqrt(area_m2 / float(pixel_budget)))
+    return {"scale": s, "tileScale": _tile_scale_local(area_m2 / (s * s))}
+
+
+def reduce_region_kwargs(aoi: ee.Geometry,
+                         native_scale: float,
+                         scale: Optional[float] = None,
+                         pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                         best_effort: bool = False,
+                         area_km2: Optional[float] = None) -> Dict[str, Any]:
+    """scale/tileScale/maxPixels für reduceRegion über aoi."""
+    if best_effort:
+        return {
+            "scale": float(scale or native_scale),
+            "tileScale": _tile_scale_local(float(pixel_budget)),
+            "maxPixels": float(pixel_budget),
+            "bestEffort": True,
+        }
+    area = float(area_km2) * 1e6 if area_km2 is not None else ee.Number(aoi.area(_AREA_MAX_ERROR_M))
+    kwargs: Dict[str, Any] = _plan(area, native_scale, scale, pixel_budget)
+    kwargs["maxPixels"] = _MAX_PIXELS
+    return kwargs
+
+
+def reduce_regions_kwargs(regions: ee.FeatureCollection,
+                          native_scale: float,
+                          scale: Optional[float] = None,
+                          pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                          area_km2: Optional[float] = None) -> Dict[str, Any]:
+    """scale/tileScale für reduceRegions; maßgeblich ist die größte Region."""
+    if area_km2 is not None:
+        area = float(area_km2) * 1e6
+    else:
+        areas = ee.FeatureCollection(regions).map(
+            lambda f: ee.Feature(None, {"a": f.geometry().area(_AREA_MAX_ERROR_M)})
+        )
+        area = ee.Number(areas.aggregate_max("a"))
+    return _plan(area, native_scale, scale, pixel_budget)
+
+
+def area_density(image: ee.Image, native_cell_m2: float) -> ee.Image:
+    """Flächen-je-Zelle-Bänder → m² je Ausgabepixel (maskiert = 0), maßstabsunabhängig summierbar."""
+    return image.unmask(0).divide(float(native_cell_m2)).multiply(ee.Image.pixelArea())
@@ -0,0 +1,235 @@
+# blocks/components/gee/reduce_tiled.py
+"""
+Purpose
+-------
+Gekachelte, parallele Reduktion für sehr große AOIs (z. B. ganze GAUL-L1-Regionen):
+- AOI-Bounds in ein Raster aus Kacheln teilen (Kachel ∩ AOI)
+- Kachel-Reduktionen nebenläufig über den geteilten EE-Pool (util/ee_async.py:
+  Rate-Limit, Retry mit Backoff, Session-Fairness), Kachel-Split bei Speicher-/Zeitlimit
+- Exaktes Zusammenführen: Mittel als gewichtete Summe/Gewicht, Summen/Flächen
+  addiert, Histogramme (gleiche Bins) addiert, min/max
+
+Contracts
+---------
+def tile_grid(bbox: tuple[float, float, float, float], n_tiles: int) -> list[tuple[float, float, float, float]]
+def run_tiled(aoi: ee.Geometry, fn: Callable[[ee.Geometry], ee.ComputedObject],
+              n_tiles: int, bbox=None, max_workers: int = 4, retries: int = 4,
+              max_splits: int = 2) -> list
+def tiled_reduce_region(image: ee.Image, aoi: ee.Geometry, spec: dict, scale: float,
+                        n_tiles: int = 16, bbox=None, tile_scale: float = 1,
+                        max_workers: int = 4, retries: int = 4) -> dict
+
+Args
+----
+aoi : ee.Geometry
+fn : Kachel-Geometrie → EE-Objekt; Ergebnis jeder Kachel wird per getInfo() geholt
+n_tiles : int       Ziel-Anzahl Kacheln (quadratisches Raster über die Bounds)
+bbox : (W, S, E, N) | None   AOI-Bounds, falls lokal bekannt (AoiInfo) → sonst ein getInfo()
+spec : {band: "mean" | "sum" | "min" | "max" | ("histogram", lo, hi, bins)}
+scale, tile_scale : Reduktionsparameter (gleich für alle Kacheln)
+max_workers : int   max. gleichzeitig eingereichte Kachel-Requests dieses Aufrufs
+retries : int       Wiederholungen je Kachel bei Rate-Limit/Transient-Fehlern (ee_async)
+max_splits : int    Tiefe der Viertelung bei Speicher-/Zeitlimit
+
+Returns
+-------
+run_tiled → Liste der getInfo()-Ergebnisse (eine je (Teil-)Kachel, Reihenfolge beliebig)
+tiled_reduce_region → {"<band>_mean" | "<band>_sum" | "<band>_min" | "<band>_max": float | None,
+                       "<band>_histogram": [[bin_start, count], ...]}
+
+Side Effects
+------------
+Ein getInfo() je Kachel (parallel), plus ggf. ein Bounds-getInfo(). Als
+Hintergrund-Job (util/jobs.py) zusätzlich Fortschritt und Zwischenstand je Kachel.
+
+Notes
+-----
+- Mittelwerte: EE gewichtet Pixel mit Flächenanteil/Maske; hier wird Σ(w·v) und Σw
+  je Kachel reduziert (Reducer.sum auf Wert und auf 1 mit identischer Maske), das
+  Gesamtmittel Σ(w·v)/Σw ist damit gleich dem ungekachelten Mittel.
+- Histogramme: fixedHistogram mit festen Bins → Zählungen kachelweise addierbar.
+- Kacheln sind Rechtecke in EPSG:4326 (planar), die die Bounds lückenlos teilen.
+- Im Job: report_progress nach jeder Kachel; fertige Kachel-Ergebnisse und offene
+  Kacheln per save_job_state, ein erneuter Versuch nach Worker-Absturz rechnet
+  nur die offenen Kacheln, z. B.
+  submit_job("blocks.components.gee.reduce_tiled:tiled_reduce_region",
+             {"image": img, "aoi": aoi, "spec": {"NDVI": "mean"}, "scale": 30})
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import ee
+
+from ..util.ee_async import current_session, submit
+from ..util.jobs import JobCancelled, in_job, job_state, report_progress, save_job_state
+from ..util.local_cache import ee_key
+
+BBox = Tuple[float, float, float, float]
+
+_SPLIT_MARKERS = ("memory limit", "timed out", "too many pixels", "deadline")
+
+
+def tile_grid(bbox: BBox, n_tiles: int) -> List[BBox]:
+    """Bounds in ≈n_tiles gleich große Rechtecke teilen (Spalten/Zeilen nach Seitenverhältnis)."""
+    west, south, east, north = (float(v) for v in bbox)
+    n = max(1, int(n_tiles))
+    width = max(east - west, 1e-9) * math.cos(math.radians((south + north) / 2.0))
+    height = max(north - south, 1e-9)
+    cols = max(1, round(math.sqrt(n * width / height)))
+    rows = max(1, math.ceil(n / cols))
+    dx = (east - west) / cols
+    dy = (north - south) / rows
+    return [
+        (west + i * dx, south + j * dy,
+         east if i == cols - 1 else west + (i + 1) * dx,
+         north if j == rows - 1 else south + (j + 1) * dy)
+        for j in range(rows) for i in range(cols)
+    ]
+
+
+def _bounds(aoi: ee.Geometry) -> BBox:
+    ring = aoi.bounds(1).getInfo()["coordinates"][0]
+    lons = [p[0] for p in ring]
+    lats = [p[1] for p in ring]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+def _tile_geometry(aoi: ee.Geometry, tile: BBox) -> ee.Geometry:
+    rect = ee.Geometry.Rectangle(list(tile), "EPSG:4326", False)
+    return aoi.intersection(rect, 1)
+
+
+def _matches(err: Exception, markers: Sequence[str]) -> bool:
+    msg = str(err).lower()
+    return any(m in msg for m in markers)
+
+
+def _tile_info(aoi: ee.Geometry, tile: BBox, fn: Callable[[ee.Geometry], ee.ComputedObject]) -> Any:
+    return fn(_tile_geometry(aoi, tile)).getInfo()
+
+
+def run_tiled(aoi: ee.Geometry,
+              fn: Callable[[ee.Geometry], ee.ComputedObject],
+              n_tiles: int,
+              bbox: Optional[BBox] = None,
+              max_workers: int = 4,
+              retries: int = 4,
+              max_splits: int = 2) -> List[Any]:
+    """fn je Kachel ausführen und alle Kachel-Ergebnisse (getInfo) sammeln."""
+    # Zwischenstand je Berechnung (Graph von fn über die ganze AOI), nur im Hintergrund-Job
+    state_key = f"run_tiled:{ee_key(fn(aoi))}:{int(n_tiles)}" if in_job() else ""
+    saved = job_state(state_key) if state_key else None
+    if saved:
+        queue: Deque[Tuple[BBox, int]] = deque((tuple(t), int(s)) for t, s in saved["queue"])
+        results: List[Any] = list(saved["results"])
+    else:
+        tiles = tile_grid(bbox if bbox is not None else _bounds(aoi), n_tiles)
+        queue = deque((t, int(max_splits)) for t in tiles)
+        results = []
+    session = current_session()
+    inflight: Dict[Future, Tuple[BBox, int]] = {}
+    while queue or inflight:
+        while queue and len(inflight) < max(1, int(max_workers)):
+            tile, splits_left = queue.popleft()
+            inflight[submit(_tile_info, aoi, tile, fn, session=session, retries=retries)] = (tile, splits_left)
+        done, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+        for fut in done:
+            tile, splits_left = inflight.pop(fut)
+            err = fut.exception()
+            if err is None:
+                results.append(fut.result())
+            elif splits_left > 0 and _matches(err, _SPLIT_MARKERS):
+                queue.extend((sub, splits_left - 1) for sub in tile_grid(tile, 4))
+            else:
+                for other in inflight:
+                    other.cancel()
+                raise err
+        if state_key:
+            pending = list(queue) + list(inflight.values())
+            save_job_state(state_key, {"queue": [[list(t), s] for t, s in pending], "results": results})
+            try:
+                report_progress(len(results) / (len(results) + len(pending)),
+                                f"{len(results)}/{len(results) + len(pending)} Kacheln")
+            except JobCancelled:
+                for other in inflight:
+                    other.cancel()
+                raise
+    return results
+
+
+HistSpec = Tuple[str, float, float, int]
+
+
+def _partial_image(image: ee.Image, spec: Mapping[str, Union[str, HistSpec]]) -> Tuple[ee.Image, ee.Reducer]:
+    """Bänder + kombinierter Reducer, deren Teilergebnisse exakt addierbar sind."""
+    bands: List[ee.Image] = []
+    reducers: List[Tuple[ee.Reducer, str]] = []
+    for band, kind in spec.items():
+        src = image.select(band)
+        if isinstance(kind, (tuple, list)):
+            _, lo, hi, bins = kind
+            bands.append(src.rename(f"{band}_h"))
+            reducers.append((ee.Reducer.fixedHistogram(float(lo), float(hi), int(bins)), f"{band}_h"))
+        elif kind == "mean":
+            bands.append(src.rename(f"{band}_s"))
+            bands.append(ee.Image(1).updateMask(src.mask()).rename(f"{band}_w"))
+            reducers.append((ee.Reducer.sum(), f"{band}_s"))
+            reducers.append((ee.Reducer.sum(), f"{band}_w"))
+        elif kind in ("sum", "min", "max"):
+            bands.append(src.rename(f"{band}_{kind}"))
+            reducers.append(({"sum": ee.Reducer.sum, "min": ee.Reducer.min, "max": ee.Reducer.max}[kind](),
+                             f"{band}_{kind}"))
+        else:
+            raise ValueError(f"Unsupported statistic for band '{band}': {kind!r}")
+
+    reducer = reducers[0][0].setOutputs([reducers[0][1]])
+    for red, name in reducers[1:]:
+        reducer = reducer.combine(red.setOutputs([name]), "", False)
+    return ee.Image.cat(*bands), reducer
+
+
+def _merge(parts: List[Dict[str, Any]], spec: Mapping[str, Union[str, HistSpec]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for band, kind in spec.items():
+        if isinstance(kind, (tuple, list)):
+            merged: Dict[float, float] = {}
+            for p in parts:
+                for b, c in (p.get(f"{band}_h") or []):
+                    merged[float(b)] = merged.get(float(b), 0.0) + float(c)
+            out[f"{band}_histogram"] = [[b, merged[b]] for b in sorted(merged)]
+        elif kind == "mean":
+            s = sum(float(p.get(f"{band}_s") or 0.0) for p in parts)
+            w = sum(float(p.get(f"{band}_w") or 0.0) for p in parts)
+            out[f"{band}_mean"] = (s / w) if w > 0 else None
+        elif kind == "sum":
+            out[f"{band}_sum"] = sum(float(p.get(f"{band}_sum") or 0.0) for p in parts)
+        else:
+            vals = [float(p[f"{band}_{kind}"]) for p in parts if p.get(f"{band}_{kind}") is not None]
+            out[f"{band}_{kind}"] = (min(vals) if kind == "min" else max(vals)) if vals else None
+    return out
+
+
+def tiled_reduce_region(image: ee.Image,
+                        aoi: ee.Geometry,
+                        spec: Mapping[str, Union[str, HistSpec]],
+                        scale: Union[float, ee.Number],
+                        n_tiles: int = 16,
+                        bbox: Optional[BBox] = None,
+                        tile_scale: Union[float, ee.Number] = 1,
+                        max_workers: int = 4,
+                        retries: int = 4) -> Dict[str, Any]:
+    """Statistiken je Band über aoi, gekachelt reduziert und exakt zusammengeführt."""
+    if not spec:
+        raise ValueError("spec must not be empty")
+    stacked, reducer = _partial_image(image, spec)
+
+    def per_tile(geom: ee.Geometry) -> ee.Dictionary:
+        return stacked.reduceRegion(reducer=reducer, geometry=geom, scale=scale,
+                                    tileScale=tile_scale, maxPixels=1e13)
+
+    parts = run_tiled(aoi, per_tile, n_tiles, bbox, max_workers, retries)
+    return _merge([p or {} for p in parts], spec)
@@ -4,19 +4,30 @@ Purpose
 -------
 Sentinel-2 Quartalsmosaik erstellen:
 - Quelle: COPERNICUS/S2_HARMONIZED
-- Filter: Datum [start, end), CLOUDY_PIXEL_PERCENTAGE ≤ 10
-- Transform: Reflexion auf 0..1 skalieren (divide(10000))
+- Filter: Datum [start, end), CLOUDY_PIXEL_PERCENTAGE ≤ 80
+- Optionale Szenen-Vorauswahl: nur so viele Szenen (nach AOI-lokalem Klaranteil),
+  wie für target_coverage nötig sind (scene_prune.prune_scenes)
+- Bänder: nur S2_REQUIRED_BANDS + QA60 werden geladen
+- Transform: Reflexion auf 0..1 skalieren (divide(10000), nur Ausgabebänder)
 - Reduce: Median
 - Optional: AOI-Clip (hier: clip(aoi))
 
 Contracts
 ---------
-def build_s2_quarter_median(aoi: ee.Geometry, start: ee.Date, end: ee.Date) -> ee.Image
+S2_REQUIRED_BANDS = ("B8", "B11", "B4")
+def build_s2_quarter_median(aoi: ee.Geometry, start: ee.Date, end: ee.Date,
+                            bands=S2_REQUIRED_BANDS, target_coverage: float | None = None,
+                            max_candidates: int = 40, area_km2: float | None = None) -> ee.Image
 
 Args
 ----
 aoi : ee.Geometry
 start, end : ee.Date
+bands : Sequence[str]   Ausgabebänder (Default: B8, B11, B4 wie bisher)
+target_coverage : float | None   Ziel-Klarabdeckung der AOI (opt-in, z. B. 0.98);
+                                 None = alle Szenen (Default, bisheriges Verhalten)
+max_candidates : int    Obergrenze der Kandidaten nach CLOUDY_PIXEL_PERCENTAGE
+area_km2 : float | None AOI-Fläche, falls lokal bekannt (AoiInfo) → grober QA-Maßstab als Zahl
 
 Returns
 -------
@@ -29,29 +40,51 @@ Keine.
 
 Notes
 -----
-- CLOUDY_PIXEL_PERCENTAGE ≤ 10 und divide(10000) 1:1 aus der Vorlage. :contentReference[oaicite:2]{index=2}
+- CLOUDY_PIXEL_PERCENTAGE ≤ 80 und divide(10000) 1:1 aus der Vorlage. :contentReference[oaicite:2]{index=2}
+- Band-Pushdown: select beim Laden, Properties werden nicht kopiert (der Median
+  braucht keine); Prüfung: scripts/check_band_pushdown.py.
+- Vorauswahl: QA60 grob reduziert (≈1e4 Pixel je Szene), Details in scene_prune.
 """
 
+from typing import Optional, Sequence
+
 import ee
 
-def _mask_s2_sr(img: ee.Image) -> ee.Image:
-    qa = img.select("QA60")
+from .scene_prune import prune_scenes
+
+S2_REQUIRED_BANDS = ("B8", "B11", "B4")
+_S2_QA = "QA60"
+
+def _s2_clear(img: ee.Image) -> ee.Image:
+    qa = img.select(_S2_QA)
     cloud_bit, cirrus_bit = 1 << 10, 1 << 11
-    mask = qa.bitwiseAnd(cloud_bit).eq(0).And(qa.bitwiseAnd(cirrus_bit).eq(0))
-    return img.updateMask(mask).divide(10000).copyProperties(img, img.propertyNames())
+    return qa.bitwiseAnd(cloud_bit).eq(0).And(qa.bitwiseAnd(cirrus_bit).eq(0))
+
+def _mask_s2_sr(img: ee.Image, bands: Sequence[str] = S2_REQUIRED_BANDS) -> ee.Image:
+    return img.select(list(bands)).updateMask(_s2_clear(img)).divide(10000)
 
-def build_s2_quarter_median(aoi: ee.Geometry, start: ee.Date, end: ee.Date) -> ee.Image:
+def build_s2_quarter_median(aoi: ee.Geometry, start: ee.Date, end: ee.Date,
+                            bands: Sequence[str] = S2_REQUIRED_BANDS,
+                            target_coverage: Optional[float] = None,
+                            max_candidates: int = 40,
+                            area_km2: Optional[float] = None) -> ee.Image:
+    bands = list(bands)
     col = (
         ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED")
         .filterDate(start, end)
         .filterBounds(aoi)
         .filter(ee.Filter.lte("CLOUDY_PIXEL_PERCENTAGE", 80))
-        .map(_mask_s2_sr)
+        .select(bands + [_S2_QA])
     )
+    if target_coverage is not None:
+        col = prune_scenes(col, aoi, _s2_clear, "CLOUDY_PIXEL_PERCENTAGE",
+                           target_coverage=target_coverage, max_candidates=max_candidates,
+                           qa_scale=60, area_km2=area_km2)
+    col = col.map(lambda img: _mask_s2_sr(img, bands))
 
     size = col.size()
     def _ok():
-        return (col.select(["B8","B11","B4"]).median().clip(aoi).set("empty", 0))
+        return (col.median().clip(aoi).set("empty", 0))
     def _empty():
-        return (ee.Image.constant([0,0,0]).rename(["B8","B11","B4"]).toFloat().clip(aoi).set("empty", 1))
+        return (ee.Image.constant([0] * len(bands)).rename(bands).toFloat().clip(aoi).set("empty", 1))
     return ee.Image(ee.Algorithms.If(size.gt(0), _ok(), _empty()))
@@ -0,0 +1,106 @@
+# blocks/components/gee/scene_prune.py
+"""
+Purpose
+-------
+Adaptive Szenen-Vorauswahl für Median-Komposite (Sentinel-2, Landsat):
+1) Metadaten (billig): Szenen nach Wolken-Property sortieren, nur die besten
+   max_candidates behalten
+2) Grobe QA-Reduktion (AOI-lokal): klarer Flächenanteil je Kandidat in grober
+   Auflösung (kleines Pixel-Budget)
+3) Minimalmenge: Kandidaten nach klarem Anteil absteigend, so viele wie nötig,
+   bis die geschätzte Abdeckung target_coverage erreicht (mind. min_scenes)
+Damit bleiben die Kosten des Komposits begrenzt, auch bei sehr dichter Wiederkehr.
+
+Contracts
+---------
+def prune_scenes(col: ee.ImageCollection, aoi: ee.Geometry,
+                 clear_fn: Callable[[ee.Image], ee.Image], cloud_property: str,
+                 target_coverage: float = 0.98, min_scenes: int = 3,
+                 max_candidates: int = 40, qa_scale: float = 60,
+                 pixel_budget: float = 1e4, area_km2: float | None = None) -> ee.ImageCollection
+
+Args
+----
+col : ee.ImageCollection    bereits nach Datum/AOI gefiltert (QA-Band muss enthalten sein)
+aoi : ee.Geometry
+clear_fn : Bild → 1-Band-Bild, 1 = klares Pixel (aus dem QA-Band)
+cloud_property : str        Szenen-Metadatum, kleiner = besser (z. B. CLOUDY_PIXEL_PERCENTAGE)
+target_coverage : float     Ziel-Anteil der AOI, der mind. einmal klar gesehen wird (0..1)
+min_scenes : int            Untergrenze (Median braucht mehrere Beobachtungen)
+max_candidates : int        Obergrenze für die QA-Reduktion (Kosten der Vorauswahl)
+qa_scale : float            native QA-Auflösung in m (Untergrenze des groben Maßstabs)
+pixel_budget : float        Pixel je QA-Reduktion (bestimmt den groben Maßstab)
+area_km2 : float | None     AOI-Fläche, falls lokal bekannt (AoiInfo) → Maßstab als Zahl
+
+Returns
+-------
+ee.ImageCollection
+    Ausgewählte Szenen mit Property "aoi_clear" (klarer AOI-Anteil 0..1),
+    absteigend nach aoi_clear sortiert.
+
+Side Effects
+------------
+Keine (lazy; kein getInfo).
+
+Notes
+-----
+- Abdeckung wird unter Unabhängigkeitsannahme geschätzt: 1 − Π(1 − aoi_clear_i).
+  Das ist konservativ für Szenen, die unterschiedliche AOI-Teile abdecken
+  (z. B. benachbarte Orbits), es werden eher zu viele als zu wenige Szenen gewählt.
+- Pixel außerhalb des Szenen-Footprints zählen als nicht klar (unmask(0)).
+- Ist das Ziel nicht erreichbar, werden alle Kandidaten verwendet.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+import ee
+
+from .reduce_budget import reduce_region_kwargs
+
+_CLEAR_PROP = "aoi_clear"
+
+
+def _with_clear_fraction(col: ee.ImageCollection, aoi: ee.Geometry,
+                         clear_fn: Callable[[ee.Image], ee.Image], kwargs: dict) -> ee.ImageCollection:
+    def annotate(img):
+        img = ee.Image(img)
+        clear = clear_fn(img).unmask(0).rename("clear")
+        stats = clear.reduceRegion(reducer=ee.Reducer.mean(), geometry=aoi, **kwargs)
+        return img.set(_CLEAR_PROP, ee.Number(stats.get("clear")))
+    return col.map(annotate)
+
+
+def _scenes_needed(fractions: ee.List, target_coverage: float, min_scenes: int) -> ee.Number:
+    """Anzahl führender Szenen (absteigend sortiert), bis die Abdeckung das Ziel erreicht."""
+    max_miss = 1.0 - float(target_coverage)
+
+    def step(frac, acc):
+        acc = ee.List(acc)
+        miss = ee.Number(acc.get(0))
+        n = ee.Number(acc.get(1))
+        need = miss.gt(max_miss).Or(n.lt(int(min_scenes)))
+        new_miss = ee.Number(ee.Algorithms.If(need, miss.multiply(ee.Number(1).subtract(frac)), miss))
+        return ee.List([new_miss, n.add(need)])
+
+    return ee.Number(ee.List(fractions.iterate(step, ee.List([1.0, 0]))).get(1))
+
+
+def prune_scenes(col: ee.ImageCollection,
+                 aoi: ee.Geometry,
+                 clear_fn: Callable[[ee.Image], ee.Image],
+                 cloud_property: str,
+                 target_coverage: float = 0.98,
+                 min_scenes: int = 3,
+                 max_candidates: int = 40,
+                 qa_scale: float = 60,
+                 pixel_budget: float = 1e4,
+                 area_km2: Optional[float] = None) -> ee.ImageCollection:
+    """Minimale Szenenmenge für target_coverage (Metadaten-Vorfilter + grobe QA-Reduktion)."""
+    if not 0.0 < float(target_coverage) <= 1.0:
+        raise ValueError("target_coverage must be in (0, 1]")
+    candidates = ee.ImageCollection(col).limit(int(max_candidates), cloud_property, True)
+    kwargs = reduce_region_kwargs(aoi, qa_scale, pixel_budget=pixel_budget, area_km2=area_km2)
+    ranked = _with_clear_fraction(candidates, aoi, clear_fn, kwargs).sort(_CLEAR_PROP, False)
+    n = _scenes_needed(ranked.aggregate_array(_CLEAR_PROP), target_coverage, min_scenes)
+    return ranked.limit(n)
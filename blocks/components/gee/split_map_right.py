@@ -18,7 +18,7 @@ def render_split_map_right(
 
 Args
 ----
-m : geemap.foliumap.Map
+m : slim_map.Map (API-kompatibel auch geemap.foliumap.Map)
 right_layer : beliebiges EE-Objekt (typisch ee.Image)
 vis_params : Dict[str, Any]  (z. B. {"min": 20, "max": 45, "palette": [...], "opacity": 0.6})
 title : str
@@ -31,11 +31,14 @@ None
 
 Side Effects
 ------------
-Rendert die Karte nach Streamlit.
+Rendert die Karte nach Streamlit. EE-Layer-URL wird vorab aufgelöst und
+gecacht (visual/ee_tile_layers.py).
 """
 
 from typing import Dict, Any, Optional
-from geemap.foliumap import Map
+from ..visual.slim_map import Map
+
+from ..visual.ee_tile_layers import prepare_tile_layers
 
 def render_split_map_right(
     m: Map,
@@ -46,17 +49,21 @@ def render_split_map_right(
     colorbar_label: Optional[str] = None,
 ) -> None:
     """Render split map; do not hardcode palettes/min/max; use vis_params."""
+    (prepared,) = prepare_tile_layers([(right_layer, vis_params, title)])
     # Split-Map (rechte Seite)
     try:
         m.split_map(
             left_layer=None,
-            right_layer=right_layer,
-            right_vis=vis_params,
+            right_layer=prepared,
+            right_vis=(vis_params if prepared is right_layer else {}),
             right_name=title,
         )
     except Exception:
         # Fallback: normales Layer
-        m.add_layer(right_layer, vis_params, title)
+        if prepared is not right_layer:
+            prepared.add_to(m)
+        else:
+            m.add_layer(right_layer, vis_params, title)
 
     # Optionale Farbleiste, nur wenn Min/Max/Palette vorhanden
     try:
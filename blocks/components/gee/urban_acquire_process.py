@@ -4,36 +4,74 @@ Purpose
 -------
 GHSL Built-up (JRC/GHSL/P2023A/GHS_BUILT_S) je Jahr laden, optional
 Low-Value-Threshold-Maske anwenden, auf AOI clippen und (für Stats) Fläche
-in km² aggregieren.
+in km² aggregieren. Für Zeitreihen: alle Epochen als ein Multiband-Bild
+("Cube") und km² + Wachstumsraten aller Epochen in EINER Reduktion
+(optional für viele AOIs gleichzeitig).
 
 Contracts
 ---------
 def ghsl_built_surface(year: int) -> ee.Image
 def build_built_surface_layer(aoi: ee.Geometry, year: int, threshold: int | None = None) -> ee.Image
-def builtup_km2(image: ee.Image, region: ee.Geometry) -> ee.Number
+def builtup_km2(image: ee.Image, region: ee.Geometry, scale: float | None = None,
+                pixel_budget: float = DEFAULT_PIXEL_BUDGET, best_effort: bool = False,
+                area_km2: float | None = None, tiles: int | None = None,
+                bbox: tuple | None = None, max_workers: int = 4) -> ee.Number
+def ghsl_built_cube(epochs=GHSL_EPOCHS, threshold: int | None = None) -> ee.Image
+def builtup_km2_series(region: ee.Geometry, epochs=GHSL_EPOCHS,
+                       threshold: int | None = None, scale: float | None = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET, best_effort: bool = False,
+                       area_km2: float | None = None, tiles: int | None = None,
+                       bbox: tuple | None = None, max_workers: int = 4) -> pandas.DataFrame
+def builtup_km2_series_batch(regions: dict[str, ee.Geometry] | ee.FeatureCollection,
+                             epochs=GHSL_EPOCHS, threshold: int | None = None,
+                             id_property: str = "aoi_id", scale: float | None = None,
+                             pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> pandas.DataFrame
 
 Args
 ----
 aoi, region : ee.Geometry
 year : int
 threshold : int | None   (z. B. 1 → keep values > 1, selfMask)
+epochs : Iterable[int]   GHSL-Epochen (Default: 1975..2030 in 5-Jahres-Schritten)
+regions : {id: ee.Geometry} oder FeatureCollection mit Property id_property
+scale, pixel_budget, best_effort, area_km2 : siehe reduce_budget.py
+    (Default: native 100 m, bei großen AOIs automatisch gröber)
+tiles, bbox, max_workers : gekachelte Parallel-Reduktion (reduce_tiled.py) für sehr
+    große AOIs; Summen werden exakt addiert. bbox wie AoiInfo["bbox"].
 
 Returns
 -------
-ee.Image (Layer) bzw. ee.Number (km²)
+ee.Image (Layer/Cube) bzw. ee.Number (km²) bzw. pandas.DataFrame mit Spalten
+[year, built_km2, delta_km2, growth_pct, cagr_pct] (Batch zusätzlich id_property).
 
 Side Effects
 -----------
-Keine.
+builtup_km2_series*/batch: genau ein getInfo()-Call (mit tiles: einer je Kachel).
+builtup_km2: keiner; mit tiles einer je Kachel (Ergebnis dann als konstante ee.Number).
+Sonst keine.
 
 Notes
 -----
 - Dataset, Bandname und typische Threshold-Maske (>1, selfMask) 1:1 aus Vorlagen. 
+- Summen laufen über area_density (m² bebaut je Ausgabepixel), damit km² auch
+  bei gröberem Maßstab als 100 m stimmen.
+- tileScale mindestens 4 (wie vor der automatischen Planung): das GHSL-Asset
+  läuft bei kleinem tileScale auch für mittlere AOIs in Speicherlimits; der
+  Planer erhöht nur darüber hinaus.
 """
 
+from typing import Any, Dict, Iterable, List, Tuple, Union
 import ee
+import pandas as pd
+
+from .reduce_budget import DEFAULT_PIXEL_BUDGET, area_density, reduce_region_kwargs, reduce_regions_kwargs
+from .reduce_tiled import tiled_reduce_region
 
 _GHSL_PREFIX = "JRC/GHSL/P2023A/GHS_BUILT_S"  # :contentReference[oaicite:5]{index=5}
+GHSL_EPOCHS = tuple(range(1975, 2031, 5))      # verfügbare Epochen in P2023A
+_GHSL_SCALE = 100.0                            # native Zellgröße (m)
+_GHSL_CELL_M2 = _GHSL_SCALE * _GHSL_SCALE
+_MIN_TILE_SCALE = 4
 
 def ghsl_built_surface(year: int) -> ee.Image:
     """Lade GHSL Built Surface für ein Jahr, Band 'built_surface'."""
@@ -46,13 +84,123 @@ def build_built_surface_layer(aoi: ee.Geometry, year: int, threshold: int | None
         img = img.updateMask(img.gt(int(threshold))).selfMask()  # :contentReference[oaicite:6]{index=6}
     return img.clip(aoi)
 
-def builtup_km2(image: ee.Image, region: ee.Geometry) -> ee.Number:
+def _min_tile_scale(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """tileScale aus reduce_budget nach unten auf _MIN_TILE_SCALE begrenzen."""
+    ts = kwargs["tileScale"]
+    kwargs["tileScale"] = ee.Number(ts).max(_MIN_TILE_SCALE) if isinstance(ts, ee.ComputedObject) \
+        else max(_MIN_TILE_SCALE, ts)
+    return kwargs
+
+def builtup_km2(image: ee.Image,
+                region: ee.Geometry,
+                scale: float | None = None,
+                pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                best_effort: bool = False,
+                area_km2: float | None = None,
+                tiles: int | None = None,
+                bbox: Tuple[float, float, float, float] | None = None,
+                max_workers: int = 4) -> ee.Number:
     """Summe der 'built_surface' (m²) in km² umrechnen (÷ 1e6)."""
-    s = image.select("built_surface").reduceRegion(
+    density = area_density(image.select("built_surface"), _GHSL_CELL_M2)
+    if tiles and int(tiles) > 1:
+        if best_effort:
+            raise ValueError("best_effort cannot be combined with tiles (scale must be identical per tile)")
+        kw = _min_tile_scale(reduce_region_kwargs(region, _GHSL_SCALE, scale, pixel_budget, False, area_km2))
+        merged = tiled_reduce_region(density, region, {"built_surface": "sum"},
+                                     scale=kw["scale"], n_tiles=int(tiles), bbox=bbox,
+                                     tile_scale=kw["tileScale"], max_workers=max_workers)
+        return ee.Number(float(merged.get("built_surface_sum") or 0.0)).divide(1e6)
+    s = density.reduceRegion(
         reducer=ee.Reducer.sum(),
         geometry=region,
-        scale=100,
-        maxPixels=1e13,
-        tileScale=4,
+        **_min_tile_scale(reduce_region_kwargs(region, _GHSL_SCALE, scale, pixel_budget, best_effort, area_km2)),
     ).get("built_surface")  # :contentReference[oaicite:7]{index=7}
     return ee.Number(s).divide(1e6)
+
+
+def _mask_threshold(img: ee.Image, threshold: int | None) -> ee.Image:
+    if threshold is None:
+        return img
+    return img.updateMask(img.gt(int(threshold))).selfMask()
+
+def ghsl_built_cube(epochs: Iterable[int] = GHSL_EPOCHS, threshold: int | None = None) -> ee.Image:
+    """Alle Epochen als ein Bild, Bänder 'built_<year>' (m² bebaut je Pixel)."""
+    years = [int(y) for y in epochs]
+    if not years:
+        raise ValueError("epochs must not be empty")
+    bands = [_mask_threshold(ghsl_built_surface(y), threshold).rename(f"built_{y}") for y in years]
+    return ee.Image.cat(*bands)
+
+def _growth_table(years: List[int], km2: List[float]) -> pd.DataFrame:
+    df = pd.DataFrame({"year": years, "built_km2": km2}).sort_values("year").reset_index(drop=True)
+    prev = df["built_km2"].shift(1)
+    span = df["year"].diff()
+    df["delta_km2"] = df["built_km2"] - prev
+    df["growth_pct"] = (df["built_km2"] / prev - 1.0) * 100.0
+    df["cagr_pct"] = ((df["built_km2"] / prev) ** (1.0 / span) - 1.0) * 100.0
+    # Wachstum ab 0 km² ist undefiniert
+    return df.replace([float("inf"), float("-inf")], float("nan"))
+
+def builtup_km2_series(region: ee.Geometry,
+                       epochs: Iterable[int] = GHSL_EPOCHS,
+                       threshold: int | None = None,
+                       scale: float | None = None,
+                       pixel_budget: float = DEFAULT_PIXEL_BUDGET,
+                       best_effort: bool = False,
+                       area_km2: float | None = None,
+                       tiles: int | None = None,
+                       bbox: Tuple[float, float, float, float] | None = None,
+                       max_workers: int = 4) -> pd.DataFrame:
+    """km² je Epoche + Wachstumsraten aus EINEM reduceRegion über den Cube."""
+    years = [int(y) for y in epochs]
+    cube = area_density(ghsl_built_cube(years, threshold), _GHSL_CELL_M2)
+    if tiles and int(tiles) > 1:
+        if best_effort:
+            raise ValueError("best_effort cannot be combined with tiles (scale must be identical per tile)")
+        kw = _min_tile_scale(reduce_region_kwargs(region, _GHSL_SCALE, scale, pixel_budget, False, area_km2))
+        merged = tiled_reduce_region(cube, region, {f"built_{y}": "sum" for y in years},
+                                     scale=kw["scale"], n_tiles=int(tiles), bbox=bbox,
+                                     tile_scale=kw["tileScale"], max_workers=max_workers)
+        sums = {f"built_{y}": merged.get(f"built_{y}_sum") for y in years}
+    else:
+        sums = cube.reduceRegion(
+            reducer=ee.Reducer.sum(),
+            geometry=region,
+            **_min_tile_scale(reduce_region_kwargs(region, _GHSL_SCALE, scale, pixel_budget, best_effort, area_km2)),
+        ).getInfo() or {}
+    km2 = [float(sums.get(f"built_{y}") or 0.0) / 1e6 for y in years]
+    return _growth_table(years, km2)
+
+def builtup_km2_series_batch(regions: Union[Dict[str, ee.Geometry], ee.FeatureCollection],
+                             epochs: Iterable[int] = GHSL_EPOCHS,
+                             threshold: int | None = None,
+                             id_property: str = "aoi_id",
+                             scale: float | None = None,
+                             pixel_budget: float = DEFAULT_PIXEL_BUDGET) -> pd.DataFrame:
+    """Wie builtup_km2_series, aber für viele AOIs in EINEM reduceRegions-Call."""
+    years = [int(y) for y in epochs]
+    if isinstance(regions, dict):
+        fc = ee.FeatureCollection([
+            ee.Feature(geom, {id_property: str(key)}) for key, geom in regions.items()
+        ])
+    else:
+        fc = ee.FeatureCollection(regions)
+
+    reduced = area_density(ghsl_built_cube(years, threshold), _GHSL_CELL_M2).reduceRegions(
+        collection=fc.select([id_property]),
+        reducer=ee.Reducer.sum(),
+        **_min_tile_scale(reduce_regions_kwargs(fc, _GHSL_SCALE, scale, pixel_budget)),
+    )
+    # Geometrien nicht zum Client übertragen
+    rows = reduced.map(lambda f: ee.Feature(None, f.toDictionary())).getInfo()["features"]
+
+    tables = []
+    for feat in rows:
+        props = feat.get("properties", {})
+        km2 = [float(props.get(f"built_{y}") or 0.0) / 1e6 for y in years]
+        t = _growth_table(years, km2)
+        t.insert(0, id_property, props.get(id_property))
+        tables.append(t)
+    if not tables:
+        return pd.DataFrame(columns=[id_property, "year", "built_km2", "delta_km2", "growth_pct", "cagr_pct"])
+    return pd.concat(tables, ignore_index=True)
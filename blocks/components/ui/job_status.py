@@ -0,0 +1,84 @@
+# blocks/components/ui/job_status.py
+"""
+Purpose
+-------
+Status und Ergebnis eines Hintergrund-Jobs (util/jobs.py) in der App anzeigen
+(keine GEE-Operationen). Solange der Job läuft, aktualisiert sich nur die
+Fortschrittsanzeige; ist er fertig, läuft die App einmal neu und erhält das
+Ergebnis.
+
+Contracts
+---------
+def ui_job_status(job_id: str, label: str | None = None, poll_s: float = 2.0) -> Any | None
+
+Args
+----
+job_id : str      von submit_job(...)
+label : str | None   Anzeigename (Default: Funktionsname des Jobs)
+poll_s : float    Abfrageintervall der Fortschrittsanzeige in s
+
+Returns
+-------
+Ergebnis des Jobs (bytes, JSON-Wert, DataFrame), None solange er wartet/läuft
+oder wenn er fehlgeschlagen ist.
+
+Side Effects
+------------
+Streamlit-Rendering (Fortschrittsbalken, Abbrechen-Button, Fehlermeldung).
+Während der Job läuft, wird der Lauf als nicht wiederspielbar markiert
+(util/artifacts.py), damit der nächste Rerun das Ergebnis abholt.
+
+Notes
+-----
+- Mit st.fragment pollt nur der Statusbereich (run_every); ohne Fragment-Support
+  gibt es einen Aktualisieren-Button.
+- Der Job läuft im Worker-Prozess weiter, auch wenn die Session endet; derselbe
+  submit_job-Aufruf nach einem Reload liefert denselben Job.
+"""
+
+from typing import Any, Optional
+
+import streamlit as st
+
+from ..util.artifacts import mark_unreplayable
+from ..util.jobs import JobInfo, cancel_job, get_job, job_result
+
+_STATUS_TEXT = {"queued": "wartet auf Worker", "running": "läuft"}
+
+def _render_progress(job: JobInfo, title: str) -> None:
+    text = f"{title}: {job['message'] or _STATUS_TEXT.get(job['status'], job['status'])}"
+    st.progress(float(job["progress"]), text=text)
+    if st.button("Abbrechen", key=f"job_cancel_{job['id']}", type="secondary"):
+        cancel_job(job["id"])
+
+def ui_job_status(job_id: str, label: Optional[str] = None, poll_s: float = 2.0) -> Any:
+    """Render job progress; return the job result once it is done."""
+    job = get_job(job_id)
+    if job is None:
+        st.error(f"Job {job_id[:8]} nicht gefunden.")
+        return None
+    title = label or job["target"].rpartition(":")[2]
+    if job["status"] == "done":
+        result = job_result(job_id)
+        if result is None:
+            st.warning(f"{title}: Ergebnis nicht mehr im Cache – bitte erneut starten.")
+        return result
+    if job["status"] in ("failed", "cancelled"):
+        st.error(f"{title}: {'abgebrochen' if job['status'] == 'cancelled' else job['error']}")
+        return None
+
+    mark_unreplayable(f"job {job_id[:8]} {job['status']}")
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        _render_progress(job, title)
+        st.button("Aktualisieren", key=f"job_refresh_{job_id}")
+        return None
+
+    @fragment(run_every=float(poll_s))
+    def _poll() -> None:
+        current = get_job(job_id)
+        if current is None or current["status"] not in ("queued", "running"):
+            st.rerun()  # ganze App: Aufrufer erhält jetzt das Ergebnis
+        _render_progress(current, title)
+    _poll()
+    return None
@@ -20,11 +20,20 @@ int : aktuelle Auswahl
 
 Side Effects
 ------------
-Streamlit-Rendering.
+Streamlit-Rendering. Meldet den Wert an einen aktiven widget_memo-Scope
+(util/widget_memo.py); ein Override des Scopes (Prefetch) ersetzt den Wert.
+Während capture() wird der Widget-Stand als Artefakt gemeldet (util/artifacts.py).
 """
 
 import streamlit as st
 
+from ..util.artifacts import record_artifact
+from ..util.widget_memo import record_widget
+
 def ui_number_input_int(label: str, min: int, max: int, value: int, step: int = 1) -> int:
     """Render int number input and return selection."""
-    return int(st.number_input(label, min_value=int(min), max_value=int(max), value=int(value), step=int(step)))
+    selected = st.number_input(label, min_value=int(min), max_value=int(max), value=int(value), step=int(step))
+    selected = int(record_widget(label, selected, min=int(min), max=int(max), step=int(step)))
+    record_artifact("widget", widget="number_input", label=label, min=int(min), max=int(max), default=int(value),
+                    step=int(step), selected=selected)
+    return selected
@@ -0,0 +1,367 @@
+# blocks/components/util/artifacts.py
+"""
+Purpose
+-------
+Render-Artefakte einer generierten App festhalten (Karten-HTML, Bildbytes,
+Tabellen, Texte, Layout, Widget-Stände) und bei Reruns/Reloads wieder
+ausspielen, ohne EE-Code auszuführen. Payloads liegen inhaltsadressiert
+(SHA-1) im lokalen Cache; je Restore-Token ein Manifest mit der Reihenfolge.
+
+Contracts
+---------
+def capture(code_sha: str) -> ContextManager[Capture]
+def recording(target)                        -> Recorder | target
+def recording_builtins() -> dict
+def record_artifact(kind: str, payload: bytes | None = None, **opts) -> None
+def mark_unreplayable(reason: str) -> None
+def save_manifest(token: str, manifest: Manifest) -> None
+def load_manifest(token: str) -> Manifest | None
+def replay(manifest: Manifest, st_module, widgets: dict[str, Callable]) -> bool
+
+class Manifest(TypedDict): code_sha, code, replayable, reasons, items, created
+class Capture: manifest(code: str) -> Manifest
+
+Args
+----
+code_sha : Hash des ausgeführten Codes (Manifest gilt nur für genau diesen Code)
+token : zufälliges Restore-Token der App (app.py: ?app=…), bewusst nicht die
+        Agent-Session-ID – wer das Token kennt, sieht nur Code und Artefakte
+target : streamlit-Modul oder Container; innerhalb von capture() kommt ein
+         aufzeichnender Stellvertreter zurück, sonst target unverändert
+kind : "html" | "image" | "table" | "text" | "metric" | "widget" | "layout"
+payload : Bytes des Artefakts (HTML, PNG/GIF, Tabellen-JSON); None bei Text/Widget
+opts : Wiedergabe-Parameter (JSON-serialisierbar), z. B. height, caption
+reason : Grund, warum der Lauf nicht wiederspielbar ist (z. B. laufender Job)
+widgets : {"slider": ui_slider_int, "number_input": ui_number_input_int}
+
+Returns
+-------
+replay: True, wenn vollständig ausgespielt; False, wenn ein Widget inzwischen
+einen anderen Wert hat oder ein Payload fehlt (dann echter Lauf nötig).
+
+Side Effects
+------------
+Schreibt Payloads nach <cache_root>/artifacts (LRU, T2E_ARTIFACT_MAX_BYTES,
+Default 512 MB) und Manifeste nach <cache_root>/artifact_sessions.
+
+Notes
+-----
+- Aufgezeichnet werden Aufrufe über recording(st) (generierter Code, Panels)
+  sowie record_artifact()-Hooks der Komponenten (slim_map.to_streamlit,
+  ui_slider_int, ui_number_input_int). mark_unreplayable() für Ausgaben, die
+  sich beim nächsten Lauf ändern (ui_job_status, solange der Job läuft).
+- recording_builtins() als __builtins__ des exec-Namespace: "import streamlit as st"
+  im generierten Code liefert dann ebenfalls den Stellvertreter.
+- Nicht abbildbare Ausgaben (unbekannte st-Elemente, Sidebar, Charts) machen
+  das Manifest "nicht wiederspielbar"; dann läuft die App wie bisher.
+- st.empty()-Slots behalten nur ihren letzten Inhalt (progressive Frames).
+- Fortschrittsanzeigen/Spinner sind flüchtig und werden nicht aufgezeichnet.
+"""
+from __future__ import annotations
+
+import builtins
+import contextlib
+import contextvars
+import hashlib
+import io
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypedDict
+
+from .local_cache import load_bytes, load_json, save_bytes, save_json
+
+_NS_PAYLOAD = "artifacts"
+_NS_MANIFEST = "artifact_sessions"
+_DEFAULT_MAX_BYTES = 512 * 2**20
+
+_TEXT = ("markdown", "caption", "subheader", "header", "title", "text", "code", "latex",
+         "info", "success", "warning", "error")
+_TABLES = ("dataframe", "table")
+_LAYOUT = ("columns", "tabs", "container", "expander", "empty")
+_TRANSIENT = ("progress", "spinner", "toast")
+_NEUTRAL = ("session_state", "secrets", "cache_data", "cache_resource", "query_params",
+            "set_page_config", "rerun", "stop", "fragment")
+
+
+class Manifest(TypedDict):
+    code_sha: str
+    code: str
+    replayable: bool
+    reasons: List[str]
+    items: List[Dict[str, Any]]
+    created: float
+
+
+def _max_bytes() -> int:
+    try:
+        return int(os.environ.get("T2E_ARTIFACT_MAX_BYTES", _DEFAULT_MAX_BYTES))
+    except ValueError:
+        return _DEFAULT_MAX_BYTES
+
+
+def _serializable(v: Any) -> bool:
+    try:
+        json.dumps(v)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _jsonable(opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Nicht serialisierbare Werte verwerfen; in kwargs-Dicts nur die betroffenen Keys."""
+    out: Dict[str, Any] = {}
+    for k, v in opts.items():
+        if isinstance(v, dict):
+            out[k] = {kk: vv for kk, vv in v.items() if _serializable(vv)}
+        elif _serializable(v):
+            out[k] = v
+    return out
+
+
+class Capture:
+    """Sammelt Artefakte eines Laufs in Ausgabereihenfolge."""
+
+    def __init__(self, code_sha: str):
+        self.code_sha = code_sha
+        self.items: List[Dict[str, Any]] = []
+        self.reasons: List[str] = []
+        self.slot_stack: List[str] = []
+        self.empty_slots: set = set()
+        self.n_slots = 0
+
+    def current_slot(self) -> str:
+        return self.slot_stack[-1] if self.slot_stack else ""
+
+    def new_slot(self, empty: bool = False) -> str:
+        self.n_slots += 1
+        slot = f"s{self.n_slots}"
+        if empty:
+            self.empty_slots.add(slot)
+        return slot
+
+    def unreplayable(self, reason: str) -> None:
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def add(self, kind: str, payload: Optional[bytes], slot: Optional[str], **opts: Any) -> None:
+        slot = self.current_slot() if slot is None else slot
+        item: Dict[str, Any] = {"kind": kind, "slot": slot, "opts": _jsonable(opts)}
+        if set(item["opts"]) != set(opts):
+            self.unreplayable(f"{kind}: Argumente nicht serialisierbar")
+        if payload is not None:
+            digest = hashlib.sha1(payload).hexdigest()
+            if load_bytes(_NS_PAYLOAD, digest) is None:
+                save_bytes(_NS_PAYLOAD, digest, payload, max_bytes=_max_bytes())
+            item["hash"] = digest
+        if slot in self.empty_slots:  # st.empty(): nur der letzte Inhalt zählt
+            self.items = [it for it in self.items if it["slot"] != slot]
+        self.items.append(item)
+
+    def manifest(self, code: str) -> Manifest:
+        return {"code_sha": self.code_sha, "code": code, "replayable": not self.reasons,
+                "reasons": list(self.reasons), "items": list(self.items), "created": time.time()}
+
+
+_active: contextvars.ContextVar[Optional[Capture]] = contextvars.ContextVar("t2e_artifacts", default=None)
+
+
+@contextlib.contextmanager
+def capture(code_sha: str) -> Iterator[Capture]:
+    cap = Capture(code_sha)
+    token = _active.set(cap)
+    try:
+        yield cap
+    finally:
+        _active.reset(token)
+
+
+def record_artifact(kind: str, payload: Optional[bytes] = None, **opts: Any) -> None:
+    """Hook für Komponenten; ohne aktives capture() ein No-op."""
+    cap = _active.get()
+    if cap is not None:
+        cap.add(kind, payload, None, **opts)
+
+
+def mark_unreplayable(reason: str) -> None:
+    """Hook für Komponenten: dieser Lauf muss beim nächsten Rerun echt ausgeführt werden."""
+    cap = _active.get()
+    if cap is not None:
+        cap.unreplayable(reason)
+
+
+# --- Aufzeichnender Streamlit-Stellvertreter -----------------------------------
+def _image_payload(image: Any) -> Optional[bytes]:
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    if isinstance(image, io.BytesIO):
+        return image.getvalue()
+    try:
+        from PIL import Image
+        if not isinstance(image, Image.Image):
+            import numpy as np
+            if not isinstance(image, np.ndarray):
+                return None
+            image = Image.fromarray(image)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        return buf.getvalue()
+    except Exception:
+        return None
+
+
+def _table_payload(data: Any) -> Optional[bytes]:
+    try:
+        import pandas as pd
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        return df.to_json(orient="split", date_format="iso").encode("utf-8")
+    except Exception:
+        return None
+
+
+class Recorder:
+    """Leitet an target weiter und zeichnet abbildbare Ausgaben auf."""
+
+    def __init__(self, target: Any, cap: Capture, slot: Optional[str] = None):
+        self._target = target
+        self._cap = cap
+        self._slot = slot  # None = aktueller Slot (with-Block), sonst fester Container
+
+    def __enter__(self):
+        self._cap.slot_stack.append(self._slot or "")
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any):
+        self._cap.slot_stack.pop()
+        return self._target.__exit__(*exc)
+
+    def _layout(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            made = fn(*args, **kwargs)
+            many = isinstance(made, (list, tuple))
+            slots = [self._cap.new_slot(empty=name == "empty") for _ in (made if many else [made])]
+            self._cap.add("layout", None, self._slot, method=name, args=list(args), kwargs=kwargs, ids=slots)
+            wrapped = [Recorder(m, self._cap, s) for m, s in zip(made if many else [made], slots)]
+            return wrapped if many else wrapped[0]
+        return call
+
+    def _element(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            out = fn(*args, **kwargs)
+            body = args[0] if args else kwargs.get("body", kwargs.get("image", kwargs.get("data")))
+            if name in _TEXT and isinstance(body, str):
+                self._cap.add("text", None, self._slot, method=name, args=[body],
+                              kwargs={k: v for k, v in kwargs.items() if k != "body"})
+            elif name == "metric":
+                self._cap.add("metric", None, self._slot, args=[str(a) for a in args], kwargs=kwargs)
+            elif name == "image":
+                self._image(body, {k: v for k, v in kwargs.items() if k != "image"})
+            elif name in _TABLES:
+                self._table(name, body, {k: v for k, v in kwargs.items() if k != "data"})
+            elif name == "write" and args and all(isinstance(a, str) for a in args):
+                self._cap.add("text", None, self._slot, method="markdown", args=[" ".join(args)], kwargs={})
+            elif name == "write" and len(args) == 1 and not kwargs:
+                self._table("dataframe", args[0], {})
+            else:
+                self._cap.unreplayable(f"st.{name}")
+            return out
+        return call
+
+    def _image(self, image: Any, kwargs: Dict[str, Any]) -> None:
+        if isinstance(image, str):  # URL/Pfad
+            self._cap.add("image", None, self._slot, src=image, kwargs=kwargs)
+            return
+        payload = _image_payload(image)
+        if payload is None:
+            self._cap.unreplayable("st.image")
+        else:
+            self._cap.add("image", payload, self._slot, kwargs=kwargs)
+
+    def _table(self, method: str, data: Any, kwargs: Dict[str, Any]) -> None:
+        payload = _table_payload(data)
+        if payload is None:
+            self._cap.unreplayable(f"st.{method}")
+        else:
+            self._cap.add("table", payload, self._slot, method=method, kwargs=kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name in _NEUTRAL or name in _TRANSIENT or name.startswith("_"):
+            return attr
+        if name in _LAYOUT:
+            return self._layout(name, attr)
+        if name in _TEXT or name in _TABLES or name in ("image", "metric", "write"):
+            return self._element(name, attr)
+        self._cap.unreplayable(f"st.{name}")  # Sidebar, Charts, rohe Widgets …
+        return attr
+
+
+def recording(target: Any) -> Any:
+    cap = _active.get()
+    return Recorder(target, cap) if cap is not None else target
+
+
+def recording_builtins() -> Dict[str, Any]:
+    """builtins mit __import__-Hook: streamlit-Importe im exec-Code werden aufgezeichnet."""
+    def _import(name: str, globals=None, locals=None, fromlist=(), level: int = 0) -> Any:
+        mod = builtins.__import__(name, globals, locals, fromlist, level)
+        cap = _active.get()
+        if cap is None or level != 0 or name.split(".")[0] != "streamlit":
+            return mod
+        if name == "streamlit" and not fromlist:
+            return Recorder(mod, cap)
+        cap.unreplayable(f"import {name}")  # from streamlit import … / Untermodule
+        return mod
+    return {**builtins.__dict__, "__import__": _import}
+
+
+# --- Persistenz / Wiedergabe ---------------------------------------------------
+def save_manifest(token: str, manifest: Manifest) -> None:
+    save_json(_NS_MANIFEST, token, manifest)
+
+
+def load_manifest(token: str) -> Optional[Manifest]:
+    data = load_json(_NS_MANIFEST, token)
+    return data if isinstance(data, dict) and data.get("items") is not None else None
+
+
+def replay(manifest: Manifest, st_module: Any, widgets: Dict[str, Callable[..., Any]]) -> bool:
+    """Artefakte in Originalreihenfolge ausspielen; False → echter Lauf nötig."""
+    payloads: Dict[str, bytes] = {}
+    for it in manifest["items"]:  # erst prüfen, dann rendern (keine halbe Wiedergabe)
+        if "hash" in it and it["hash"] not in payloads:
+            data = load_bytes(_NS_PAYLOAD, it["hash"])
+            if data is None:
+                return False
+            payloads[it["hash"]] = data
+        if it["kind"] == "widget" and it["opts"].get("widget") not in widgets:
+            return False
+
+    slots: Dict[str, Any] = {}
+    for it in manifest["items"]:
+        target = slots.get(it["slot"], st_module)
+        in_target = target if target is not st_module else contextlib.nullcontext()
+        kind, o = it["kind"], it["opts"]
+        payload = payloads.get(it.get("hash", ""))
+        if kind == "layout":
+            made = getattr(target, o["method"])(*o.get("args", []), **o.get("kwargs", {}))
+            slots.update(zip(o["ids"], made if isinstance(made, (list, tuple)) else [made]))
+        elif kind == "widget":
+            with in_target:
+                value = widgets[o["widget"]](o["label"], o["min"], o["max"], o["default"], o["step"])
+            if value != o["selected"]:
+                return False
+        elif kind == "html":
+            import streamlit.components.v1 as components
+            with in_target:
+                components.html(payload.decode("utf-8"), height=o.get("height"), width=o.get("width"),
+                                scrolling=bool(o.get("scrolling", False)))
+        elif kind == "image":
+            target.image(payload if payload is not None else o["src"], **o.get("kwargs", {}))
+        elif kind == "table":
+            import pandas as pd
+            getattr(target, o["method"])(pd.read_json(io.BytesIO(payload), orient="split"), **o.get("kwargs", {}))
+        elif kind in ("text", "metric"):
+            getattr(target, o.get("method", "metric"))(*o.get("args", []), **o.get("kwargs", {}))
+    return True
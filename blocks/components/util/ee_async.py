@@ -0,0 +1,276 @@
+# blocks/components/util/ee_async.py
+"""
+Purpose
+-------
+Nebenläufige Earth-Engine-Aufrufe als Futures (getInfo, getMapId, Thumbnail-URLs):
+- Prozessweiter Worker-Pool (geteilt von allen Streamlit-Sessions)
+- Gemeinsamer Token-Bucket (Requests/s über den ganzen Prozess)
+- Exponentielles Backoff mit Jitter bei Quota-/Transient-Fehlern (429, 503, ...)
+- Fairness: je Session eine Warteschlange, Worker bedienen Sessions reihum
+  (eine Session mit 200 Kachel-Requests blockiert die Karte der anderen nicht)
+
+Contracts
+---------
+def ee_async(obj: ee.ComputedObject, method: str = "getInfo", *args,
+             session: str | None = None, retries: int | None = None,
+             priority: str | None = None, **kwargs) -> Future
+def submit(fn: Callable, *args, session: str | None = None, retries: int | None = None,
+           priority: str | None = None, **kwargs) -> Future
+def gather(*items, method: str = "getInfo", timeout: float | None = None,
+           return_exceptions: bool = False, session: str | None = None) -> list
+def background() -> ContextManager[None]
+def in_background() -> bool
+def in_worker() -> bool
+def current_session() -> str
+def is_quota_error(err: BaseException) -> bool
+
+Args
+----
+obj : EE-Objekt; method wird im Worker als obj.<method>(*args, **kwargs) aufgerufen
+      (z. B. "getInfo", "getMapId", "getThumbURL", "getVideoThumbURL")
+fn : beliebige Funktion mit EE-/HTTP-Aufrufen (z. B. thumb_cache.fetch_thumb)
+session : Fairness-Schlüssel (Default: Streamlit-Session-ID, sonst "default")
+retries : Wiederholungen bei Quota-/Transient-Fehlern (Default: T2E_EE_RETRIES)
+priority : "normal" | "low" (Default: "low" innerhalb von background(), sonst "normal")
+items : EE-Objekte und/oder Futures; EE-Objekte werden mit method gestartet
+timeout : Gesamt-Timeout in s für gather
+return_exceptions : Fehler als Ergebnis statt Raise (wie asyncio.gather)
+
+Returns
+-------
+concurrent.futures.Future bzw. Ergebnisliste in Reihenfolge der items.
+
+Side Effects
+------------
+Startet beim ersten Aufruf Daemon-Threads (T2E_EE_WORKERS, Default 8).
+
+Notes
+-----
+- Rate: T2E_EE_QPS (Default 10/s), Burst T2E_EE_BURST (Default 20).
+- Backoff: "full jitter", zufällig in [0, min(30 s, 0.5 s · 2^Versuch)]. Ein
+  Quota-Fehler leert zusätzlich den Bucket, damit alle Sessions kurz bremsen.
+- Die Session-ID wird beim Einreichen (im Script-Thread) bestimmt; Worker
+  rufen keine Streamlit-APIs auf.
+- fn läuft in einer Kopie des contextvars-Kontexts des Einreichers
+  (z. B. widget_memo-Scope des Fragments).
+- Niedrige Priorität (Prefetch): Worker nehmen low-Tasks nur, wenn keine normale
+  Arbeit wartet, höchstens T2E_EE_LOW_WORKERS gleichzeitig (Default Worker/4),
+  und nur solange der Bucket mehr als halb voll ist (Reserve für Interaktion).
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Deque, Iterator, List, Optional, Tuple
+
+import ee
+
+_DEFAULT_SESSION = "default"
+_QUOTA_MARKERS = ("429", "too many requests", "too many concurrent", "rate limit", "quota",
+                  "resource_exhausted")
+_TRANSIENT_MARKERS = ("503", "backend error", "unavailable", "connection", "reset by peer",
+                      "temporarily")
+_BACKOFF_BASE_S = 0.5
+_BACKOFF_MAX_S = 30.0
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return float(default)
+
+
+def _matches(err: BaseException, markers: Tuple[str, ...]) -> bool:
+    msg = str(err).lower()
+    return any(m in msg for m in markers)
+
+
+def is_quota_error(err: BaseException) -> bool:
+    return _matches(err, _QUOTA_MARKERS)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = max(float(rate), 1e-3)
+        self.capacity = max(float(burst), 1.0)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, reserve: float = 0.0) -> None:
+        """Ein Token nehmen; reserve Tokens bleiben für andere Aufrufer im Bucket."""
+        need = 1.0 + min(float(reserve), self.capacity - 1.0)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= need:
+                    self.tokens -= 1.0
+                    return
+                wait_s = (need - self.tokens) / self.rate
+            time.sleep(wait_s)
+
+    def drain(self) -> None:
+        with self.lock:
+            self.tokens = 0.0
+            self.stamp = time.monotonic()
+
+
+Task = Tuple[Future, Callable[..., Any], tuple, dict, int, bool]  # (..., retries, low)
+
+
+class _FairPool:
+    """Worker-Threads, die Session-Warteschlangen reihum abarbeiten."""
+
+    def __init__(self, workers: int, low_workers: int):
+        self.workers = max(1, int(workers))
+        self.low_workers = max(1, min(self.workers, int(low_workers)))
+        self.low_running = 0
+        self.cv = threading.Condition()
+        self.queues: "OrderedDict[str, Deque[Task]]" = OrderedDict()
+        self.low_queues: "OrderedDict[str, Deque[Task]]" = OrderedDict()
+        self.threads: List[threading.Thread] = []
+
+    def put(self, session: str, task: Task) -> None:
+        with self.cv:
+            queues = self.low_queues if task[5] else self.queues
+            queues.setdefault(session, deque()).append(task)
+            if len(self.threads) < self.workers:
+                t = threading.Thread(target=self._loop, name=f"ee-async-{len(self.threads)}", daemon=True)
+                self.threads.append(t)
+                t.start()
+            self.cv.notify()
+
+    def _take(self) -> Task:
+        with self.cv:
+            while not self.queues and not (self.low_queues and self.low_running < self.low_workers):
+                self.cv.wait()
+            queues = self.queues or self.low_queues  # low nur, wenn nichts Normales wartet
+            session, queue = next(iter(queues.items()))
+            task = queue.popleft()
+            if queue:
+                queues.move_to_end(session)  # nächste Session ist dran
+            else:
+                del queues[session]
+            if task[5]:
+                self.low_running += 1
+            return task
+
+    def _done_low(self) -> None:
+        with self.cv:
+            self.low_running -= 1
+            self.cv.notify()
+
+    def _loop(self) -> None:
+        _worker.active = True
+        while True:
+            fut, fn, args, kwargs, retries, low = self._take()
+            try:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    fut.set_result(_call_with_backoff(fn, args, kwargs, retries, low))
+                except BaseException as e:
+                    fut.set_exception(e)
+            finally:
+                if low:
+                    self._done_low()
+
+
+_bucket = _TokenBucket(_env_number("T2E_EE_QPS", 10), _env_number("T2E_EE_BURST", 20))
+_pool = _FairPool(int(_env_number("T2E_EE_WORKERS", 8)),
+                  int(_env_number("T2E_EE_LOW_WORKERS", max(1, int(_env_number("T2E_EE_WORKERS", 8)) // 4))))
+_RETRIES = int(_env_number("T2E_EE_RETRIES", 5))
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("t2e_ee_priority", default="normal")
+_worker = threading.local()
+
+
+def _call_with_backoff(fn: Callable[..., Any], args: tuple, kwargs: dict, retries: int,
+                       low: bool = False) -> Any:
+    attempt = 0
+    while True:
+        _bucket.acquire(reserve=_bucket.capacity / 2 if low else 0.0)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            quota = is_quota_error(e)
+            if attempt >= retries or not (quota or _matches(e, _TRANSIENT_MARKERS)):
+                raise
+            if quota:
+                _bucket.drain()
+            time.sleep(random.uniform(0.0, min(_BACKOFF_MAX_S, _BACKOFF_BASE_S * 2 ** attempt)))
+            attempt += 1
+
+
+def current_session() -> str:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return _DEFAULT_SESSION
+    return getattr(ctx, "session_id", None) or _DEFAULT_SESSION
+
+
+@contextlib.contextmanager
+def background() -> Iterator[None]:
+    """Alle submit()-Aufrufe im Block (auch verschachtelte) mit niedriger Priorität."""
+    token = _priority.set("low")
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def in_background() -> bool:
+    """True innerhalb von background() (Prefetch): nur Caches füllen, nichts Teures anstoßen."""
+    return _priority.get() == "low"
+
+
+def in_worker() -> bool:
+    """True in einem Pool-Worker (dort nicht erneut submitten und warten → Deadlock)."""
+    return bool(getattr(_worker, "active", False))
+
+
+def submit(fn: Callable[..., Any], *args: Any, session: Optional[str] = None,
+           retries: Optional[int] = None, priority: Optional[str] = None, **kwargs: Any) -> Future:
+    """fn(*args, **kwargs) im geteilten Pool ausführen (rate-limitiert, mit Backoff)."""
+    fut: Future = Future()
+    n = _RETRIES if retries is None else int(retries)
+    low = (priority or _priority.get()) == "low"
+    ctx = contextvars.copy_context()
+    _pool.put(session or current_session(), (fut, ctx.run, (fn, *args), kwargs, n, low))
+    return fut
+
+
+def ee_async(obj: ee.ComputedObject, method: str = "getInfo", *args: Any,
+             session: Optional[str] = None, retries: Optional[int] = None,
+             priority: Optional[str] = None, **kwargs: Any) -> Future:
+    """obj.<method>(*args, **kwargs) als Future, z. B. ee_async(img, "getMapId", vis)."""
+    return submit(getattr(obj, method), *args, session=session, retries=retries, priority=priority, **kwargs)
+
+
+def gather(*items: Any, method: str = "getInfo", timeout: Optional[float] = None,
+           return_exceptions: bool = False, session: Optional[str] = None) -> List[Any]:
+    """Alle items nebenläufig auflösen; Ergebnisse in Eingabereihenfolge."""
+    session = session or current_session()
+    futures = [it if isinstance(it, Future) else ee_async(it, method, session=session) for it in items]
+    done, pending = wait(futures, timeout=timeout)
+    if pending:
+        for f in pending:
+            f.cancel()
+        raise TimeoutError(f"{len(pending)} of {len(futures)} EE requests did not finish in {timeout} s")
+    out: List[Any] = []
+    for f in futures:
+        err = f.exception()
+        if err is not None and not return_exceptions:
+            raise err
+        out.append(err if err is not None else f.result())
+    return out
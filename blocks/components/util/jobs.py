@@ -0,0 +1,556 @@
+# blocks/components/util/jobs.py
+"""
+Purpose
+-------
+Hintergrund-Jobs für lange Analysen (Timelapse-GIFs, Reduktionen großer AOIs,
+mehrjährige Reihen): SQLite-Warteschlange plus lokale Worker-Prozesse. Ein Job
+läuft unabhängig von der Streamlit-Session weiter (Rerun, Reload, Disconnect),
+meldet Fortschritt, hält Zwischenstände für einen Neustart fest und übergibt
+das Ergebnis an die UI (ui/job_status.py).
+
+Contracts
+---------
+def submit_job(target: str, params: dict | None = None, owner: str | None = None,
+               autostart: bool = True) -> str | None
+def get_job(job_id: str) -> JobInfo | None
+def list_jobs(owner: str | None = None, limit: int = 20) -> list[JobInfo]
+def job_result(job_id: str) -> Any | None
+def cancel_job(job_id: str) -> bool
+def wait_job(job_id: str, timeout: float | None = None, poll_s: float = 1.0) -> JobInfo | None
+def job_owner(owner: str) -> ContextManager[None]
+def report_progress(fraction: float, message: str = "") -> None
+def in_job() -> bool
+def job_state(name: str, default: Any = None) -> Any
+def save_job_state(name: str, value: Any) -> None
+def configure_workers(env: dict[str, str] | None = None) -> None
+def ensure_workers(n: int | None = None) -> int
+def run_worker(once: bool = False, idle_s: float | None = None) -> int
+
+class JobInfo(TypedDict): id, target, owner, status, progress, message, error,
+                          attempts, created, updated
+class JobCancelled(Exception)
+
+Args
+----
+target : "modul:funktion" unterhalb von T2E_JOB_MODULES (Default "blocks.components."),
+         z. B. "blocks.components.gee.reduce_tiled:tiled_reduce_region"
+params : Keyword-Argumente der Funktion; JSON-Werte und EE-Objekte (werden
+         serialisiert und im Worker wieder als ee.Image/ee.Geometry/... gebaut)
+owner : Zuordnung für die UI (Default: job_owner()-Scope, sonst Streamlit-Session)
+fraction, message : Fortschritt 0..1 und Kurztext (aus Komponenten gemeldet)
+name, value : Zwischenstand je Komponente (JSON-serialisierbar)
+env : zusätzliche Umgebung für Worker (z. B. T2E_EE_SERVICE_ACCOUNT/-PROJECT/-PRIVATE_KEY)
+n : Soll-Anzahl Worker (Default T2E_JOB_WORKERS, 2)
+
+Returns
+-------
+Job-ID (gleicher target/params-Aufruf → dieselbe ID, solange der Job wartet,
+läuft oder sein Ergebnis vorliegt; None im Prefetch ohne vorhandenen Job),
+Job-Status bzw. Ergebnis (bytes, JSON-Wert oder pandas.DataFrame, wie von der
+Job-Funktion geliefert).
+
+Side Effects
+------------
+SQLite-Datei T2E_JOBS_DB (Default <cache_root>/jobs.sqlite, WAL-Modus);
+Ergebnisse unter <cache_root>/job_results (LRU, T2E_JOB_RESULT_MAX_BYTES,
+Default 1 GB); Worker-Prozesse "python -m blocks.components.util.jobs" mit
+Log unter <cache_root>/job_logs.
+
+Notes
+-----
+- Ein Worker bearbeitet einen Job zur Zeit; Parallelität innerhalb des Jobs
+  kommt aus util/ee_async.py (Rate-Limit und Backoff gelten auch dort).
+- Heartbeat alle 5 s. Jobs eines abgestürzten Workers (Heartbeat älter als
+  T2E_JOB_STALE_S, Default 60 s) übernimmt ein anderer Worker, höchstens
+  T2E_JOB_MAX_ATTEMPTS Versuche (Default 3). job_state() liefert dann den
+  zuletzt gespeicherten Zwischenstand (z. B. fertige Kacheln in reduce_tiled).
+- report_progress/job_state/save_job_state sind außerhalb eines Jobs No-ops,
+  Komponenten funktionieren inline unverändert.
+- Abbruch: cancel_job setzt ein Flag; der nächste report_progress() im Job löst
+  JobCancelled aus.
+- Im Prefetch (ee_async.background(), util/widget_prefetch.py) legt submit_job
+  keine Jobs an und startet keine Worker; es liefert nur einen vorhandenen Job.
+- Worker beenden sich nach T2E_JOB_WORKER_IDLE_S (Default 600 s) ohne Arbeit;
+  submit_job startet fehlende Worker nach.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import importlib
+import json
+import os
+import pathlib
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypedDict
+
+import ee
+
+from .ee_async import current_session, in_background
+from .local_cache import cache_dir, cache_root, load_bytes, save_bytes, stable_key
+
+_NS_RESULT = "job_results"
+_DEFAULT_WORKERS = 2
+_DEFAULT_STALE_S = 60.0
+_DEFAULT_IDLE_S = 600.0
+_DEFAULT_MAX_ATTEMPTS = 3
+_DEFAULT_RESULT_MAX_BYTES = 1024 * 2**20
+_DEFAULT_KEEP_DAYS = 7.0
+_HEARTBEAT_S = 5.0
+_POLL_S = 1.0
+_PROGRESS_MIN_S = 0.5
+_REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY, key TEXT NOT NULL, target TEXT NOT NULL, params TEXT NOT NULL,
+    owner TEXT NOT NULL, status TEXT NOT NULL, progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '', state TEXT NOT NULL DEFAULT '{}',
+    result_kind TEXT NOT NULL DEFAULT '', error TEXT NOT NULL DEFAULT '',
+    attempts INTEGER NOT NULL DEFAULT 0, cancel INTEGER NOT NULL DEFAULT 0,
+    worker TEXT NOT NULL DEFAULT '', created REAL NOT NULL, updated REAL NOT NULL,
+    heartbeat REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY, host TEXT NOT NULL, pid INTEGER NOT NULL,
+    started REAL NOT NULL, heartbeat REAL NOT NULL
+);
+"""
+
+
+class JobInfo(TypedDict):
+    id: str
+    target: str
+    owner: str
+    status: str  # queued | running | done | failed | cancelled
+    progress: float
+    message: str
+    error: str
+    attempts: int
+    created: float
+    updated: float
+
+
+class JobCancelled(Exception):
+    """Im Job ausgelöst (report_progress), nachdem cancel_job() angefordert wurde."""
+
+
+class _Running:
+    def __init__(self, job_id: str, state: Dict[str, Any]):
+        self.job_id = job_id
+        self.state = state
+        self.cancel = threading.Event()
+        self.last_write = 0.0
+
+
+_current: contextvars.ContextVar[Optional[_Running]] = contextvars.ContextVar("t2e_job", default=None)
+_owner: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("t2e_job_owner", default=None)
+_init_lock = threading.Lock()
+_initialized: set = set()
+_spawn_lock = threading.Lock()
+_spawned: List[subprocess.Popen] = []
+_worker_env: Dict[str, str] = {}
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _db_path() -> pathlib.Path:
+    return pathlib.Path(os.environ.get("T2E_JOBS_DB") or cache_root() / "jobs.sqlite")
+
+
+@contextlib.contextmanager
+def _db() -> Iterator[sqlite3.Connection]:
+    path = str(_db_path())
+    conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)  # autocommit, BEGIN explizit
+    conn.row_factory = sqlite3.Row
+    try:
+        with _init_lock:
+            if path not in _initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                _initialized.add(path)
+        yield conn
+    finally:
+        conn.close()
+
+
+# --- Parameter: JSON + EE-Objekte ----------------------------------------------
+def _encode(value: Any) -> Any:
+    if isinstance(value, ee.ComputedObject):
+        return {"__ee__": ee.serializer.toJSON(value), "type": value.name()}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"job parameter not serializable: {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "__ee__" in value:
+            obj = ee.deserializer.fromJSON(value["__ee__"])
+            cls = getattr(ee, str(value.get("type") or ""), None)
+            if isinstance(cls, type) and issubclass(cls, ee.ComputedObject) and cls is not ee.ComputedObject:
+                return cls(obj)  # ee.Image(obj), ee.Geometry(obj), … → volle Methoden-API
+            return obj
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def _check_target(target: str) -> None:
+    module, _, attr = str(target).partition(":")
+    prefixes = tuple(p.strip() for p in os.environ.get("T2E_JOB_MODULES", "blocks.components.").split(",")
+                     if p.strip())
+    if not module or not attr or not module.startswith(prefixes):
+        raise ValueError(f"Invalid job target {target!r} (expected 'module:function' below {prefixes})")
+
+
+def _resolve(target: str) -> Callable[..., Any]:
+    _check_target(target)
+    module, _, attr = target.partition(":")
+    fn: Any = importlib.import_module(module)
+    for part in attr.split("."):
+        fn = getattr(fn, part)
+    return fn
+
+
+# --- Ergebnisse ------------------------------------------------------------------
+def _result_max_bytes() -> int:
+    return int(_env_number("T2E_JOB_RESULT_MAX_BYTES", _DEFAULT_RESULT_MAX_BYTES))
+
+
+def _save_result(job_id: str, result: Any) -> str:
+    if isinstance(result, (bytes, bytearray)):
+        kind, data = "bytes", bytes(result)
+    elif hasattr(result, "to_json") and hasattr(result, "columns"):  # pandas.DataFrame
+        kind, data = "table", result.to_json(orient="split").encode("utf-8")
+    else:
+        kind, data = "json", json.dumps(result, ensure_ascii=False).encode("utf-8")
+    save_bytes(_NS_RESULT, job_id, data, max_bytes=_result_max_bytes())
+    return kind
+
+
+def _has_result(job_id: str) -> bool:
+    return (cache_dir(_NS_RESULT) / f"{job_id}.bin").exists()
+
+
+def _info(row: sqlite3.Row) -> JobInfo:
+    return {"id": row["id"], "target": row["target"], "owner": row["owner"], "status": row["status"],
+            "progress": float(row["progress"]), "message": row["message"], "error": row["error"],
+            "attempts": int(row["attempts"]), "created": float(row["created"]),
+            "updated": float(row["updated"])}
+
+
+# --- API für App / UI --------------------------------------------------------------
+@contextlib.contextmanager
+def job_owner(owner: str) -> Iterator[None]:
+    """submit_job() im Block ordnet Jobs owner zu (z. B. agent_session_id, überlebt Reloads)."""
+    token = _owner.set(str(owner))
+    try:
+        yield
+    finally:
+        _owner.reset(token)
+
+
+def submit_job(target: str, params: Optional[Dict[str, Any]] = None, owner: Optional[str] = None,
+               autostart: bool = True) -> Optional[str]:
+    """Job einreihen (oder vorhandenen gleichen Job wiederverwenden); liefert die Job-ID."""
+    _check_target(target)
+    encoded = json.dumps(_encode(dict(params or {})), sort_keys=True, ensure_ascii=False)
+    key = stable_key("job", target, encoded)
+    now = time.time()
+    with _db() as db:
+        db.execute("BEGIN IMMEDIATE")
+        rows = db.execute("SELECT id, status FROM jobs WHERE key = ? AND status IN ('queued', 'running', 'done') "
+                          "ORDER BY created DESC", (key,)).fetchall()
+        job_id = next((r["id"] for r in rows if r["status"] != "done" or _has_result(r["id"])), None)
+        if job_id is None and in_background():  # Prefetch von Nachbarwerten: keine neuen Jobs
+            db.execute("COMMIT")
+            return None
+        if job_id is None:
+            job_id = uuid.uuid4().hex
+            db.execute("INSERT INTO jobs (id, key, target, params, owner, status, created, updated) "
+                       "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                       (job_id, key, target, encoded, owner or _owner.get() or current_session(), now, now))
+        db.execute("COMMIT")
+    if autostart and not in_background():
+        ensure_workers()
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[JobInfo]:
+    with _db() as db:
+        row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _info(row) if row is not None else None
+
+
+def list_jobs(owner: Optional[str] = None, limit: int = 20) -> List[JobInfo]:
+    """Neueste Jobs zuerst, optional nur eines owners."""
+    with _db() as db:
+        if owner is None:
+            rows = db.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (int(limit),)).fetchall()
+        else:
+            rows = db.execute("SELECT * FROM jobs WHERE owner = ? ORDER BY created DESC LIMIT ?",
+                              (owner, int(limit))).fetchall()
+    return [_info(r) for r in rows]
+
+
+def job_result(job_id: str) -> Any:
+    """Ergebnis eines fertigen Jobs; None, solange er läuft, bei Fehler oder nach Eviction."""
+    with _db() as db:
+        row = db.execute("SELECT status, result_kind FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None or row["status"] != "done":
+        return None
+    data = load_bytes(_NS_RESULT, job_id)
+    if data is None:
+        return None
+    if row["result_kind"] == "bytes":
+        return data
+    if row["result_kind"] == "table":
+        import io
+        import pandas as pd
+        return pd.read_json(io.BytesIO(data), orient="split")
+    return json.loads(data.decode("utf-8"))
+
+
+def cancel_job(job_id: str) -> bool:
+    """Wartende Jobs sofort abbrechen, laufende beim nächsten report_progress()."""
+    now = time.time()
+    with _db() as db:
+        cur = db.execute("UPDATE jobs SET status = 'cancelled', updated = ? WHERE id = ? AND status = 'queued'",
+                         (now, job_id))
+        if cur.rowcount:
+            return True
+        cur = db.execute("UPDATE jobs SET cancel = 1, updated = ? WHERE id = ? AND status = 'running'",
+                         (now, job_id))
+    return bool(cur.rowcount)
+
+
+def wait_job(job_id: str, timeout: Optional[float] = None, poll_s: float = 1.0) -> Optional[JobInfo]:
+    """Blockiert bis zum Endstatus (Skripte/Tests); liefert den letzten Status."""
+    deadline = None if timeout is None else time.monotonic() + float(timeout)
+    while True:
+        info = get_job(job_id)
+        if info is None or info["status"] in ("done", "failed", "cancelled"):
+            return info
+        if deadline is not None and time.monotonic() >= deadline:
+            return info
+        time.sleep(poll_s)
+
+
+# --- Hooks für Komponenten (im Job-Prozess) -----------------------------------
+def in_job() -> bool:
+    return _current.get() is not None
+
+
+def report_progress(fraction: float, message: str = "") -> None:
+    """Fortschritt 0..1 melden (gedrosselt); außerhalb eines Jobs ein No-op."""
+    job = _current.get()
+    if job is None:
+        return
+    if job.cancel.is_set():
+        raise JobCancelled(job.job_id)
+    frac = min(1.0, max(0.0, float(fraction)))
+    now = time.monotonic()
+    if frac < 1.0 and now - job.last_write < _PROGRESS_MIN_S:
+        return
+    job.last_write = now
+    with _db() as db:
+        db.execute("UPDATE jobs SET progress = ?, message = ?, updated = ? WHERE id = ?",
+                   (frac, str(message)[:500], time.time(), job.job_id))
+
+
+def job_state(name: str, default: Any = None) -> Any:
+    """Zuletzt gespeicherter Zwischenstand (nach Worker-Absturz beim erneuten Versuch)."""
+    job = _current.get()
+    return default if job is None else job.state.get(name, default)
+
+
+def save_job_state(name: str, value: Any) -> None:
+    job = _current.get()
+    if job is None:
+        return
+    job.state[name] = value
+    with _db() as db:
+        db.execute("UPDATE jobs SET state = ?, updated = ? WHERE id = ?",
+                   (json.dumps(job.state, ensure_ascii=False), time.time(), job.job_id))
+
+
+# --- Worker-Prozesse ------------------------------------------------------------
+def configure_workers(env: Optional[Dict[str, str]] = None) -> None:
+    """Zusätzliche Umgebung für künftig gestartete Worker (z. B. EE-Credentials aus den Secrets)."""
+    with _spawn_lock:
+        _worker_env.update({str(k): str(v) for k, v in (env or {}).items()})
+
+
+def _alive_workers() -> int:
+    stale = time.time() - _env_number("T2E_JOB_STALE_S", _DEFAULT_STALE_S)
+    with _db() as db:
+        rows = db.execute("SELECT host, pid FROM workers WHERE heartbeat >= ?", (stale,)).fetchall()
+    registered = {(r["host"], int(r["pid"])) for r in rows}
+    host = socket.gethostname()
+    starting = {(host, p.pid) for p in _spawned if p.poll() is None} - registered  # noch in der EE-Init
+    return len(registered) + len(starting)
+
+
+def _spawn() -> None:
+    log_dir = cache_root() / "job_logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with open(log_dir / f"worker-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.log", "ab") as log:
+        proc = subprocess.Popen([sys.executable, "-m", "blocks.components.util.jobs"], cwd=str(_REPO_ROOT),
+                                env={**os.environ, **_worker_env}, stdin=subprocess.DEVNULL, stdout=log,
+                                stderr=subprocess.STDOUT, start_new_session=True)
+    _spawned.append(proc)
+
+
+def ensure_workers(n: Optional[int] = None) -> int:
+    """Fehlende Worker-Prozesse starten; liefert die Anzahl neu gestarteter Prozesse."""
+    want = int(_env_number("T2E_JOB_WORKERS", _DEFAULT_WORKERS)) if n is None else int(n)
+    with _spawn_lock:
+        _spawned[:] = [p for p in _spawned if p.poll() is None]
+        missing = max(0, want - _alive_workers())
+        for _ in range(missing):
+            _spawn()
+    return missing
+
+
+def _ee_initialize() -> None:
+    """EE im Worker: Service-Account aus der Umgebung (configure_workers), sonst Host/ADC."""
+    email = os.environ.get("T2E_EE_SERVICE_ACCOUNT")
+    key = os.environ.get("T2E_EE_PRIVATE_KEY")
+    project = os.environ.get("T2E_EE_PROJECT") or None
+    if email and key:
+        ee.Initialize(credentials=ee.ServiceAccountCredentials(email=email, key_data=key), project=project)
+    else:
+        ee.Initialize(project=project)
+
+
+def _claim(worker: str) -> Optional[sqlite3.Row]:
+    now = time.time()
+    stale = now - _env_number("T2E_JOB_STALE_S", _DEFAULT_STALE_S)
+    max_attempts = int(_env_number("T2E_JOB_MAX_ATTEMPTS", _DEFAULT_MAX_ATTEMPTS))
+    with _db() as db:
+        db.execute("BEGIN IMMEDIATE")
+        db.execute("UPDATE jobs SET status = 'cancelled', updated = ? "
+                   "WHERE status = 'running' AND heartbeat < ? AND cancel = 1", (now, stale))
+        db.execute("UPDATE jobs SET status = 'failed', error = 'worker lost (max attempts reached)', updated = ? "
+                   "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?", (now, stale, max_attempts))
+        row = db.execute("SELECT * FROM jobs WHERE (status = 'queued' AND cancel = 0) "
+                         "OR (status = 'running' AND heartbeat < ?) ORDER BY created LIMIT 1", (stale,)).fetchone()
+        if row is not None:  # verwaiste Jobs eines abgestürzten Workers werden fortgesetzt
+            db.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, heartbeat = ?, "
+                       "updated = ? WHERE id = ?", (worker, now, now, row["id"]))
+        db.execute("COMMIT")
+    return row
+
+
+def _touch_worker(worker: str, started: Optional[float] = None) -> None:
+    now = time.time()
+    host, _, pid = worker.rpartition(":")
+    with _db() as db:
+        if started is not None:
+            db.execute("INSERT OR REPLACE INTO workers (name, host, pid, started, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                       (worker, host, int(pid), started, now))
+        else:
+            db.execute("UPDATE workers SET heartbeat = ? WHERE name = ?", (now, worker))
+
+
+def _heartbeat(job: _Running, worker: str, stop: threading.Event) -> None:
+    while not stop.wait(_HEARTBEAT_S):
+        try:
+            with _db() as db:
+                db.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ?", (time.time(), job.job_id, worker))
+                row = db.execute("SELECT cancel FROM jobs WHERE id = ?", (job.job_id,)).fetchone()
+            if row is not None and row["cancel"]:
+                job.cancel.set()
+            _touch_worker(worker)
+        except sqlite3.Error:
+            pass
+
+
+def _finish(job_id: str, worker: str, status: str, **fields: Any) -> None:
+    cols = {"status": status, "updated": time.time(), **fields}
+    assignments = ", ".join(f"{k} = ?" for k in cols)
+    with _db() as db:  # nur, wenn der Job nicht inzwischen einem anderen Worker gehört
+        db.execute(f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = 'running'",
+                   (*cols.values(), job_id, worker))
+
+
+def _execute(row: sqlite3.Row, worker: str) -> None:
+    job = _Running(row["id"], json.loads(row["state"] or "{}"))
+    token = _current.set(job)
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(job, worker, stop), name=f"job-heartbeat-{job.job_id[:8]}",
+                     daemon=True).start()
+    try:
+        result = _resolve(row["target"])(**_decode(json.loads(row["params"])))
+        _finish(job.job_id, worker, "done", result_kind=_save_result(job.job_id, result), progress=1.0)
+    except JobCancelled:
+        _finish(job.job_id, worker, "cancelled", message="abgebrochen")
+    except Exception as e:
+        traceback.print_exc()
+        _finish(job.job_id, worker, "failed", error=f"{type(e).__name__}: {e}"[:2000])
+    finally:
+        stop.set()
+        _current.reset(token)
+
+
+def _prune() -> None:
+    cutoff = time.time() - _env_number("T2E_JOB_KEEP_DAYS", _DEFAULT_KEEP_DAYS) * 86400
+    with _db() as db:
+        db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND updated < ?", (cutoff,))
+        db.execute("DELETE FROM workers WHERE heartbeat < ?", (cutoff,))
+
+
+def run_worker(once: bool = False, idle_s: Optional[float] = None) -> int:
+    """Job-Schleife eines Worker-Prozesses; liefert die Anzahl bearbeiteter Jobs."""
+    _ee_initialize()
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    idle_limit = _env_number("T2E_JOB_WORKER_IDLE_S", _DEFAULT_IDLE_S) if idle_s is None else float(idle_s)
+    _touch_worker(worker, started=time.time())
+    _prune()
+    done, idle_since = 0, time.monotonic()
+    try:
+        while True:
+            row = _claim(worker)
+            if row is None:
+                if once or time.monotonic() - idle_since > idle_limit:
+                    return done
+                _touch_worker(worker)
+                time.sleep(_POLL_S)
+                continue
+            print(f"[{time.strftime('%H:%M:%S')}] job {row['id']} {row['target']} (attempt {row['attempts'] + 1})",
+                  flush=True)
+            _execute(row, worker)
+            done += 1
+            idle_since = time.monotonic()
+            if once:
+                return done
+    finally:
+        with _db() as db:
+            db.execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+
+if __name__ == "__main__":
+    # Über den Paketnamen importieren: Komponenten sehen denselben Job-Kontext (contextvars)
+    from blocks.components.util.jobs import run_worker as _run_worker
+    _run_worker(once="--once" in sys.argv[1:])
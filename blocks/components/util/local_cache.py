@@ -0,0 +1,160 @@
+# blocks/components/util/local_cache.py
+"""
+Purpose
+-------
+Kleiner, lokaler Datei-Cache für Komponenten (JSON-Werte und Binärdaten je
+Namespace/Key). Gedacht für teure, aber stabile Ergebnisse (z. B. Baselines
+pro AOI, gerenderte Thumbnails/GIFs), die über Reruns und Neustarts hinweg
+wiederverwendet werden sollen.
+
+Contracts
+---------
+def cache_root() -> pathlib.Path
+def cache_dir(namespace: str) -> pathlib.Path
+def stable_key(*parts) -> str
+def geometry_key(geom: ee.Geometry) -> str
+def ee_key(obj: ee.ComputedObject) -> str
+def load_json(namespace: str, key: str) -> Any | None
+def save_json(namespace: str, key: str, data: Any) -> None
+def load_bytes(namespace: str, key: str, suffix: str = ".bin") -> bytes | None
+def save_bytes(namespace: str, key: str, data: bytes, suffix: str = ".bin",
+               max_bytes: int | None = None) -> None
+
+Args
+----
+namespace : str   Unterordner je Komponente (z. B. "no2_baseline")
+key : str         Dateiname ohne Endung (typisch stable_key(...))
+parts : beliebige JSON-serialisierbare Teile des Schlüssels
+suffix : Dateiendung der Binärdatei (z. B. ".gif", ".png")
+max_bytes : Größenlimit des Namespace; bei Überschreitung LRU-Eviction
+
+Returns
+-------
+Pfad bzw. geladene Daten (None, wenn nicht vorhanden/defekt).
+
+Side Effects
+------------
+Liest/schreibt Dateien unter T2E_CACHE_DIR (Default: <repo>/runner/cache).
+
+Notes
+-----
+- Schreiben atomar (temp-Datei + os.replace), parallele Sessions sehen nie halbe Dateien.
+- Keine Streamlit-Abhängigkeit; geometry_key/ee_key brauchen keinen EE-Round-Trip
+  (Serialisierung des Graphen ist rein clientseitig).
+- LRU über mtime: load_bytes setzt die mtime eines Treffers neu, save_bytes
+  löscht bei max_bytes die ältesten Dateien des Namespace.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+from typing import Any
+
+import ee
+
+_DEFAULT_ROOT = pathlib.Path(__file__).resolve().parents[3] / "runner" / "cache"
+
+
+def cache_root() -> pathlib.Path:
+    root = pathlib.Path(os.environ.get("T2E_CACHE_DIR") or _DEFAULT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def cache_dir(namespace: str) -> pathlib.Path:
+    if not namespace or "/" in namespace or namespace.startswith("."):
+        raise ValueError(f"Invalid cache namespace: {namespace!r}")
+    d = cache_root() / namespace
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def stable_key(*parts: Any) -> str:
+    """Deterministischer Schlüssel aus JSON-serialisierbaren Teilen."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def geometry_key(geom: ee.Geometry) -> str:
+    """Schlüssel aus dem serialisierten EE-Graphen der Geometrie (ohne getInfo)."""
+    return stable_key("geom", geom.serialize())
+
+
+def ee_key(obj: ee.ComputedObject) -> str:
+    """Schlüssel aus dem serialisierten Graphen eines beliebigen EE-Objekts."""
+    return stable_key("ee", obj.serialize())
+
+
+def _atomic_write(d: pathlib.Path, name: str, payload: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp, d / name)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_json(namespace: str, key: str) -> Any | None:
+    path = cache_dir(namespace) / f"{key}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def save_json(namespace: str, key: str, data: Any) -> None:
+    payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    _atomic_write(cache_dir(namespace), f"{key}.json", payload)
+
+
+def load_bytes(namespace: str, key: str, suffix: str = ".bin") -> bytes | None:
+    path = cache_dir(namespace) / f"{key}{suffix}"
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # LRU: Zugriff zählt als "zuletzt benutzt"
+    except OSError:
+        pass
+    return data
+
+
+def _evict(d: pathlib.Path, max_bytes: int, keep: str) -> None:
+    entries = []
+    for p in d.iterdir():
+        if p.suffix == ".tmp" or not p.is_file():
+            continue
+        try:
+            st_ = p.stat()
+        except OSError:
+            continue
+        entries.append((st_.st_mtime, st_.st_size, p))
+    total = sum(size for _, size, _ in entries)
+    for _, size, p in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if p.name == keep:
+            continue
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+def save_bytes(namespace: str, key: str, data: bytes, suffix: str = ".bin",
+               max_bytes: int | None = None) -> None:
+    d = cache_dir(namespace)
+    name = f"{key}{suffix}"
+    _atomic_write(d, name, bytes(data))
+    if max_bytes is not None:
+        _evict(d, int(max_bytes), keep=name)
@@ -0,0 +1,113 @@
+# blocks/components/util/place_cache.py
+"""
+Purpose
+-------
+Zweistufiger Cache für aufgelöste Ortsnamen (Geocoding / Admin-Grenzen):
+- In-Memory-LRU pro Prozess (Treffer ohne I/O)
+- Persistenter SQLite-Store unter cache_root() (über Neustarts/Sessions hinweg)
+Schlüssel ist der normalisierte Name (Groß/Klein, Akzente, Leerzeichen egal).
+
+Contracts
+---------
+def normalize_place(name: str) -> str
+def get_place(name: str) -> dict | None
+def put_place(name: str, record: dict) -> None
+
+Args
+----
+name : str      Ortsname wie in der AOI-Spezifikation (z. B. "Bayern, Germany")
+record : dict   JSON-serialisierbar, typisch:
+                {"source": "gaul1"|"gaul0"|"geocode", "bbox": [W, S, E, N],
+                 "centroid": [lon, lat]?, "adm0_code": int?, "adm1_code": int?}
+
+Returns
+-------
+normalize_place → Schlüssel-String; get_place → Record oder None.
+
+Side Effects
+------------
+Liest/schreibt <cache_root>/places.sqlite.
+
+Notes
+-----
+- SQLite im WAL-Modus, eine Verbindung pro Aufruf → thread- und prozesssicher.
+- Defekte/gesperrte DB wird wie ein Cache-Miss behandelt (Aufrufer löst neu auf).
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .local_cache import cache_root
+
+_MEM_MAX = 512
+_mem: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_mem_lock = threading.Lock()
+
+
+def normalize_place(name: str) -> str:
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    parts = [re.sub(r"[^\w]+", " ", p).strip() for p in text.split(",")]
+    return ", ".join(re.sub(r"\s+", " ", p) for p in parts if p)
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(cache_root() / "places.sqlite", timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS places (key TEXT PRIMARY KEY, record TEXT NOT NULL, updated REAL NOT NULL)"
+    )
+    return conn
+
+
+def _remember(key: str, record: Dict[str, Any]) -> None:
+    with _mem_lock:
+        _mem[key] = record
+        _mem.move_to_end(key)
+        while len(_mem) > _MEM_MAX:
+            _mem.popitem(last=False)
+
+
+def get_place(name: str) -> Optional[Dict[str, Any]]:
+    key = normalize_place(name)
+    with _mem_lock:
+        if key in _mem:
+            _mem.move_to_end(key)
+            return dict(_mem[key])
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute("SELECT record FROM places WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        record = json.loads(row[0]) if row else None
+    except (sqlite3.Error, ValueError):
+        return None
+    if record is None:
+        return None
+    _remember(key, record)
+    return dict(record)
+
+
+def put_place(name: str, record: Dict[str, Any]) -> None:
+    key = normalize_place(name)
+    _remember(key, dict(record))
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO places (key, record, updated) VALUES (?, ?, ?)",
+                    (key, json.dumps(record, ensure_ascii=False), time.time()),
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # In-Memory-Eintrag bleibt; Persistenz ist best effort
@@ -3,18 +3,19 @@
 Purpose
 -------
 Setzt die Streamlit Page-Konfiguration und stellt eine gecachte Earth Engine
-Initialisierung via geemap bereit. Keine Use-Case-spezifischen Konstanten.
+Initialisierung bereit. Keine Use-Case-spezifischen Konstanten.
 
 Contracts
 ---------
 - st.set_page_config(...) wird bei Import gesetzt.
 - ee_authenticate(token_name: str = "EARTHENGINE_TOKEN") -> None
   Initialisiert EE genau einmal (Caching durch @st.cache_data).
+- Map: schlanker Folium-Renderer (visual/slim_map.py), geemap-kompatible Teil-API.
 
 Args
 ----
 token_name : str
-    Name der Umgebungsvariable/Credential-Quelle für geemap.ee_initialize.
+    Name der Umgebungsvariable/Credential-Quelle (nur Rückwärtskompatibilität).
 
 Returns
 -------
@@ -27,14 +28,14 @@ Setzt die Streamlit-Page-Konfiguration. EE-Session wird initialisiert (gecached)
 Notes
 -----
 - Keine UI- oder GEE-spezifischen Presets hier hinterlegen.
-- Keine weiteren Abhängigkeiten hinzufügen.
+- Keine weiteren Abhängigkeiten hinzufügen; geemap wird hier bewusst nicht
+  importiert (Startzeit/Speicher, siehe scripts/bench_map_import.py).
 """
 
 import json
 import ee
-import geemap
 import streamlit as st
-from geemap.foliumap import Map  # häufig genutzt in Render-Komponenten
+from ..visual.slim_map import Map  # häufig genutzt in Render-Komponenten
 
 # Page-Konfiguration
 st.set_page_config(
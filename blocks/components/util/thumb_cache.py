@@ -0,0 +1,140 @@
+# blocks/components/util/thumb_cache.py
+"""
+Purpose
+-------
+Persistenter Cache für gerenderte Earth-Engine-Thumbnails und -Animationen
+(getThumbURL / getVideoThumbURL / getFilmstripThumbURL). Schlüssel = Hash des EE-Graphen + Render-
+Parameter; gleiche Ansicht (AOI, vis_params, fps, dimensions, crs) wird nach
+dem ersten Abruf lokal in Millisekunden ausgeliefert.
+
+Contracts
+---------
+def render_key(obj: ee.ComputedObject, params: dict, *extra) -> str
+def fetch_thumb(img: ee.Image, params: dict, timeout: int = 60) -> bytes
+def fetch_video_thumb(col: ee.ImageCollection, params: dict, timeout: int = 60) -> bytes
+def fetch_filmstrip_thumb(col: ee.ImageCollection, params: dict, timeout: int = 60) -> bytes
+def load_render(key: str, suffix: str = ".gif") -> bytes | None
+def save_render(key: str, data: bytes, suffix: str = ".gif") -> None
+
+Args
+----
+obj / img / col : EE-Objekt, dessen Graph gerendert wird
+params : dict   Thumbnail-/Video-Parameter (region, dimensions, crs, format, framesPerSecond, ...)
+extra : weitere JSON-serialisierbare Schlüsselteile (z. B. Label-Optionen)
+timeout : int   HTTP-Timeout in s
+
+Returns
+-------
+Rohbytes (PNG/JPEG/GIF) bzw. Cache-Schlüssel.
+
+Side Effects
+------------
+HTTP-Abruf bei Cache-Miss über den geteilten EE-Pool (util/ee_async.py);
+Dateien unter <cache_root>/thumbs
+(Größenlimit T2E_THUMB_CACHE_MB, Default 512 MB, LRU-Eviction).
+
+Notes
+-----
+- EE-Objekte in params (z. B. region als ee.Geometry) gehen serialisiert in den
+  Schlüssel ein; kein getInfo() für den Schlüssel nötig.
+- Cache-Misses (URL-Anfrage + Download) laufen über ee_async.submit: Token-Bucket,
+  Backoff bei 429/503 und Session-Fairness gelten auch für Thumbnails; im
+  Prefetch (ee_async.background()) mit niedriger Priorität. Aufrufe, die selbst
+  schon in einem Pool-Worker laufen, laden direkt (kein Warten auf den eigenen Pool).
+- load_render/save_render für abgeleitete Ergebnisse (z. B. gelabelte GIFs) im
+  selben größenbegrenzten Namespace.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+import ee
+import requests
+
+from .ee_async import in_worker, submit
+from .local_cache import load_bytes, save_bytes, stable_key
+
+_NS = "thumbs"
+_DEFAULT_MAX_MB = 512
+
+
+def _max_bytes() -> int:
+    try:
+        mb = float(os.environ.get("T2E_THUMB_CACHE_MB", _DEFAULT_MAX_MB))
+    except ValueError:
+        mb = _DEFAULT_MAX_MB
+    return int(mb * 1024 * 1024)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, ee.ComputedObject):
+        return {"__ee__": value.serialize()}
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def render_key(obj: ee.ComputedObject, params: Dict[str, Any], *extra: Any) -> str:
+    return stable_key(obj.serialize(), _jsonable(params), _jsonable(list(extra)))
+
+
+def load_render(key: str, suffix: str = ".gif") -> Optional[bytes]:
+    return load_bytes(_NS, key, suffix=suffix)
+
+
+def save_render(key: str, data: bytes, suffix: str = ".gif") -> None:
+    save_bytes(_NS, key, data, suffix=suffix, max_bytes=_max_bytes())
+
+
+def _suffix(params: Dict[str, Any], default: str) -> str:
+    fmt = str(params.get("format") or default).lower().lstrip(".")
+    return "." + ("jpg" if fmt == "jpeg" else fmt)
+
+
+def _download(url: str, timeout: int) -> bytes:
+    resp = requests.get(url, timeout=timeout)
+    resp.raise_for_status()
+    return resp.content
+
+
+def _fetch(get_url: Callable[[], str], timeout: int) -> bytes:
+    """URL anfordern und laden; außerhalb des Pools rate-limitiert über ee_async."""
+    if in_worker():
+        return _download(get_url(), timeout)
+    return submit(lambda: _download(get_url(), timeout)).result()
+
+
+def fetch_thumb(img: ee.Image, params: Dict[str, Any], timeout: int = 60) -> bytes:
+    """Einzelbild-Thumbnail, bei Treffer aus dem lokalen Cache."""
+    key = render_key(img, params, "thumb")
+    suffix = _suffix(params, "png")
+    data = load_render(key, suffix)
+    if data is None:
+        data = _fetch(lambda: img.getThumbURL(params), timeout)
+        save_render(key, data, suffix)
+    return data
+
+
+def fetch_video_thumb(col: ee.ImageCollection, params: Dict[str, Any], timeout: int = 60) -> bytes:
+    """Animation (GIF) einer Kollektion, bei Treffer aus dem lokalen Cache."""
+    key = render_key(col, params, "video")
+    suffix = _suffix(params, "gif")
+    data = load_render(key, suffix)
+    if data is None:
+        data = _fetch(lambda: col.getVideoThumbURL(params), timeout)
+        save_render(key, data, suffix)
+    return data
+
+
+def fetch_filmstrip_thumb(col: ee.ImageCollection, params: Dict[str, Any], timeout: int = 60) -> bytes:
+    """Filmstreifen (alle Frames in einem Bild), bei Treffer aus dem lokalen Cache."""
+    key = render_key(col, params, "filmstrip")
+    suffix = _suffix(params, "png")
+    data = load_render(key, suffix)
+    if data is None:
+        data = _fetch(lambda: col.getFilmstripThumbURL(params), timeout)
+        save_render(key, data, suffix)
+    return data
@@ -0,0 +1,119 @@
+# blocks/components/util/tile_urls.py
+"""
+Purpose
+-------
+XYZ-Tile-URLs für EE-Layer vorab und nebenläufig auflösen (getMapId über
+util/ee_async.py) und cachen. Schlüssel = Hash des EE-Graphen + vis_params;
+unveränderte Layer kosten bei Re-Renders keinen EE-Aufruf.
+
+Contracts
+---------
+def tile_url_key(obj: ee.ComputedObject, vis_params: dict | None) -> str
+def resolve_tile_urls(layers: Sequence[tuple[ee.ComputedObject, dict | None]],
+                      timeout: float | None = 120) -> list[str]
+
+Args
+----
+layers : [(ee.Image | ee.ImageCollection, vis_params), ...]
+         ImageCollections werden wie in geemap als mosaic() dargestellt.
+vis_params : EE-Visualisierung (bands, min, max, palette, gamma, ...); "opacity"
+             ist eine Layer-Option und geht weder in getMapId noch in den Schlüssel
+timeout : Gesamt-Timeout in s für alle fehlenden URLs
+
+Returns
+-------
+Tile-URL-Templates ({z}/{x}/{y}) in Reihenfolge der layers.
+
+Side Effects
+------------
+Bei Cache-Miss ein getMapId je Layer (parallel). Cache im Prozessspeicher und
+unter <cache_root>/tile_urls (JSON), gültig T2E_TILE_URL_TTL_S (Default 4 h).
+
+Notes
+-----
+- Map-IDs von Earth Engine sind temporär; nach Ablauf der TTL wird neu aufgelöst.
+- Gleiche Layer in einem Aufruf (z. B. identisches Vorher/Nachher) werden nur
+  einmal aufgelöst.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import ee
+
+from .ee_async import ee_async, gather
+from .local_cache import load_json, save_json, stable_key
+
+_NS = "tile_urls"
+_DEFAULT_TTL_S = 4 * 3600
+_LAYER_OPTIONS = ("opacity",)
+
+_mem: Dict[str, Tuple[str, float]] = {}
+_mem_lock = threading.Lock()
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ.get("T2E_TILE_URL_TTL_S", _DEFAULT_TTL_S))
+    except ValueError:
+        return float(_DEFAULT_TTL_S)
+
+
+def _ee_vis(vis_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    vis = {k: v for k, v in (vis_params or {}).items() if k not in _LAYER_OPTIONS}
+    if isinstance(vis.get("palette"), (list, tuple)):
+        vis["palette"] = ",".join(str(c).lstrip("#") for c in vis["palette"])
+    if isinstance(vis.get("bands"), str):
+        vis["bands"] = [vis["bands"]]
+    return vis
+
+
+def _as_image(obj: ee.ComputedObject) -> ee.Image:
+    if isinstance(obj, ee.ImageCollection):
+        return obj.mosaic()
+    if isinstance(obj, ee.Image):
+        return obj
+    raise TypeError(f"Tile URLs need ee.Image or ee.ImageCollection, got {type(obj).__name__}")
+
+
+def tile_url_key(obj: ee.ComputedObject, vis_params: Optional[Dict[str, Any]]) -> str:
+    return stable_key(_as_image(obj).serialize(), _ee_vis(vis_params))
+
+
+def _cached(key: str) -> Optional[str]:
+    now = time.time()
+    with _mem_lock:
+        hit = _mem.get(key)
+    if hit and now - hit[1] < _ttl():
+        return hit[0]
+    data = load_json(_NS, key)
+    if isinstance(data, dict) and now - float(data.get("created", 0)) < _ttl() and data.get("url"):
+        with _mem_lock:
+            _mem[key] = (data["url"], float(data["created"]))
+        return data["url"]
+    return None
+
+
+def _store(key: str, url: str) -> None:
+    created = time.time()
+    with _mem_lock:
+        _mem[key] = (url, created)
+    save_json(_NS, key, {"url": url, "created": created})
+
+
+def resolve_tile_urls(layers: Sequence[Tuple[ee.ComputedObject, Optional[Dict[str, Any]]]],
+                      timeout: Optional[float] = 120) -> List[str]:
+    """Tile-URLs aller Layer; fehlende per getMapId parallel, Rest aus dem Cache."""
+    keys = [tile_url_key(obj, vis) for obj, vis in layers]
+    urls: Dict[str, Optional[str]] = {k: _cached(k) for k in keys}
+    missing = {k: (obj, vis) for k, (obj, vis) in zip(keys, layers) if urls[k] is None}
+    if missing:
+        futures = [ee_async(_as_image(obj), "getMapId", _ee_vis(vis)) for obj, vis in missing.values()]
+        for key, info in zip(missing, gather(*futures, timeout=timeout)):
+            url = info["tile_fetcher"].url_format
+            _store(key, url)
+            urls[key] = url
+    return [urls[k] for k in keys]
@@ -0,0 +1,174 @@
+# blocks/components/util/widget_memo.py
+"""
+Purpose
+-------
+EE-Ergebnisse einer generierten App je Widget-Wert-Tupel memoisieren, damit ein
+Fragment-Rerun (z. B. Jahr-Slider verschoben) nur die tatsächlich neuen
+getInfo()-Aufrufe an Earth Engine schickt. Bereits gesehene Slider-Stellungen
+kosten keinen EE-Round-Trip.
+
+Contracts
+---------
+def widget_memo(store: MutableMapping | None = None, max_entries: int | None = None,
+                overrides: dict[str, Any] | None = None, background: bool = False)
+    -> ContextManager[MemoStats]
+def record_widget(label: str, value: Any, **meta) -> Any
+def current_widgets() -> list[WidgetRead]
+
+class MemoStats(TypedDict): hits: int, misses: int, widgets: tuple
+class WidgetRead(TypedDict): label: str, value: Any, meta: dict
+
+Args
+----
+store : Ergebnisspeicher (z. B. ein OrderedDict in st.session_state); None = nur
+        für diesen Block
+max_entries : LRU-Grenze des Stores (Default T2E_WIDGET_MEMO_MAX, 256)
+overrides : {label: Wert}; record_widget liefert diesen Wert statt der Widget-Eingabe
+            (Prefetch-Läufe mit Nachbarwerten, util/widget_prefetch.py)
+background : getInfo-Misses mit niedriger Priorität über den ee_async-Pool
+label, value : Widget-Beschriftung und gelesener Wert (ui_slider_int & Co.)
+meta : Widget-Parameter (min, max, step), z. B. für Prefetch benachbarter Werte
+
+Returns
+-------
+MemoStats (wird während des Blocks fortgeschrieben), der effektive Widget-Wert
+(record_widget) bzw. Liste der gelesenen Widgets.
+
+Side Effects
+------------
+Ersetzt beim ersten Gebrauch ee.ComputedObject.getInfo prozessweit durch einen
+Dispatcher. Außerhalb eines widget_memo-Blocks ruft er unverändert das Original auf.
+
+Notes
+-----
+- Schlüssel = serialisierter EE-Graph. Jeder Widget-Wert, der in die Berechnung
+  eingeht, steckt im Graphen. Damit ist das ein Memo je Widget-Wert-Tupel, und
+  vom Widget unabhängige Ergebnisse (AOI, Baselines) werden nur einmal gehalten.
+- Der Scope läuft als contextvar und gilt auch in ee_async-Workern
+  (submit kopiert den Kontext).
+- getInfo liefert bei Treffer und Miss eine tiefe Kopie des gespeicherten
+  Werts: Aufrufer, die das Ergebnis verändern (dict/list), verfälschen weder den
+  Store noch andere Sessions/Prefetch-Läufe.
+- Nur clientseitig deterministische Aufrufe (getInfo) werden memoisiert;
+  Tile-URLs und Thumbnails haben eigene Caches (tile_urls.py, thumb_cache.py).
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, TypedDict
+
+import ee
+
+from .ee_async import in_worker, submit
+from .local_cache import ee_key
+
+_DEFAULT_MAX = 256
+
+
+class MemoStats(TypedDict):
+    hits: int
+    misses: int
+    widgets: tuple
+
+
+class WidgetRead(TypedDict):
+    label: str
+    value: Any
+    meta: Dict[str, Any]
+
+
+class _Scope:
+    def __init__(self, store: MutableMapping, max_entries: int, overrides: Dict[str, Any], background: bool):
+        self.store = store
+        self.max_entries = max_entries
+        self.overrides = overrides
+        self.background = background
+        self.lock = threading.Lock()
+        self.reads: List[WidgetRead] = []
+        self.stats: MemoStats = {"hits": 0, "misses": 0, "widgets": ()}
+
+    def get_info(self, obj: ee.ComputedObject, compute: Callable[[ee.ComputedObject], Any]) -> Any:
+        key = ee_key(obj)
+        with _store_lock:  # Fragment und Prefetch teilen sich den Store einer Session
+            if key in self.store:
+                self.stats["hits"] += 1
+                if isinstance(self.store, OrderedDict):
+                    self.store.move_to_end(key)
+                return copy.deepcopy(self.store[key])  # Aufrufer darf das Ergebnis verändern
+        if self.background and not in_worker():
+            value = submit(compute, obj, priority="low").result()
+        else:
+            value = compute(obj)
+        with _store_lock:
+            self.stats["misses"] += 1
+            self.store[key] = value
+            while len(self.store) > self.max_entries:
+                self.store.pop(next(iter(self.store)))
+        return copy.deepcopy(value)
+
+
+_active: contextvars.ContextVar[Optional[_Scope]] = contextvars.ContextVar("t2e_widget_memo", default=None)
+_install_lock = threading.Lock()
+_store_lock = threading.Lock()
+_original_get_info: Optional[Callable[..., Any]] = None
+
+
+def _install() -> None:
+    global _original_get_info
+    with _install_lock:
+        if _original_get_info is not None:
+            return
+        original = ee.ComputedObject.getInfo
+
+        def getInfo(self, *args: Any, **kwargs: Any) -> Any:
+            scope = _active.get()
+            if scope is None or args or kwargs:
+                return original(self, *args, **kwargs)
+            return scope.get_info(self, original)
+
+        getInfo.__doc__ = original.__doc__
+        _original_get_info = original
+        ee.ComputedObject.getInfo = getInfo
+
+
+def _max_entries() -> int:
+    try:
+        return int(os.environ.get("T2E_WIDGET_MEMO_MAX", _DEFAULT_MAX))
+    except ValueError:
+        return _DEFAULT_MAX
+
+
+@contextlib.contextmanager
+def widget_memo(store: Optional[MutableMapping] = None, max_entries: Optional[int] = None,
+                overrides: Optional[Dict[str, Any]] = None, background: bool = False) -> Iterator[MemoStats]:
+    """getInfo() im Block über store memoisieren; liefert laufende Treffer-Statistik."""
+    _install()
+    scope = _Scope(OrderedDict() if store is None else store, max_entries or _max_entries(),
+                   dict(overrides or {}), background)
+    token = _active.set(scope)
+    try:
+        yield scope.stats
+    finally:
+        _active.reset(token)
+
+
+def record_widget(label: str, value: Any, **meta: Any) -> Any:
+    """Von UI-Komponenten aufgerufen; liefert den effektiven Wert (Override oder value)."""
+    scope = _active.get()
+    if scope is None:
+        return value
+    value = scope.overrides.get(str(label), value)
+    with scope.lock:
+        scope.reads.append({"label": str(label), "value": value, "meta": dict(meta)})
+        scope.stats["widgets"] = tuple(r["value"] for r in scope.reads)
+    return value
+
+
+def current_widgets() -> List[WidgetRead]:
+    scope = _active.get()
+    return list(scope.reads) if scope is not None else []
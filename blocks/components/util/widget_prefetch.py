@@ -0,0 +1,147 @@
+# blocks/components/util/widget_prefetch.py
+"""
+Purpose
+-------
+Spekulatives Vorberechnen benachbarter Widget-Werte einer generierten App:
+Nach dem Rendern von Wert v läuft die App im Hintergrund unsichtbar mit v±step
+(je Widget, innerhalb seiner min/max, also der param_spec-Spanne aus dem
+UC-YAML) und füllt dabei die Caches. Der nächste Slider-Schritt trifft dann
+Memo bzw. Tile-URL-Cache.
+
+Contracts
+---------
+def neighbor_overrides(reads: Sequence[WidgetRead], radius: int = 1,
+                       max_runs: int | None = None) -> list[dict[str, Any]]
+def start_prefetch(key: str, run: Callable[[], None], store: MutableMapping,
+                   override_sets: Sequence[dict[str, Any]], done: set | None = None) -> bool
+
+Args
+----
+reads : gelesene Widgets des letzten Laufs (widget_memo.current_widgets())
+radius : Schritte je Richtung (1 → v-step, v+step)
+max_runs : Obergrenze der Prefetch-Läufe (Default T2E_PREFETCH_MAX_RUNS, 4)
+key : Prefetch-Slot (z. B. Session-ID); ein neuer Start ersetzt den laufenden
+run : führt die App ohne UI aus (Streamlit-Aufrufe als No-op)
+store : Memo-Store der Session (widget_memo)
+override_sets : [{label: wert, ...}, ...] aus neighbor_overrides (alle Widgets belegt)
+done : bereits vorberechnete Override-Sets (Schlüssel), wird fortgeschrieben
+
+Returns
+-------
+Liste der Override-Sets (nächstliegende zuerst) bzw. True, wenn ein Prefetch
+gestartet wurde.
+
+Side Effects
+------------
+Ein Daemon-Thread je key. EE-Aufrufe laufen mit niedriger Priorität über
+util/ee_async.py (Rate-Limiter, Vorrang für interaktive Requests) und landen in
+widget_memo-Store, Tile-URL-Cache und Thumbnail-Cache (getInfo, getMapId sowie
+Thumbnails/Animationen über util/thumb_cache.py).
+
+Notes
+-----
+- Ein neuer Widget-Wert verwirft noch nicht begonnene Läufe des alten Werts;
+  ein bereits laufender Durchgang wird zu Ende gerechnet.
+- Fehler im Prefetch werden verworfen; die interaktive App ist nie betroffen.
+- Streamlit-Aufrufe in Komponenten laufen im Prefetch-Thread ohne
+  ScriptRunContext ins Leere; deren Warnungen werden nur für prefetch-Threads
+  ausgefiltert.
+- Abschalten: T2E_PREFETCH=0.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Sequence
+
+from .ee_async import background
+from .widget_memo import WidgetRead, widget_memo
+
+_DEFAULT_MAX_RUNS = 4
+
+_THREAD_PREFIX = "prefetch-"
+_CTX_LOGGERS = ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                "streamlit.runtime.scriptrunner.script_run_context")
+
+_generations: Dict[str, int] = {}
+_lock = threading.Lock()
+_quiet = False
+
+
+class _PrefetchThreadFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not threading.current_thread().name.startswith(_THREAD_PREFIX)
+
+
+def _quiet_missing_ctx_warnings() -> None:
+    global _quiet
+    with _lock:
+        if _quiet:
+            return
+        for name in _CTX_LOGGERS:
+            logging.getLogger(name).addFilter(_PrefetchThreadFilter())
+        _quiet = True
+
+
+def _max_runs() -> int:
+    try:
+        return int(os.environ.get("T2E_PREFETCH_MAX_RUNS", _DEFAULT_MAX_RUNS))
+    except ValueError:
+        return _DEFAULT_MAX_RUNS
+
+
+def _enabled() -> bool:
+    return os.environ.get("T2E_PREFETCH", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def neighbor_overrides(reads: Sequence[WidgetRead], radius: int = 1,
+                       max_runs: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Je Widget die Nachbarwerte (übrige Widgets fix), nächstliegende zuerst."""
+    limit = _max_runs() if max_runs is None else int(max_runs)
+    latest: Dict[str, WidgetRead] = {r["label"]: r for r in reads}  # letzte Lesung je Label
+    base = {label: r["value"] for label, r in latest.items()}  # übrige Widgets auf aktuellem Wert
+    out: List[Dict[str, Any]] = []
+    for dist in range(1, int(radius) + 1):
+        for label, r in latest.items():
+            meta, v = r["meta"], r["value"]
+            if not isinstance(v, int) or "min" not in meta or "max" not in meta:
+                continue
+            step = int(meta.get("step", 1)) or 1
+            for cand in (v + dist * step, v - dist * step):  # vorwärts zuerst (typische Richtung)
+                if int(meta["min"]) <= cand <= int(meta["max"]):
+                    out.append({**base, label: cand})
+    return out[:max(0, limit)]
+
+
+def _set_key(overrides: Dict[str, Any]) -> str:
+    return json.dumps(overrides, sort_keys=True, default=str)
+
+
+def start_prefetch(key: str, run: Callable[[], None], store: MutableMapping,
+                   override_sets: Sequence[Dict[str, Any]], done: Optional[set] = None) -> bool:
+    """override_sets nacheinander im Hintergrund rechnen; ersetzt einen Prefetch mit gleichem key."""
+    done = set() if done is None else done
+    todo = [ov for ov in override_sets if _set_key(ov) not in done]
+    if not todo or not _enabled():
+        return False
+    with _lock:
+        gen = _generations.get(key, 0) + 1
+        _generations[key] = gen
+
+    def _work() -> None:
+        for ov in todo:
+            with _lock:
+                if _generations.get(key) != gen:
+                    return  # neuerer Widget-Wert → alte Nachbarn verwerfen
+            try:
+                with background(), widget_memo(store, overrides=ov, background=True):
+                    run()
+                done.add(_set_key(ov))
+            except Exception:
+                pass
+
+    _quiet_missing_ctx_warnings()
+    threading.Thread(target=_work, name=f"{_THREAD_PREFIX}{key[:8]}", daemon=True).start()
+    return True
@@ -0,0 +1,48 @@
+# blocks/components/visual/ee_tile_layers.py
+"""
+Purpose
+-------
+EE-Layer für Folium-Karten vorbereiten: alle Tile-URLs werden vorab und
+nebenläufig aufgelöst (util/tile_urls.py, gecacht) und als fertige
+folium TileLayer übergeben, statt dass geemap getMapId je Layer seriell beim
+Kartenaufbau ausführt.
+
+Contracts
+---------
+def prepare_tile_layers(specs: Sequence[tuple[Any, dict | None, str]]) -> list
+
+Args
+----
+specs : [(layer, vis_params, name), ...]
+        layer: ee.Image | ee.ImageCollection → TileLayer; alles andere (Basemap-Name,
+        URL, None, fertiger Folium-Layer) wird unverändert durchgereicht.
+
+Returns
+-------
+Liste in Reihenfolge der specs (folium.raster_layers.TileLayer bzw. Original).
+
+Side Effects
+------------
+getMapId nur für nicht gecachte EE-Layer (parallel).
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import ee
+import folium
+
+from ..util.tile_urls import resolve_tile_urls
+
+_EE_ATTR = "Google Earth Engine"
+
+
+def prepare_tile_layers(specs: Sequence[Tuple[Any, Optional[Dict], str]]) -> List[Any]:
+    ee_idx = [i for i, (layer, _, _) in enumerate(specs) if isinstance(layer, (ee.Image, ee.ImageCollection))]
+    urls = resolve_tile_urls([(specs[i][0], specs[i][1]) for i in ee_idx]) if ee_idx else []
+    out = [layer for layer, _, _ in specs]
+    for i, url in zip(ee_idx, urls):
+        _, vis, name = specs[i]
+        out[i] = folium.raster_layers.TileLayer(
+            tiles=url, attr=_EE_ATTR, name=name, overlay=True, control=True,
+            opacity=float((vis or {}).get("opacity", 1.0)),
+        )
+    return out
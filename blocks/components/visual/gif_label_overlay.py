@@ -7,7 +7,8 @@ gemäß fps. Generische Visual-Komponente ohne UC-spezifische Konstanten.
 
 Contracts
 ---------
-def label_gif(gif_bytes, labels, fps: int, xy=(10, 10)) -> io.BytesIO
+def label_gif(gif_bytes, labels, fps: int, xy=(10, 10),
+              output_format: str = "GIF", max_workers: int | None = None) -> io.BytesIO
 
 Args
 ----
@@ -16,44 +17,151 @@ labels : List[str]
 fps : int
 xy : Tuple[int, int]
     Position links/oben für das Label.
+output_format : "GIF" | "WEBP" | "APNG"
+    WEBP/APNG behalten volle Farbtiefe (kein Paletten-Quantisieren).
+max_workers : int | None
+    Threads für die Frame-Verarbeitung (Default: CPU-Anzahl).
 
 Returns
 -------
-io.BytesIO : gelabeltes GIF
+io.BytesIO : gelabelte Animation im gewünschten Format
 
 Side Effects
 ------------
 Keine.
+
+Notes
+-----
+- Jedes unterschiedliche Label wird genau einmal gerendert (RGBA-Patch) und
+  per numpy-Alpha-Blending nur im Label-Rechteck in die Frames geschrieben.
+- GIF: eine globale Palette (aus einer Stichprobe aller gelabelten Frames),
+  Zuordnung Pixel → Palettenindex über eine 15-bit-Lookup-Tabelle.
 """
 
 import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageSequence
-from typing import List, Tuple
 
-def label_gif(gif_bytes, labels: list, fps: int, xy: Tuple[int, int] = (10, 10)) -> io.BytesIO:
-    im = Image.open(gif_bytes)
-    frames = []
+_PAD = 6
+_FORMATS = ("GIF", "WEBP", "APNG")
+
+
+def _load_font():
     try:
-        font = ImageFont.truetype("DejaVuSans.ttf", 28)
+        return ImageFont.truetype("DejaVuSans.ttf", 28)
     except Exception:
-        font = ImageFont.load_default()
+        return ImageFont.load_default()
+
+
+def _render_patch(label: str, font) -> Tuple[np.ndarray, np.ndarray]:
+    """Label einmal rendern → (RGB float32, Alpha float32 0..1)."""
+    probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    tw, th = probe.textbbox((0, 0), label, font=font)[2:]
+    patch = Image.new("RGBA", (tw + 2 * _PAD + 1, th + 2 * _PAD + 1), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(patch)
+    draw.rectangle((0, 0, tw + 2 * _PAD, th + 2 * _PAD), fill=(0, 0, 0, 120))
+    draw.text((_PAD, _PAD), label, font=font, fill=(255, 255, 255, 255))
+    arr = np.asarray(patch, dtype=np.float32)
+    return arr[..., :3], arr[..., 3:4] / 255.0
+
+
+def _blit(frame: np.ndarray, patch: Tuple[np.ndarray, np.ndarray], xy: Tuple[int, int]) -> None:
+    """Patch in-place in den Frame (H, W, 3 uint8) mischen, am Rand beschnitten."""
+    rgb, alpha = patch
+    h, w = frame.shape[:2]
+    x0, y0 = int(xy[0]) - _PAD, int(xy[1]) - _PAD
+    fx0, fy0 = max(0, x0), max(0, y0)
+    fx1, fy1 = min(w, x0 + rgb.shape[1]), min(h, y0 + rgb.shape[0])
+    if fx1 <= fx0 or fy1 <= fy0:
+        return
+    px0, py0 = fx0 - x0, fy0 - y0
+    px1, py1 = px0 + (fx1 - fx0), py0 + (fy1 - fy0)
+    a = alpha[py0:py1, px0:px1]
+    region = frame[fy0:fy1, fx0:fx1].astype(np.float32)
+    region *= (1.0 - a)
+    region += rgb[py0:py1, px0:px1] * a
+    frame[fy0:fy1, fx0:fx1] = np.clip(region + 0.5, 0, 255).astype(np.uint8)
+
+
+def _global_palette(frames: List[np.ndarray], max_samples: int = 1 << 18) -> np.ndarray:
+    """Eine Palette (≤256 Farben) für alle Frames aus einer Pixel-Stichprobe."""
+    per_frame = max(1, max_samples // len(frames))
+    samples = []
+    for f in frames:
+        flat = f.reshape(-1, 3)
+        step = max(1, flat.shape[0] // per_frame)
+        samples.append(flat[::step])
+    sample = np.concatenate(samples)[None, :, :]
+    pal_img = Image.fromarray(sample).quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+    pal = np.asarray(pal_img.getpalette()[: 256 * 3], dtype=np.int32).reshape(-1, 3)
+    used = np.unique(np.asarray(pal_img))
+    return pal[used]
+
+
+def _palette_lut(palette: np.ndarray) -> np.ndarray:
+    """15-bit RGB (5/5/5) → nächster Palettenindex."""
+    levels = (np.arange(32, dtype=np.int32) << 3) + 4
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 1, 3)
+    lut = np.empty(grid.shape[0], dtype=np.uint8)
+    for start in range(0, grid.shape[0], 4096):
+        d = ((grid[start:start + 4096] - palette[None, :, :]) ** 2).sum(axis=-1)
+        lut[start:start + 4096] = np.argmin(d, axis=1)
+    return lut.reshape(32, 32, 32)
+
+
+def _to_indices(frame: np.ndarray, lut: np.ndarray) -> np.ndarray:
+    q = frame >> 3
+    return lut[q[..., 0], q[..., 1], q[..., 2]]
+
+
+def label_gif(gif_bytes, labels: list, fps: int, xy: Tuple[int, int] = (10, 10),
+              output_format: str = "GIF", max_workers: Optional[int] = None) -> io.BytesIO:
+    fmt = str(output_format).upper()
+    if fmt not in _FORMATS:
+        raise ValueError(f"output_format must be one of {_FORMATS}, got {output_format!r}")
+
+    if isinstance(gif_bytes, (bytes, bytearray)):
+        gif_bytes = io.BytesIO(gif_bytes)
+    im = Image.open(gif_bytes)
+    frames = [np.array(frame.convert("RGB")) for frame in ImageSequence.Iterator(im)]
+    if not frames:
+        raise ValueError("animation has no frames")
+
+    font = _load_font()
+    frame_labels = [labels[i % len(labels)] if labels else "" for i in range(len(frames))]
+    patches: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+        lab: _render_patch(lab, font) for lab in dict.fromkeys(frame_labels)
+    }
 
-    for i, frame in enumerate(ImageSequence.Iterator(im)):
-        frame_rgba = frame.convert("RGBA")
-        overlay = Image.new("RGBA", frame_rgba.size, (255, 255, 255, 0))
-        draw = ImageDraw.Draw(overlay)
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda i: _blit(frames[i], patches[frame_labels[i]], xy), range(len(frames))))
 
-        label = labels[i % len(labels)] if labels else ""
-        tw, th = draw.textbbox((0, 0), label, font=font)[2:]
-        x, y = xy
-        draw.rectangle((x - 6, y - 6, x + tw + 6, y + th + 6), fill=(0, 0, 0, 120))
-        draw.text((x, y), label, font=font, fill=(255, 255, 255, 255))
+        duration = max(1, int(1000 / max(1, int(fps))))  # ms per frame
+        out = io.BytesIO()
+        if fmt == "GIF":
+            palette = _global_palette(frames)
+            lut = _palette_lut(palette)
+            flat_pal = palette.astype(np.uint8).reshape(-1).tolist()
+            flat_pal += [0] * (768 - len(flat_pal))
 
-        frames.append(Image.alpha_composite(frame_rgba, overlay).convert("P"))
+            def _to_p(f: np.ndarray) -> Image.Image:
+                idx = _to_indices(f, lut)
+                p = Image.frombytes("P", (idx.shape[1], idx.shape[0]), idx.tobytes())
+                p.putpalette(flat_pal)
+                return p
 
-    out = io.BytesIO()
-    duration = max(1, int(1000 / max(1, int(fps))))  # ms per frame
-    frames[0].save(out, format="GIF", save_all=True, append_images=frames[1:], loop=0,
-                   duration=duration, disposal=2)
+            images = list(pool.map(_to_p, frames))
+            images[0].save(out, format="GIF", save_all=True, append_images=images[1:], loop=0,
+                           duration=duration, disposal=2, optimize=False)
+        else:
+            images = [Image.fromarray(f) for f in frames]
+            save_kwargs = {"format": "WEBP", "quality": 85, "method": 4} if fmt == "WEBP" else {"format": "PNG"}
+            images[0].save(out, save_all=True, append_images=images[1:], loop=0,
+                           duration=duration, **save_kwargs)
     out.seek(0)
     return out
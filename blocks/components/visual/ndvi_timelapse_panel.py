@@ -20,34 +20,68 @@ def render_ndvi_timelapse_panel(
     right_title: str = "Vegetation Animation",
     label_xy: tuple[int,int] = (10, 10),
     caption: str | None = None,
+    fetch_mode: str = "video",   # "video" | "frames" | "job"
+    max_workers: int = 6,
+    frame_retries: int = 2,
+    aoi_info: AoiInfo | None = None,
 ) -> None
+def ndvi_timelapse_gif(comp, aoi, vis_params: dict, ref_year: int, fps: int = 10,
+                       dimensions: int = 600, crs: str = "EPSG:3857",
+                       label_xy: tuple[int,int] = (10, 10), max_workers: int = 6,
+                       frame_retries: int = 2) -> bytes
 
 Args
 ----
-m : geemap.foliumap.Map
+m : slim_map.Map (API-kompatibel auch geemap.foliumap.Map)
 comp : ee.ImageCollection
 aoi : ee.Geometry
 vis_params : Dict[str, Any]
 ref_year : int
 fps, dimensions, crs : Visual/GIF-Parameter
+fetch_mode : "video" → ein getVideoThumbURL für das ganze GIF (Standard);
+             "frames" → Einzelbild-Thumbnails parallel über den geteilten EE-Pool
+             (util/ee_async.py: Rate-Limit, Backoff, Session-Fairness; höchstens
+             max_workers gleichzeitig), Frames erscheinen sofort beim Eintreffen,
+             GIF wird lokal zusammengesetzt;
+             "job" → wie "frames", aber als Hintergrund-Job (util/jobs.py) mit
+             Fortschrittsanzeige; läuft über Reruns/Reloads weiter.
+frame_retries : Wiederholungen pro Frame bei Quota-/Transient-Fehlern (Backoff im
+                EE-Pool; "frames"/"job").
+aoi_info : AoiInfo | None
+    Lokaler Deskriptor aus aoi_from_spec(..., with_info=True); zentriert die Karte
+    ohne getInfo() und mit passender Zoomstufe.
 
 Returns
 -------
-None
+None bzw. gelabeltes GIF (ndvi_timelapse_gif, Job-Ziel ohne UI)
 
 Side Effects
 ------------
-Streamlit-Rendering; lädt GIF via HTTP von Earth Engine.
+Streamlit-Rendering; lädt GIF/Frames via HTTP von Earth Engine, rate-limitiert
+über util/ee_async.py (im Prefetch mit niedriger Priorität). Rohe GIFs/Frames und
+das gelabelte Ergebnis landen im Thumbnail-Cache (util/thumb_cache.py);
+Wiederholungsansichten kommen ohne EE-Aufruf aus dem lokalen Cache. Während
+util/artifacts.capture() wird das Panel (Layout, Karte, GIF) aufgezeichnet.
+ndvi_timelapse_gif meldet im Job Fortschritt je Frame; nach einem Worker-Absturz
+kommen bereits geladene Frames aus dem Thumbnail-Cache.
 """
 
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Deque, Dict, Any, List, Tuple, Optional
 import io
-import requests
+from PIL import Image
 import streamlit as st
 import ee
-from geemap.foliumap import Map
+from .slim_map import Map
 from .gif_label_overlay import label_gif
+from ..gee.aoi_from_spec import AoiInfo, map_zoom
+from ..ui.job_status import ui_job_status
+from ..util.artifacts import recording
+from ..util.ee_async import current_session, submit
+from ..util.jobs import report_progress, submit_job
+from ..util.thumb_cache import fetch_thumb, fetch_video_thumb, load_render, render_key, save_render
 
 def _month_labels_from_ic(comp: ee.ImageCollection, ref_year: int) -> List[str]:
     # DOYs von der Kollektion ins Client holen und in Monatsnamen wandeln
@@ -59,6 +93,136 @@ def _month_labels_from_ic(comp: ee.ImageCollection, ref_year: int) -> List[str]:
         months.append(dt.strftime("%B"))
     return months
 
+FrameCallback = Callable[[int, Optional[bytes], Optional[BaseException]], None]
+
+def _fetch_frames(frame_list: ee.List, n: int, thumb_params: Dict[str, Any], on_frame: FrameCallback,
+                  max_workers: int, retries: int) -> Dict[int, bytes]:
+    """
+    Frames 0..n-1 als PNG über den geteilten EE-Pool holen (Rate-Limit, Backoff,
+    Fairness; Priorität des Aufrufers, im Prefetch "low"). on_frame(i, data, err)
+    läuft im aufrufenden Thread, sobald ein Frame fertig ist; wirft er, werden
+    offene Frames abgebrochen.
+    """
+    session = current_session()
+    queue: Deque[int] = deque(range(int(n)))
+    inflight: Dict[Future, int] = {}
+    frames: Dict[int, bytes] = {}
+    while queue or inflight:
+        while queue and len(inflight) < max(1, int(max_workers)):
+            i = queue.popleft()
+            fut = submit(fetch_thumb, ee.Image(frame_list.get(i)), thumb_params,
+                         session=session, retries=int(retries))
+            inflight[fut] = i
+        done, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+        for fut in done:
+            i = inflight.pop(fut)
+            err = fut.exception()
+            if err is None:
+                frames[i] = fut.result()
+            try:
+                on_frame(i, frames.get(i), err)
+            except BaseException:
+                for other in inflight:
+                    other.cancel()
+                raise
+    return frames
+
+def _frames_to_gif(frames: List[bytes], fps: int) -> io.BytesIO:
+    images = [Image.open(io.BytesIO(b)).convert("RGB") for b in frames]
+    out = io.BytesIO()
+    duration = max(1, int(1000 / max(1, int(fps))))
+    images[0].save(out, format="GIF", save_all=True, append_images=images[1:], loop=0,
+                   duration=duration, disposal=2)
+    out.seek(0)
+    return out
+
+def _render_frames_progressive(
+    rgb_vis: ee.ImageCollection,
+    comp: ee.ImageCollection,
+    ref_year: int,
+    thumb_params: Dict[str, Any],
+    fps: int,
+    label_xy: Tuple[int, int],
+    caption: Optional[str],
+    max_workers: int,
+    frame_retries: int,
+) -> None:
+    """Frames parallel holen, jeweils sofort anzeigen, am Ende lokal animieren."""
+    ui = recording(st)  # Ausgaben als Artefakte (nur während capture())
+    key = render_key(rgb_vis, thumb_params, "frames", int(fps), list(label_xy), int(ref_year))
+    cached = load_render(key)
+    if cached is not None:
+        ui.image(cached, caption=caption, use_container_width=True)
+        return
+
+    months = _month_labels_from_ic(comp, ref_year)
+    n = len(months)
+    frame_list = rgb_vis.toList(n)
+    slot = ui.empty()
+    progress = ui.progress(0.0)
+    shown: List[int] = []
+    failed: List[int] = []
+
+    def on_frame(i: int, data: Optional[bytes], err: Optional[BaseException]) -> None:
+        # Streamlit-Aufrufe nur hier (Script-Thread), nie im Pool-Worker
+        if err is not None:
+            failed.append(i)
+        else:
+            shown.append(i)
+            slot.image(data, caption=f"{months[i]} ({len(shown)}/{n})", use_container_width=True)
+        progress.progress((len(shown) + len(failed)) / max(1, n))
+
+    frames = _fetch_frames(frame_list, n, thumb_params, on_frame, max_workers, frame_retries)
+    progress.empty()
+    if not frames:
+        raise RuntimeError("no frame could be rendered")
+    order = sorted(frames)
+    raw_gif = _frames_to_gif([frames[i] for i in order], fps)
+    labeled = label_gif(raw_gif, [months[i] for i in order], fps=fps, xy=label_xy)
+    if not failed:
+        save_render(key, labeled.getvalue())
+    slot.image(labeled, caption=caption, use_container_width=True)
+    if failed:
+        ui.warning(f"{len(failed)} von {n} Frames fehlen: " + ", ".join(months[i] for i in sorted(failed)))
+
+def ndvi_timelapse_gif(
+    comp: ee.ImageCollection,
+    aoi: ee.Geometry,
+    vis_params: Dict[str, Any],
+    ref_year: int,
+    fps: int = 10,
+    dimensions: int = 600,
+    crs: str = "EPSG:3857",
+    label_xy: Tuple[int, int] = (10, 10),
+    max_workers: int = 6,
+    frame_retries: int = 2,
+) -> bytes:
+    """Gelabeltes GIF wie fetch_mode="frames", ohne UI (Ziel für submit_job)."""
+    rgb_vis = comp.map(lambda img: img.visualize(**vis_params).clip(aoi))
+    thumb_params = {"region": aoi.bounds(), "dimensions": int(dimensions), "crs": crs, "format": "png"}
+    key = render_key(rgb_vis, thumb_params, "frames", int(fps), list(label_xy), int(ref_year))
+    cached = load_render(key)
+    if cached is not None:
+        return cached
+
+    months = _month_labels_from_ic(comp, ref_year)
+    n = len(months)
+    frame_list = rgb_vis.toList(n)
+    done: List[int] = []
+
+    def on_frame(i: int, data: Optional[bytes], err: Optional[BaseException]) -> None:
+        if err is not None:
+            raise err  # fehlendes Frame → Job schlägt fehl, Retry nutzt den Frame-Cache
+        done.append(i)
+        report_progress(len(done) / max(1, n), f"Frame {len(done)}/{n} ({months[i]})")
+
+    frames = _fetch_frames(frame_list, n, thumb_params, on_frame, max_workers, frame_retries)
+
+    raw_gif = _frames_to_gif([frames[i] for i in range(n)], fps)
+    labeled = label_gif(raw_gif, months, fps=fps, xy=label_xy).getvalue()
+    save_render(key, labeled)
+    return labeled
+
 def render_ndvi_timelapse_panel(
     m: Map,
     comp: ee.ImageCollection,
@@ -72,20 +236,29 @@ def render_ndvi_timelapse_panel(
     right_title: str = "Vegetation Animation",
     label_xy: Tuple[int, int] = (10, 10),
     caption: Optional[str] = None,
+    fetch_mode: str = "video",
+    max_workers: int = 6,
+    frame_retries: int = 2,
+    aoi_info: Optional[AoiInfo] = None,
 ) -> None:
     """Render NDVI timelapse panel with map preview and labeled GIF."""
+    ui = recording(st)  # Ausgaben als Artefakte (nur während capture())
     region = aoi.bounds()
     # Visualisierte & geclippte Frames
     rgbVis = comp.map(lambda img: img.visualize(**vis_params).clip(aoi))
     gifParams = {"region": region, "dimensions": int(dimensions), "crs": crs, "framesPerSecond": int(fps)}
 
-    left, right = st.columns([1, 1])
+    left, right = ui.columns([1, 1])
 
     with left:
-        st.subheader(left_title)
+        ui.subheader(left_title)
         try:
-            coords = aoi.centroid().getInfo()["coordinates"]
-            m.set_center(coords[0], coords[1], 4)
+            if aoi_info is not None:
+                lon, lat = aoi_info["centroid"]
+                m.set_center(lon, lat, map_zoom(aoi_info, int(dimensions)))
+            else:
+                coords = aoi.centroid().getInfo()["coordinates"]
+                m.set_center(coords[0], coords[1], 4)
         except Exception:
             pass
         # Grenze (einfach: AOI-Umriss)
@@ -102,15 +275,36 @@ def render_ndvi_timelapse_panel(
         m.to_streamlit()
 
     with right:
-        st.subheader(right_title)
+        ui.subheader(right_title)
+        if fetch_mode == "job":
+            job_id = submit_job("blocks.components.visual.ndvi_timelapse_panel:ndvi_timelapse_gif", {
+                "comp": comp, "aoi": aoi, "vis_params": vis_params, "ref_year": int(ref_year), "fps": int(fps),
+                "dimensions": int(dimensions), "crs": crs, "label_xy": list(label_xy),
+                "max_workers": int(max_workers), "frame_retries": int(frame_retries)})
+            if job_id is None:  # Prefetch: keinen Job für Nachbarwerte anstoßen
+                return
+            gif = ui_job_status(job_id, label=right_title)
+            if gif is not None:
+                ui.image(gif, caption=caption, use_container_width=True)
+            return
+        if fetch_mode == "frames":
+            try:
+                thumb_params = {"region": region, "dimensions": int(dimensions), "crs": crs, "format": "png"}
+                _render_frames_progressive(rgbVis, comp, ref_year, thumb_params, fps, label_xy, caption,
+                                           max_workers, frame_retries)
+            except Exception as e:
+                ui.error(f"Failed to create animation: {e}")
+                ui.info("Tip: Check Earth Engine auth and that the AOI is valid.")
+            return
         try:
-            gif_url = rgbVis.getVideoThumbURL(gifParams)
-            resp = requests.get(gif_url, timeout=60)
-            resp.raise_for_status()
-            raw_gif = io.BytesIO(resp.content)
-            months = _month_labels_from_ic(comp, ref_year)
-            labeled = label_gif(raw_gif, months, fps=fps, xy=label_xy)
-            st.image(labeled, caption=caption, use_container_width=True)
+            key = render_key(rgbVis, gifParams, "labeled", list(label_xy), int(ref_year))
+            labeled = load_render(key)
+            if labeled is None:
+                raw_gif = io.BytesIO(fetch_video_thumb(rgbVis, gifParams))
+                months = _month_labels_from_ic(comp, ref_year)
+                labeled = label_gif(raw_gif, months, fps=fps, xy=label_xy).getvalue()
+                save_render(key, labeled)
+            ui.image(labeled, caption=caption, use_container_width=True)
         except Exception as e:
-            st.error(f"Failed to create animation: {e}")
-            st.info("Tip: Check Earth Engine auth and that the AOI is valid.")
+            ui.error(f"Failed to create animation: {e}")
+            ui.info("Tip: Check Earth Engine auth and that the AOI is valid.")
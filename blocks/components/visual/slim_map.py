@@ -0,0 +1,209 @@
+# blocks/components/visual/slim_map.py
+"""
+Purpose
+-------
+Schlanker Karten-Renderer direkt auf Folium mit EE-Tile-URLs, als Ersatz für
+geemap.foliumap.Map in den Render-Komponenten. Abgedeckt sind genau die
+genutzten Operationen (Map, split_map, add_layer/addLayer, add_colorbar,
+set_center/center_object, to_streamlit); folium/branca/streamlit werden erst
+beim ersten Gebrauch importiert, geemap gar nicht.
+
+Contracts
+---------
+class Map:
+    def __init__(self, center=(20, 0), zoom=2, height="600px", basemap="OpenStreetMap", **kwargs)
+    def add_layer(self, ee_object, vis_params=None, name=None, shown=True, opacity=1.0) -> None
+    def split_map(self, left_layer="OpenStreetMap", right_layer="OpenStreetMap",
+                  left_vis=None, right_vis=None, left_name=None, right_name=None, **kwargs) -> None
+    def add_colorbar(self, vis_params: dict, label: str | None = None, **kwargs) -> None
+    def set_center(self, lon: float, lat: float, zoom: int | None = None) -> None
+    def center_object(self, ee_object, zoom: int | None = None) -> None
+    def to_html(self) -> str
+    def to_streamlit(self, height: int = 600, width: int | None = None, scrolling: bool = False) -> None
+    (Aliase im geemap-Stil: addLayer, setCenter, centerObject, add_layer_control)
+
+Args
+----
+center : (lat, lon) wie bei geemap; zoom : Start-Zoom
+basemap : Basemap-Name (OpenStreetMap, ROADMAP, SATELLITE, TERRAIN, HYBRID,
+          CartoDB.Positron) oder XYZ-URL
+ee_object : ee.Image | ee.ImageCollection | ee.Geometry | ee.Feature |
+            ee.FeatureCollection | folium-Layer | Basemap-Name/URL
+vis_params : EE-Visualisierung; bei Vektoren {"color", "width"}; "opacity" = Layer-Deckkraft
+left_name/right_name : Layer-Namen (geemap-Alias left_label/right_label)
+
+Returns
+-------
+None bzw. HTML-String (to_html).
+
+Side Effects
+------------
+add_layer/split_map: getMapId je neuem EE-Layer (gecacht, util/tile_urls.py).
+center_object: ein getInfo() (Bounds). to_streamlit: schreibt in Streamlit und
+meldet das HTML als Artefakt (util/artifacts.py, nur während capture()).
+
+Notes
+-----
+- Unbekannte geemap-Optionen im Konstruktor bzw. in split_map werden ignoriert.
+- Alle übrigen Attribute werden an die zugrunde liegende folium.Map
+  durchgereicht (z. B. add_child, fit_bounds), daher funktioniert layer.add_to(m).
+- Startzeit-Vergleich mit geemap: scripts/bench_map_import.py.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import ee
+
+from ..util.artifacts import record_artifact
+from ..util.tile_urls import resolve_tile_urls
+
+_EE_ATTR = "Google Earth Engine"
+_GOOGLE = "https://mt1.google.com/vt/lyrs={}&x={{x}}&y={{y}}&z={{z}}"
+_BASEMAPS: Dict[str, tuple] = {
+    "OpenStreetMap": ("OpenStreetMap", None),
+    "ROADMAP": (_GOOGLE.format("m"), "Google"),
+    "SATELLITE": (_GOOGLE.format("s"), "Google"),
+    "TERRAIN": (_GOOGLE.format("p"), "Google"),
+    "HYBRID": (_GOOGLE.format("y"), "Google"),
+    "CartoDB.Positron": ("CartoDB positron", None),
+}
+_VECTOR_TYPES = (ee.Geometry, ee.Feature, ee.FeatureCollection)
+
+
+def _folium():
+    import folium
+    return folium
+
+
+def _basemap_layer(name: str, overlay: bool, label: Optional[str] = None):
+    folium = _folium()
+    tiles, attr = _BASEMAPS.get(name, (name, " "))
+    return folium.raster_layers.TileLayer(tiles=tiles, attr=attr, name=label or name, overlay=overlay, control=True)
+
+
+def _vector_image(obj: Any, vis: Dict[str, Any]) -> ee.Image:
+    color = str(vis.get("color", "3388ff")).lstrip("#")
+    return ee.FeatureCollection(obj if not isinstance(obj, ee.Geometry) else [ee.Feature(obj)]).style(
+        color=color, fillColor=color + "22", width=float(vis.get("width", 2))
+    )
+
+
+class Map:
+    """Folium-Karte mit geemap-kompatibler Teil-API für EE-Layer."""
+
+    def __init__(self, center: Sequence[float] = (20, 0), zoom: int = 2, height: Any = "600px",
+                 basemap: str = "OpenStreetMap", **kwargs: Any):
+        folium = _folium()
+        self._map = folium.Map(location=list(kwargs.get("location", center)),
+                               zoom_start=int(kwargs.get("zoom_start", zoom)),
+                               height=height, tiles=None, control_scale=True)
+        _basemap_layer(basemap, overlay=False).add_to(self._map)
+        self._has_layer_control = False
+
+    def __getattr__(self, name: str) -> Any:
+        inner = self.__dict__.get("_map")
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+    # --- Layer ---------------------------------------------------------------
+    def _tile_layers(self, specs: List[tuple]) -> List[Any]:
+        """[(obj, vis, name, shown)] → folium-Layer; EE-URLs gemeinsam (parallel) auflösen."""
+        folium = _folium()
+        ee_specs = []
+        for i, (obj, vis, name, _) in enumerate(specs):
+            if isinstance(obj, _VECTOR_TYPES):
+                ee_specs.append((i, _vector_image(obj, vis), {}))
+            elif isinstance(obj, (ee.Image, ee.ImageCollection)):
+                ee_specs.append((i, obj, vis))
+        urls = resolve_tile_urls([(obj, vis) for _, obj, vis in ee_specs]) if ee_specs else []
+        out: List[Any] = []
+        by_index = {i: url for (i, _, _), url in zip(ee_specs, urls)}
+        for i, (obj, vis, name, shown) in enumerate(specs):
+            if i in by_index:
+                out.append(folium.raster_layers.TileLayer(
+                    tiles=by_index[i], attr=_EE_ATTR, name=name, overlay=True, control=True,
+                    show=bool(shown), opacity=float(vis.get("opacity", 1.0)),
+                ))
+            elif obj is None or isinstance(obj, str):
+                out.append(_basemap_layer(obj or "OpenStreetMap", overlay=True, label=name))
+            else:
+                out.append(obj)  # fertiger folium-Layer
+        return out
+
+    def add_layer(self, ee_object: Any, vis_params: Optional[Dict[str, Any]] = None,
+                  name: Optional[str] = None, shown: bool = True, opacity: float = 1.0) -> None:
+        vis = dict(vis_params or {})
+        vis.setdefault("opacity", opacity)
+        (layer,) = self._tile_layers([(ee_object, vis, name or "Layer", shown)])
+        layer.add_to(self._map)
+
+    addLayer = add_layer
+
+    def split_map(self, left_layer: Any = "OpenStreetMap", right_layer: Any = "OpenStreetMap",
+                  left_vis: Optional[Dict[str, Any]] = None, right_vis: Optional[Dict[str, Any]] = None,
+                  left_name: Optional[str] = None, right_name: Optional[str] = None, **kwargs: Any) -> None:
+        from folium.plugins import SideBySideLayers
+
+        left, right = self._tile_layers([
+            (left_layer, dict(left_vis or {}), left_name or kwargs.get("left_label") or "Left", True),
+            (right_layer, dict(right_vis or {}), right_name or kwargs.get("right_label") or "Right", True),
+        ])
+        left.add_to(self._map)
+        right.add_to(self._map)
+        SideBySideLayers(layer_left=left, layer_right=right).add_to(self._map)
+
+    # --- Legende / Ansicht ------------------------------------------------------
+    def add_colorbar(self, vis_params: Dict[str, Any], label: Optional[str] = None, **kwargs: Any) -> None:
+        import branca.colormap as cm
+
+        palette = vis_params.get("palette") or ["000000", "ffffff"]
+        if isinstance(palette, str):
+            palette = palette.split(",")
+        colors = [c if str(c).startswith("#") or not _is_hex(c) else "#" + c for c in palette]
+        cmap = cm.LinearColormap(colors=colors, vmin=float(vis_params.get("min", 0)),
+                                 vmax=float(vis_params.get("max", 1)),
+                                 caption=label or kwargs.get("caption") or "")
+        cmap.add_to(self._map)
+
+    def set_center(self, lon: float, lat: float, zoom: Optional[int] = None) -> None:
+        self._map.location = [float(lat), float(lon)]
+        if zoom is not None:
+            self._map.fit_bounds([[float(lat), float(lon)], [float(lat), float(lon)]], max_zoom=int(zoom))
+
+    setCenter = set_center
+
+    def center_object(self, ee_object: Any, zoom: Optional[int] = None) -> None:
+        geom = ee_object if isinstance(ee_object, ee.Geometry) else ee_object.geometry()
+        ring = geom.bounds(1).getInfo()["coordinates"][0]
+        lons = [p[0] for p in ring]
+        lats = [p[1] for p in ring]
+        if zoom is not None:
+            self.set_center((min(lons) + max(lons)) / 2, (min(lats) + max(lats)) / 2, zoom)
+        else:
+            self._map.fit_bounds([[min(lats), min(lons)], [max(lats), max(lons)]])
+
+    centerObject = center_object
+
+    def add_layer_control(self) -> None:
+        if not self._has_layer_control:
+            _folium().LayerControl().add_to(self._map)
+            self._has_layer_control = True
+
+    # --- Ausgabe ----------------------------------------------------------------
+    def to_html(self) -> str:
+        self.add_layer_control()
+        return self._map.get_root().render()
+
+    def to_streamlit(self, height: int = 600, width: Optional[int] = None, scrolling: bool = False) -> None:
+        import streamlit.components.v1 as components
+
+        html = self.to_html()
+        components.html(html, height=int(height), width=width, scrolling=scrolling)
+        record_artifact("html", html.encode("utf-8"), height=int(height), width=width, scrolling=scrolling)
+
+
+def _is_hex(color: Any) -> bool:
+    c = str(color)
+    return len(c) in (3, 6, 8) and all(ch in "0123456789abcdefABCDEF" for ch in c)
@@ -16,8 +16,8 @@ def render_split_map_left_right(
 
 Args
 ----
-m : geemap.foliumap.Map
-left_layer, right_layer : beliebige Layer-Objekte (z. B. geemap.ee_tile_layer(...))
+m : slim_map.Map (API-kompatibel auch geemap.foliumap.Map)
+left_layer, right_layer : ee.Image/ee.ImageCollection, Basemap-Name oder fertiger Folium-Layer
 left_vis, right_vis : Visualisierungs-Parameter (min/max/palette/opacity/bands)
 left_title, right_title : Legenden-/Layernamen
 height : Kartenhöhe
@@ -29,10 +29,13 @@ None
 
 Side-effects
 ------------
-Schreibt in Streamlit (m.to_streamlit).
+Schreibt in Streamlit (m.to_streamlit). EE-Layer-URLs werden vorab parallel
+aufgelöst und gecacht (visual/ee_tile_layers.py).
 """
 from typing import Any, Dict, Optional
-from geemap.foliumap import Map
+from .slim_map import Map
+
+from .ee_tile_layers import prepare_tile_layers
 
 def render_split_map_left_right(
     m: Map,
@@ -45,9 +48,12 @@ def render_split_map_left_right(
     height: int = 680,
     colorbar_label: Optional[str] = None,
 ) -> None:
+    # Tile-URLs beider Seiten gleichzeitig auflösen (Cache: Graph-Hash + vis)
+    left, right = prepare_tile_layers([(left_layer, left_vis, left_title), (right_layer, right_vis, right_title)])
     # Split-Ansicht
-    m.split_map(left_layer=left_layer, right_layer=right_layer,
-                left_vis=(left_vis or {}), right_vis=(right_vis or {}),
+    m.split_map(left_layer=left, right_layer=right,
+                left_vis=((left_vis or {}) if left is left_layer else {}),
+                right_vis=((right_vis or {}) if right is right_layer else {}),
                 left_name=left_title, right_name=right_title)
     # Farbleiste (für rechten Layer)
     try:
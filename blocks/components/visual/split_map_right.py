@@ -18,7 +18,7 @@ def render_split_map_right(
 
 Args
 ----
-m : geemap.foliumap.Map
+m : slim_map.Map (API-kompatibel auch geemap.foliumap.Map)
 right_layer : beliebiges EE-Objekt (typisch ee.Image)
 vis_params : Dict[str, Any]  (z. B. {"min": 20, "max": 45, "palette": [...], "opacity": 0.6})
 title : str
@@ -31,11 +31,14 @@ None
 
 Side Effects
 ------------
-Rendert die Karte nach Streamlit.
+Rendert die Karte nach Streamlit. EE-Layer-URL wird vorab aufgelöst und
+gecacht (visual/ee_tile_layers.py).
 """
 
 from typing import Dict, Any, Optional
-from geemap.foliumap import Map
+from .slim_map import Map
+
+from .ee_tile_layers import prepare_tile_layers
 
 def _add_layer(m, layer, vis, name):
     fn = getattr(m, "add_layer", None) or getattr(m, "addLayer", None)
@@ -52,20 +55,24 @@ def render_split_map_right(
     colorbar_label: Optional[str] = None,
 ) -> None:
     """Render split map; do not hardcode palettes/min/max; use vis_params."""
+    (prepared,) = prepare_tile_layers([(right_layer, vis_params, title)])
     # Split-Map (rechte Seite)
     try:
         m.split_map(
             left_layer="OpenStreetMap",   # valid basemap; versionssicher
-            right_layer=right_layer,
-            right_vis=vis_params,
+            right_layer=prepared,
+            right_vis=(vis_params if prepared is right_layer else {}),
             right_name=title,
         )
     except Exception:
-        # Fallback: normales Layer (kompatibel mit add_layer oder addLayer)
-        fn = getattr(m, "add_layer", None) or getattr(m, "addLayer", None)
-        if fn is None:
-            raise RuntimeError("Map-Objekt unterstützt weder add_layer noch addLayer.")
-        fn(right_layer, vis_params, title)
+        # Fallback: normales Layer (vorbereiteter TileLayer bzw. add_layer oder addLayer)
+        if prepared is not right_layer:
+            prepared.add_to(m)
+        else:
+            fn = getattr(m, "add_layer", None) or getattr(m, "addLayer", None)
+            if fn is None:
+                raise RuntimeError("Map-Objekt unterstützt weder add_layer noch addLayer.")
+            fn(right_layer, vis_params, title)
 
     # Optionale Farbleiste, nur wenn Min/Max/Palette vorhanden
     try:
@@ -0,0 +1,68 @@
+"""
+Startzeit-/Speicher-Vergleich: geemap.foliumap.Map vs. visual/slim_map.Map.
+Jede Variante läuft mehrfach in einem frischen Interpreter (kalter Import);
+gemessen werden Import + Map-Erzeugung + HTML-Render sowie Max-RSS.
+Aufruf: python scripts/bench_map_import.py [runs]
+"""
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import json, resource, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+m = Map(center=(48.1, 11.6), zoom=9)
+html = m.to_html() if hasattr(m, "to_html") else m.get_root().render()
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "render_s": t2 - t1,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+VARIANTS = {
+    "geemap": "from geemap.foliumap import Map",
+    "slim": "from blocks.components.visual.slim_map import Map",
+}
+
+
+def _run(imports: str):
+    proc = subprocess.run([sys.executable, "-c", _PROBE.format(imports=imports)],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+def main(runs: int = 5) -> int:
+    results = {}
+    for name, imports in VARIANTS.items():
+        samples = []
+        for _ in range(runs):
+            res, err = _run(imports)
+            if err:
+                print(f"{name:7s} n/a ({err})")
+                break
+            samples.append(res)
+        if samples:
+            results[name] = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+            r = results[name]
+            print(f"{name:7s} import {r['import_s']:.2f} s  render {r['render_s']:.2f} s  "
+                  f"max RSS {r['rss_mb']:.0f} MB  (median of {len(samples)})")
+    if "slim" not in results:
+        return 1
+    if "geemap" in results:
+        g, s = results["geemap"], results["slim"]
+        print(f"OK: slim map saves {g['import_s'] + g['render_s'] - s['import_s'] - s['render_s']:.2f} s "
+              f"and {g['rss_mb'] - s['rss_mb']:.0f} MB per cold start")
+    else:
+        print("OK: slim map measured (geemap not installed, no comparison)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,83 @@
+"""
+Speicher je Session: Agent-Objekte pro Session/Rerun gebaut (vorher) vs. einmal
+pro Prozess geteilt (app.py, st.cache_resource). Simuliert N Sessions in einem
+Prozess und misst den Python-Heap (tracemalloc) sowie den RSS-Zuwachs.
+Aufruf: python scripts/bench_shared_resources.py [sessions]
+"""
+import gc
+import os
+import pathlib
+import sys
+import tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except Exception:
+        return float("nan")
+
+
+def _prompt() -> str:
+    prompts = ROOT / "knowledge" / "prompts"
+    texts = [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(prompts.glob("*"))
+             if p.is_file()] if prompts.exists() else []
+    return "\n\n".join(texts) or "x" * 40_000
+
+
+def _tool_a(uc_id: str, sections: list[str]) -> str:
+    """Platzhalter-Tool mit ähnlicher Signatur wie tool_get_uc_sections."""
+    return uc_id
+
+
+def _tool_b(code: str, filename: str | None = None, timeout_sec: int = 600) -> str:
+    """Platzhalter-Tool mit ähnlicher Signatur wie tool_run_python."""
+    return code
+
+
+def _build_stack(agents, model_cls, client_cls, prompt: str):
+    client = client_cls(api_key="sk-bench")
+    tools = [agents.function_tool(fn) for fn in (_tool_a, _tool_b)]
+    main = agents.Agent(name="EO-Agent", instructions=prompt, tools=tools,
+                        model=model_cls(model="gpt-4o", openai_client=client))
+    fixer = agents.Agent(name="Fixer", instructions="fix", tools=tools,
+                         model=model_cls(model="gpt-4o", openai_client=client))
+    return client, tools, main, fixer
+
+
+def _measure(n: int, shared: bool, sdk, prompt: str):
+    gc.collect()
+    tracemalloc.start()
+    rss0 = _rss_mb()
+    shared_stack = _build_stack(*sdk, prompt) if shared else None
+    sessions = [{"stack": shared_stack or _build_stack(*sdk, prompt)} for _ in range(n)]
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = _rss_mb() - rss0
+    del sessions, shared_stack
+    return heap / 2**20, rss
+
+
+def main(n: int = 20) -> int:
+    try:
+        import agents
+        from agents.models.openai_responses import OpenAIResponsesModel
+        from openai import AsyncOpenAI
+    except ImportError as e:
+        print(f"n/a: agents SDK not installed ({e})")
+        return 1
+    sdk, prompt = (agents, OpenAIResponsesModel, AsyncOpenAI), _prompt()
+    per, per_rss = _measure(n, shared=False, sdk=sdk, prompt=prompt)
+    sh, sh_rss = _measure(n, shared=True, sdk=sdk, prompt=prompt)
+    print(f"per-session  heap {per:7.2f} MB  RSS +{per_rss:6.1f} MB  ({per / n * 1024:.0f} KB/session)")
+    print(f"shared       heap {sh:7.2f} MB  RSS +{sh_rss:6.1f} MB  ({sh / n * 1024:.0f} KB/session)")
+    print(f"OK: sharing saves {(per - sh) / n * 1024:.0f} KB heap per session over {n} sessions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,14 @@
+"""
+Baut den lokalen GAUL-Gazetteer (ADM0/ADM1: Namen, Codes, Bounds, Fläche) für
+gee/gaul_index.py. Die Datei ist nicht eingecheckt; einmal pro Deployment bauen.
+Aufruf: python scripts/build_gaul_index.py [Zielpfad]
+        (Default: T2E_GAUL_INDEX oder knowledge/gazetteer/gaul_adm.json.gz)
+"""
+import sys
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.gee.gaul_index import build_gaul_index, load_gaul_index
+
+ee_authenticate()
+path = build_gaul_index(sys.argv[1] if len(sys.argv) > 1 else None)
+idx = load_gaul_index() if len(sys.argv) <= 1 else None
+print(f"OK: GAUL index written to {path}" + (f" ({len(idx['adm0'])} ADM0, {len(idx['adm1'])} ADM1)" if idx else ""))
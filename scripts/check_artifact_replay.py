@@ -0,0 +1,129 @@
+"""
+Prüft util/artifacts.py ohne EE und ohne Streamlit-Server: eine App mit Slider,
+Spalten, Karten-HTML, st.empty()-Frames und Tabelle wird gegen einen
+protokollierenden Streamlit-Ersatz aufgezeichnet und wieder ausgespielt.
+1) Die Wiedergabe erzeugt dieselben Ausgaben in denselben Containern.
+2) Ein abweichender Widget-Wert bricht die Wiedergabe ab (echter Lauf nötig).
+3) Nicht abbildbare Elemente markieren das Manifest als nicht wiederspielbar.
+Aufruf: python scripts/check_artifact_replay.py (Cache in einem Temp-Verzeichnis)
+"""
+import os
+import sys
+import tempfile
+import types
+
+os.environ["T2E_CACHE_DIR"] = tempfile.mkdtemp(prefix="t2e_artifacts_")
+
+import pandas as pd
+
+_LOG = []
+_STACK = []  # offene with-Container; st.<element> landet wie in Streamlit im innersten
+
+
+class FakeContainer:
+    """Minimaler Streamlit-Ersatz: protokolliert (Container, Element, Inhalt)."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _here(self):
+        return _STACK[-1] if self.name == "main" and _STACK else self
+
+    def __enter__(self):
+        _STACK.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _STACK.pop()
+
+    def columns(self, spec, **kwargs):
+        return [FakeContainer(f"{self._here().name}/col{i}") for i in range(len(spec))]
+
+    def empty(self):
+        return FakeContainer(f"{self._here().name}/empty")
+
+    def __getattr__(self, element):
+        def render(*args, **kwargs):
+            body = args[0] if args else None
+            _LOG.append((self._here().name, element,
+                         body if isinstance(body, (str, bytes)) else type(body).__name__))
+        return render
+
+
+st = FakeContainer("main")
+components = types.SimpleNamespace(html=lambda html, **kw: st.html_component(html))
+sys.modules["streamlit"] = st
+sys.modules["streamlit.components"] = types.SimpleNamespace(v1=components)
+sys.modules["streamlit.components.v1"] = components
+st.components = sys.modules["streamlit.components"]
+
+from blocks.components.util import artifacts  # noqa: E402
+
+APP = '''
+import streamlit as st
+year = slider("Jahr", 2015, 2024, 2020, 1)
+st.subheader(f"LST {year}")
+left, right = st.columns([1, 1])
+with left:
+    show_map("<html>map</html>")
+with right:
+    slot = st.empty()
+    for frame in (b"frame-1", b"frame-2", b"gif"):
+        slot.image(frame, caption="Animation")
+st.dataframe(pd.DataFrame({"year": [year], "lst": [31.5]}))
+'''
+_widgets = {"Jahr": 2021}
+
+
+def slider(label, lo, hi, default, step):
+    value = _widgets[label]
+    artifacts.record_artifact("widget", widget="slider", label=label, min=lo, max=hi, default=default,
+                              step=step, selected=value)
+    return value
+
+
+def show_map(html):
+    """Wie SlimMap.to_streamlit: rendern und als html-Artefakt festhalten."""
+    components.html(html, height=400)
+    artifacts.record_artifact("html", html.encode("utf-8"), height=400)
+
+
+def _run_live():
+    with artifacts.capture("app") as cap:
+        ns = {"__builtins__": artifacts.recording_builtins(), "slider": slider, "pd": pd,
+              "show_map": show_map, "st": artifacts.recording(st)}
+        exec(APP, ns, ns)
+    return cap.manifest(APP)
+
+
+def main() -> int:
+    errors = []
+    _LOG.clear()
+    manifest = _run_live()
+    live = list(_LOG)
+    artifacts.save_manifest("0" * 32, manifest)
+
+    _LOG.clear()
+    if not artifacts.replay(artifacts.load_manifest("0" * 32), st, {"slider": lambda label, *a: _widgets[label]}):
+        errors.append("replay with unchanged widgets failed")
+    replayed = list(_LOG)
+    expected = [e for e in live if e[1] != "image" or e[2] == b"gif"]  # empty(): nur letzter Frame
+    if replayed != expected:
+        errors.append(f"replayed outputs differ:\n    live   {expected}\n    replay {replayed}")
+
+    _widgets["Jahr"] = 2022
+    if artifacts.replay(manifest, st, {"slider": lambda label, *a: _widgets[label]}):
+        errors.append("replay ignored a changed widget value")
+
+    with artifacts.capture("chart") as cap:
+        artifacts.recording(st).line_chart([1, 2, 3])
+    if cap.manifest("").get("replayable"):
+        errors.append("unknown element st.line_chart did not mark manifest unreplayable")
+
+    print((f"OK: {len(manifest['items'])} artifacts recorded and replayed without re-execution"
+           if not errors else "FAIL: artifact replay") + "".join(f"\n  - {e}" for e in errors))
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Prüft am serialisierten EE-Graphen, dass die Acquire-Ketten nur benötigte Bänder anfassen:
+1) Jede geladene ImageCollection wird vor dem ersten Map-Schritt per select auf
+   die Pflichtbänder reduziert (Filter davor sind erlaubt).
+2) Alle Image.select-Bandnamen im Graphen liegen in der erlaubten Menge
+   (Pflichtbänder + abgeleitete Ausgabebänder).
+"""
+import json
+import sys
+
+import ee
+
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.gee.cool_spots_acquire_process import LST_REQUIRED_BANDS, build_lst_image
+from blocks.components.gee.s2_mosaic_acquire_process import S2_REQUIRED_BANDS, build_s2_quarter_median
+
+_PASS_THROUGH = ("Collection.filter", "Collection.limit")
+
+
+def _graph(obj):
+    data = json.loads(obj.serialize())
+    return data["values"], data["values"][data["result"]]
+
+
+def _resolve(values, node):
+    while isinstance(node, dict) and "valueReference" in node:
+        node = values[node["valueReference"]]
+    return node
+
+
+def _walk(values, node, seen=None):
+    """Alle Knoten (auch inline und in Funktionskörpern) genau einmal liefern."""
+    seen = set() if seen is None else seen
+    node = _resolve(values, node)
+    if not isinstance(node, dict) or id(node) in seen:
+        return
+    seen.add(id(node))
+    yield node
+    if "functionInvocationValue" in node:
+        for arg in node["functionInvocationValue"].get("arguments", {}).values():
+            yield from _walk(values, arg, seen)
+    elif "functionDefinitionValue" in node:
+        yield from _walk(values, {"valueReference": node["functionDefinitionValue"]["body"]}, seen)
+    elif "arrayValue" in node:
+        for v in node["arrayValue"].get("values", []):
+            yield from _walk(values, v, seen)
+    elif "dictionaryValue" in node:
+        for v in node["dictionaryValue"].get("values", {}).values():
+            yield from _walk(values, v, seen)
+
+
+def _call(values, node):
+    node = _resolve(values, node)
+    return node.get("functionInvocationValue") if isinstance(node, dict) else None
+
+
+def _strings(values, node):
+    node = _resolve(values, node)
+    if "constantValue" in node:
+        c = node["constantValue"]
+        return [c] if isinstance(c, str) else [x for x in c if isinstance(x, str)]
+    if "arrayValue" in node:
+        return [s for v in node["arrayValue"]["values"] for s in _strings(values, v)]
+    return []
+
+
+def _loaded_source(values, node):
+    """ImageCollection.load hinter einer Kette erlaubter Filter, sonst None."""
+    call = _call(values, node)
+    while call and call["functionName"] in _PASS_THROUGH:
+        call = _call(values, call["arguments"]["collection"])
+    return call if call and call["functionName"] == "ImageCollection.load" else None
+
+
+def check(name, obj, required, derived=()):
+    values, root = _graph(obj)
+    allowed = set(required) | set(derived)
+    errors = []
+    for node in _walk(values, root):
+        call = _call(values, node)
+        if not call:
+            continue
+        fn, args = call["functionName"], call.get("arguments", {})
+        if fn == "Collection.map" and _loaded_source(values, args["collection"]) is not None:
+            body = _resolve(values, args["baseAlgorithm"])["functionDefinitionValue"]["body"]
+            first = _call(values, {"valueReference": body})
+            picked = set(_strings(values, first["arguments"].get("bandSelectors", {}))) if first else set()
+            if not first or first["functionName"] != "Image.select" or not picked <= set(required):
+                errors.append("first map after ImageCollection.load is not a select of required bands")
+        if fn == "Image.select":
+            extra = set(_strings(values, args.get("bandSelectors", {}))) - allowed
+            if extra:
+                errors.append(f"selects non-required bands {sorted(extra)}")
+    print((f"OK: {name} touches only required bands" if not errors else f"FAIL: {name}")
+          + "".join(f"\n  - {e}" for e in errors))
+    return not errors
+
+
+if __name__ == "__main__":
+    ee_authenticate()
+    aoi = ee.Geometry.Rectangle([11.4, 48.0, 11.8, 48.3])
+    start, end = ee.Date("2023-06-01"), ee.Date("2023-09-01")
+    ok = check("build_lst_image", build_lst_image(aoi, start, end), LST_REQUIRED_BANDS, ("LST_C",))
+    ok &= check("build_s2_quarter_median", build_s2_quarter_median(aoi, start, end),
+                S2_REQUIRED_BANDS + ("QA60",))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,10 @@
+import os
+import sys
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.gee.ndvi_acquire_process import materialize_ndvi_doy_composite
+
+ee_authenticate()
+asset_id = sys.argv[1] if len(sys.argv) > 1 else os.environ["T2E_NDVI_DOY_ASSET"]
+ref_year = int(sys.argv[2]) if len(sys.argv) > 2 else 2019
+task_ids = materialize_ndvi_doy_composite(asset_id, ref_year=ref_year)
+print(f"OK: {len(task_ids)} export tasks started for {asset_id}:", ", ".join(task_ids))
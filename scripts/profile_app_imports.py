@@ -0,0 +1,75 @@
+"""
+Import-Zeitprofil des App-Starts (python -X importtime, frischer Interpreter je Modul).
+Vergleicht die früher beim Start geladenen Module (eager) mit dem heutigen
+Start-Set (lazy: nur streamlit + pydantic; ee/geemap/agents/openai bei Bedarf).
+Aufruf: python scripts/profile_app_imports.py [runs]
+
+Messung (2026-10-19, 1 vCPU, Python 3.11.7, requirements.txt: streamlit 1.49.0,
+openai 1.102.0, openai-agents 0.2.10, earthengine-api 1.7.48, geemap 0.37.2,
+pydantic 2.14.1; Median aus 5 Läufen):
+    streamlit 0.38 s | pydantic 0.07 s | ee 0.36 s | geemap 3.35 s |
+    agents 1.39 s | openai 0.80 s   (kumulativ, -X importtime, je Modul allein)
+    eager (vorher) 4.86 s  →  lazy (jetzt) 0.50 s, Ersparnis 4.36 s je Kaltstart
+geemap.foliumap schlug mit xyzservices 2026.9.1 fehl (BoxKeyError 'xyz_to_folium')
+und fehlt im eager-Set; die App nutzt es nicht mehr (visual/slim_map.py).
+"""
+import re
+import statistics
+import subprocess
+import sys
+
+EAGER = ["streamlit", "pydantic", "ee", "geemap", "geemap.foliumap", "agents", "openai"]
+LAZY = ["streamlit", "pydantic"]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _cumulative_s(module: str):
+    """Kumulative Importzeit (s) eines Top-Level-Imports oder None, wenn der Import scheitert."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and len(m.group(3)) == 1:  # Top-Level-Einträge (eine Leerstelle Einrückung)
+            total += int(m.group(2))
+    return total / 1e6
+
+
+def _set_s(modules, runs):
+    """Gemeinsame Importzeit eines Modul-Sets (geteilte Abhängigkeiten nur einmal)."""
+    if not modules:
+        return 0.0
+    code = "import time; t=time.perf_counter(); " + "; ".join(f"import {m}" for m in modules) + \
+           "; print(time.perf_counter()-t)"
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout.strip()))
+    return statistics.median(samples)
+
+
+def main(runs: int = 3) -> int:
+    print(f"{'module':18s} cumulative import")
+    installed = []
+    for mod in EAGER:
+        t = _cumulative_s(mod)
+        print(f"{mod:18s} " + ("import failed" if t is None else f"{t:6.2f} s"))
+        if t is not None:
+            installed.append(mod)
+    eager = _set_s([m for m in EAGER if m in installed], runs)
+    lazy = _set_s([m for m in LAZY if m in installed], runs)
+    if eager is None or lazy is None:
+        print("FAIL: could not time import sets")
+        return 1
+    print(f"OK: startup imports eager {eager:.2f} s vs lazy {lazy:.2f} s "
+          f"(saves {eager - lazy:.2f} s; median of {runs}, modules present: {', '.join(installed)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3))
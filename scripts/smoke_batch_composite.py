@@ -0,0 +1,13 @@
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.gee.aoi_from_spec import aoi_from_spec
+from blocks.components.gee.cool_spots_time import summer_window
+from blocks.components.gee.cool_spots_acquire_process import build_lst_image
+from blocks.components.gee.batch_composite import batch_composites, batch_stats, batch_thumbs, windows_from
+
+ee_authenticate()
+aoi = aoi_from_spec({"type":"bbox","bbox":[11.4,48.0,11.8,48.3]})
+windows = windows_from(summer_window, range(2021, 2024))
+col = batch_composites(lambda s, e: build_lst_image(aoi, s, e), windows)
+df = batch_stats(col, aoi, native_scale=30, bands=["LST_C"])
+thumbs = batch_thumbs(col, [w[0] for w in windows], {"bands":["LST_C"],"min":15,"max":45}, aoi, dimensions=128)
+print("OK: summers", list(df["label"]), "frames", len(thumbs))
@@ -0,0 +1,22 @@
+import time
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.util.jobs import ensure_workers, get_job, job_result, submit_job, wait_job
+from blocks.components.gee.aoi_from_spec import aoi_from_spec
+from blocks.components.gee.cool_spots_time import summer_window
+from blocks.components.gee.cool_spots_acquire_process import build_lst_image
+
+ee_authenticate()
+aoi = aoi_from_spec({"type":"bbox","bbox":[11.4,48.0,11.8,48.3]})
+params = {"image": build_lst_image(aoi, *summer_window(2023)), "aoi": aoi, "spec": {"LST_C": "mean"},
+          "scale": 100, "n_tiles": 8, "bbox": [11.4, 48.0, 11.8, 48.3]}
+t0 = time.perf_counter()
+job_id = submit_job("blocks.components.gee.reduce_tiled:tiled_reduce_region", params, owner="smoke", autostart=False)
+print("started workers:", ensure_workers(1))
+while (info := get_job(job_id))["status"] in ("queued", "running"):
+    print(f"  {info['status']:8s} {info['progress']:.0%} {info['message']}")
+    time.sleep(2)
+info = wait_job(job_id)
+assert info["status"] == "done", info
+same = submit_job("blocks.components.gee.reduce_tiled:tiled_reduce_region", params, autostart=False)
+print(f"OK: job {job_id[:8]} in {time.perf_counter() - t0:.1f} s ->", job_result(job_id),
+      "| resubmit reuses job:", same == job_id)
@@ -0,0 +1,24 @@
+import time
+import ee
+from collections import OrderedDict
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.util.widget_memo import widget_memo, record_widget
+from blocks.components.gee.aoi_from_spec import aoi_from_spec
+from blocks.components.gee.cool_spots_time import summer_window
+from blocks.components.gee.cool_spots_acquire_process import build_lst_image
+
+ee_authenticate()
+aoi = aoi_from_spec({"type":"bbox","bbox":[11.4,48.0,11.8,48.3]})
+store = OrderedDict()
+timings = []
+for year in (2022, 2023, 2022):  # Slider hin und zurück
+    t0 = time.perf_counter()
+    with widget_memo(store) as stats:
+        record_widget("Jahr", year, min=2015, max=2024, step=1)
+        area = aoi.area(1).getInfo()
+        mean = build_lst_image(aoi, *summer_window(year)).reduceRegion(
+            reducer=ee.Reducer.mean(), geometry=aoi, scale=300, bestEffort=True).getInfo()
+    timings.append(time.perf_counter() - t0)
+    print(year, dict(stats), f"{timings[-1]:.2f} s")
+assert stats["misses"] == 0, stats
+print("OK: widget memo, revisit", f"{timings[-1]:.3f} s vs first {timings[0]:.2f} s")
@@ -0,0 +1,33 @@
+import time
+import ee
+from collections import OrderedDict
+from blocks.components.util.scaffold import ee_authenticate
+from blocks.components.util.widget_memo import widget_memo, record_widget, current_widgets
+from blocks.components.util.widget_prefetch import neighbor_overrides, start_prefetch
+from blocks.components.gee.aoi_from_spec import aoi_from_spec
+from blocks.components.gee.cool_spots_time import summer_window
+from blocks.components.gee.cool_spots_acquire_process import build_lst_image
+
+ee_authenticate()
+aoi = aoi_from_spec({"type":"bbox","bbox":[11.4,48.0,11.8,48.3]})
+
+def app(default_year=2022):
+    year = record_widget("Jahr", default_year, min=2019, max=2024, step=1)
+    return build_lst_image(aoi, *summer_window(year)).reduceRegion(
+        reducer=ee.Reducer.mean(), geometry=aoi, scale=300, bestEffort=True).getInfo()
+
+store, done = OrderedDict(), set()
+with widget_memo(store):
+    app()
+    reads = current_widgets()
+overrides = neighbor_overrides(reads)
+assert start_prefetch("smoke", app, store, overrides, done)
+t0 = time.time()
+while len(done) < len(overrides) and time.time() - t0 < 300:
+    time.sleep(1)
+t1 = time.perf_counter()
+with widget_memo(store, overrides={"Jahr": 2023}) as stats:  # Slider-Schritt nach rechts
+    app()
+print("prefetched", sorted(done), "step", dict(stats), f"{time.perf_counter() - t1:.3f} s")
+assert stats["misses"] == 0, stats
+print("OK: neighbour years prefetched, slider step served from memo")